@@ -3,19 +3,27 @@ from crewai import Agent
 
 from src.agents.base_agent import BaseAgent
 from src.identity.permission_manager import PermissionManager
+from src.llm_providers.crewai_llm import render_crewai_persona
 from src.llm_providers.llm_factory import LLMFactory
+from src.llm_providers.prompt_cache import build_prompt_prefix, get_prompt_cache_key
 from src.observability import logger
+from src.observability.events import EventBus
+from src.observability.streaming import StreamingCallbackHandler
+from src.tools.guarded_tool import GuardedTool
 from src.tools.tool_registry import ToolRegistry
 
 
 class CrewAIAgentAdapter(BaseAgent):
-    def __init__(self, crewai_agent: Agent, id: str):
+    def __init__(self, crewai_agent: Agent, id: str, side_effect_free: bool = False,
+                 prompt_prefix: str = None):
         super().__init__(
             id=id,
             role=crewai_agent.role,
             goal=crewai_agent.goal,
             backstory=crewai_agent.backstory,
-            tools=crewai_agent.tools
+            tools=crewai_agent.tools,
+            side_effect_free=side_effect_free,
+            prompt_prefix=prompt_prefix
         )
         self._crewai_agent = crewai_agent
 
@@ -23,7 +31,8 @@ class CrewAIAgentAdapter(BaseAgent):
         # CrewAI agent's invoke method expects 'input', 'tools', 'tool_names'
         # We need to extract these from the generic input dict if they are there
         # Or pass the whole input if the underlying agent can handle it
-        # For now, assuming the input dict directly maps to what crewai_agent.agent_executor.invoke expects
+        # For now, assuming the input dict directly maps to
+        # what crewai_agent.agent_executor.invoke expects
         return self._crewai_agent.agent_executor.invoke(input)
 
     @property
@@ -32,64 +41,169 @@ class CrewAIAgentAdapter(BaseAgent):
 
 
 class AgentFactory:
-    def __init__(self, llm_provider: str = None):
+    def __init__(self, llm_provider: str = None, event_bus: EventBus = None):
         self.llm_factory = LLMFactory()
         self.tool_registry = ToolRegistry()
         self.llm_provider = llm_provider
-
-    def _get_agent_tools(self, agent_id: str, permission_manager: PermissionManager) -> list:
-        """Equips an agent with tools based on its permissions."""
-        agent_tools = []
-        for tool_id in self.tool_registry.get_all_tool_ids():
-            required_permission = self.tool_registry.get_permission_for_tool(tool_id)
-            if permission_manager.is_allowed(agent_id, required_permission):
-                tool = self.tool_registry.get_tool(tool_id)
-                if tool:
-                    agent_tools.append(tool)
-
-        logger.info(f"Equipping agent '{agent_id}' with tools: {[tool.name for tool in agent_tools]}")
+        self.event_bus = event_bus
+        self._stream_handlers = []
+        # Policy engine of the last agents created, for authorization stats
+        self.policy_engine = None
+
+    def _get_agent_tool_ids(self, agent_id: str,
+                            permission_manager: PermissionManager) -> list[str]:
+        """Returns the IDs of the tools an agent is permitted to use."""
+        permissions = permission_manager.get_permissions(agent_id)
+        return [
+            tool_id
+            for tool_id in self.tool_registry.get_tool_ids_for_permissions(permissions)
+            if self.tool_registry.has_tool(tool_id)
+        ]
+
+    def _get_agent_tools(self, agent_id: str, tool_ids: list[str],
+                         permission_manager: PermissionManager) -> list:
+        """
+        Equips an agent with the given tools, each call being authorized by
+        the policy engine.
+        """
+        agent_tools = [
+            GuardedTool(
+                self.tool_registry.get_tool(tool_id), agent_id,
+                permission=self.tool_registry.get_permission_for_tool(tool_id),
+                policy_engine=permission_manager.policy_engine,
+            )
+            for tool_id in tool_ids
+        ]
+        logger.info(
+            f"Equipping agent '{agent_id}' with tools: "
+            f"{[tool.name for tool in agent_tools]}"
+        )
         return agent_tools
 
-    def _build_agent_from_config(self, agent_config: dict, permission_manager: PermissionManager) -> BaseAgent:
-        """Builds a single agent from its config, using a provided permission manager."""
+    def _build_agent_from_config(self, agent_config: dict,
+                                 permission_manager: PermissionManager) -> BaseAgent:
+        """
+        Builds a single agent from its config, using a provided permission manager.
+        """
         agent_id = agent_config.get("id")
         llm_provider_id = self.llm_provider or agent_config.get("llm_provider")
 
         if not agent_id or not llm_provider_id:
-            raise ValueError(f"Agent config is missing 'id' or 'llm_provider': {agent_config}")
+            raise ValueError(
+                f"Agent config is missing 'id' or 'llm_provider': {agent_config}"
+            )
 
-        llm = self.llm_factory.create_llm(llm_provider_id)
-        agent_tools = self._get_agent_tools(agent_id, permission_manager)
+        agent_tool_ids = self._get_agent_tool_ids(agent_id, permission_manager)
+        agent_tools = self._get_agent_tools(
+            agent_id, agent_tool_ids, permission_manager
+        )
+        side_effect_free = not any(
+            self.tool_registry.has_side_effects(tool_id) for tool_id in agent_tool_ids
+        )
+
+        # The persona and tool schemas form the stable prefix of every prompt
+        # of the agent
+        role = agent_config.get("role")
+        goal = agent_config.get("goal")
+        backstory = agent_config.get(
+            "backstory",
+            "As an advanced AI, you are part of a specialized team. Your "
+            "goal is to collaborate effectively to complete the mission."
+        )
+        prompt_prefix = build_prompt_prefix(role, goal, backstory, agent_tools)
+
+        # Stream the agent's tokens to the mission event bus (rebindable via
+        # bind_event_bus)
+        stream_handler = StreamingCallbackHandler(self.event_bus, agent_id)
+        self._stream_handlers.append(stream_handler)
+        llm = self.llm_factory.create_agent_llm(
+            llm_provider_id, callbacks=[stream_handler],
+            prompt_cache_key=get_prompt_cache_key(agent_id, prompt_prefix),
+            prompt_prefix=prompt_prefix,
+            persona_prompt=render_crewai_persona(role, goal, backstory)
+        )
 
         crewai_agent = Agent(
-            role=agent_config.get("role"),
-            goal=agent_config.get("goal"),
-            backstory=agent_config.get("backstory", "As an advanced AI, you are part of a specialized team. Your goal is to collaborate effectively to complete the mission."),
+            role=role,
+            goal=goal,
+            backstory=backstory,
             llm=llm,
             tools=agent_tools,
             verbose=True,
             allow_delegation=False,
         )
-        return CrewAIAgentAdapter(crewai_agent, agent_id)
+        return CrewAIAgentAdapter(
+            crewai_agent, agent_id, side_effect_free=side_effect_free,
+            prompt_prefix=prompt_prefix
+        )
 
-    def create_agent(self, agent_config: dict) -> BaseAgent:
+    def _get_tool_permissions(self) -> list[str]:
         """
-        Creates a single Agent object from a configuration dictionary.
+        Returns the permissions required by the tools, so wildcard grants can be
+        expanded against them.
         """
-        # For a single agent, the permission manager only needs its own config.
-        permission_manager = PermissionManager({"agents": [agent_config]})
+        return list(self.tool_registry.tool_ids_by_permission)
+
+    def bind_event_bus(self, event_bus: EventBus | None):
+        """
+        Routes the streamed tokens of every agent built by this factory to the
+        given event bus.
+        """
+        self.event_bus = event_bus
+        for stream_handler in self._stream_handlers:
+            stream_handler.event_bus = event_bus
+
+    def create_agent(self, agent_config: dict, roles: list[dict] = None) -> BaseAgent:
+        """
+        Creates a single Agent object from a configuration dictionary. `roles` are the
+        role definitions of the agent's file, which its identity may refer to.
+        """
+        # For a single agent, the permission manager only needs its own config
+        # and the roles.
+        permission_manager = PermissionManager(
+            {"roles": roles or [], "agents": [agent_config]},
+            known_permissions=self._get_tool_permissions()
+        )
         return self._build_agent_from_config(agent_config, permission_manager)
 
-    def create_agents(self, agent_definitions: dict) -> dict[str, BaseAgent]:
+    def create_agents(self, agent_definitions: dict,
+                      agent_ids: list[str] = None) -> dict[str, BaseAgent]:
         """
-        Creates a list of Agent objects based on a resolved definition dictionary,
-        and equips them with tools based on their permissions.
+        Creates a list of Agent objects based on a resolved definition dictionary, and
+        equips them with tools based on their permissions. If agent_ids is given, only
+        those agents are built, e.g. the ones a mission's workflow uses.
         """
-        permission_manager = PermissionManager(agent_definitions)
+        permission_manager = PermissionManager(
+            agent_definitions, known_permissions=self._get_tool_permissions()
+        )
+        self.policy_engine = permission_manager.policy_engine
         created_agents = {}
 
         for agent_config in agent_definitions.get("agents", []):
             agent_id = agent_config.get("id")
-            created_agents[agent_id] = self._build_agent_from_config(agent_config, permission_manager)
-
+            if agent_ids is not None and agent_id not in agent_ids:
+                continue
+            created_agents[agent_id] = self._build_agent_from_config(
+                agent_config, permission_manager
+            )
+
+        if agent_ids is not None:
+            logger.info(
+                f"Built {len(created_agents)} of "
+                f"{len(agent_definitions.get('agents', []))} "
+                "agents required by the workflow."
+            )
         return created_agents
+
+    @staticmethod
+    def get_workflow_agent_ids(mission_config: dict) -> list[str]:
+        """
+        Returns the IDs of the agents referenced by the steps of a mission's workflow,
+        in order of first use.
+        """
+        agent_ids = []
+        for step in mission_config.get("workflow_definition", {}).get("steps", []):
+            agent_id = step.get("agent_id")
+            if agent_id and agent_id not in agent_ids:
+                agent_ids.append(agent_id)
+        return agent_ids
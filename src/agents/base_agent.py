@@ -8,18 +8,29 @@ class BaseAgent(ABC):
     Defines the common interface that all agent implementations must adhere to.
     """
 
-    def __init__(self, id: str, role: str, goal: str, backstory: str, tools: Optional[List[Any]] = None):
+    def __init__(self, id: str, role: str, goal: str, backstory: str,
+                 tools: Optional[List[Any]] = None, side_effect_free: bool = False,
+                 prompt_prefix: str = None):
         self.id = id
         self.role = role
         self.goal = goal
         self.backstory = backstory
         self.tools = tools if tools is not None else []
+        # True when none of the agent's tools change external state
+        self.side_effect_free = side_effect_free
+        # The static part of the agent's prompts, rendered once so every call shares
+        # a cacheable prefix
+        self.prompt_prefix = prompt_prefix
+        self.tool_names = ", ".join(tool.name for tool in self.tools)
+        self.tools_description = "\n".join(
+            f"{tool.name}: {tool.description}" for tool in self.tools
+        )
 
     @abstractmethod
     def invoke(self, input: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Invokes the agent with a given input.
-        The input dictionary should contain all necessary information for the agent to perform its task.
+        Invokes the agent with a given input. The input dictionary should contain all
+        necessary information for the agent to perform its task.
         """
         pass
 
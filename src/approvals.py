@@ -0,0 +1,115 @@
+import argparse
+import time
+from datetime import datetime
+
+from src.main import MissionControl
+from src.observability import logger
+from src.workflows.approval_queue import ApprovalQueue
+from src.workflows.checkpoint_store import CheckpointStore
+
+
+def resume_decided_missions(approval_queue: ApprovalQueue,
+                            checkpoint_store: CheckpointStore,
+                            run_id: str = None) -> int:
+    """
+    Resumes every suspended mission (or only the given run) whose pending approval
+    has been decided or has timed out. Returns the number of missions resumed.
+    A mission that fails to resume is released, so that a later call retries it.
+    """
+    resumed = 0
+    for approval in approval_queue.claim_decided(run_id):
+        decided_run_id = approval["run_id"]
+        logger.info(
+            f"[HITL] Resuming run '{decided_run_id}' after approval "
+            f"'{approval['step_name']}' was {approval['status']}."
+        )
+        try:
+            MissionControl.resume(
+                decided_run_id, checkpoint_store=checkpoint_store, approval_mode="queue"
+            ).run()
+        except Exception as e:
+            logger.exception(
+                f"An error occurred while resuming run '{decided_run_id}': {e}"
+            )
+            approval_queue.release_claim(decided_run_id)
+            continue
+        resumed += 1
+    return resumed
+
+
+def _print_pending(approval_queue: ApprovalQueue):
+    pending = approval_queue.list_pending()
+    if not pending:
+        print("No pending approvals.")
+        return
+    for approval in pending:
+        created = datetime.fromtimestamp(approval["created_at"]).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        expires = (
+            datetime.fromtimestamp(approval["expires_at"]).strftime("%Y-%m-%d %H:%M:%S")
+            if approval["expires_at"] else "never"
+        )
+        print(
+            f"[{approval['run_id']}] {approval['step_name']} (queued {created}, "
+            f"expires {expires}, default: {approval['default_action']})"
+        )
+        print(f"    {approval['prompt']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Manage pending human approvals in Project Pantheon."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List pending approvals.")
+    for command in ("approve", "reject"):
+        decision_parser = subparsers.add_parser(
+            command, help=f"{command.capitalize()} the pending approval of a run."
+        )
+        decision_parser.add_argument("run_id", help="The ID of the suspended run.")
+        decision_parser.add_argument(
+            "--by", default="cli", help="Who made the decision (recorded for audit)."
+        )
+        decision_parser.add_argument(
+            "--resume", action="store_true",
+            help="Resume the mission in this process right away."
+        )
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Resume suspended missions as soon as their approvals are decided."
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, default=5.0, help="Polling interval in seconds."
+    )
+
+    args = parser.parse_args()
+
+    checkpoint_store = CheckpointStore()
+    approval_queue = ApprovalQueue(checkpoint_store.db_path)
+
+    if args.command == "list":
+        _print_pending(approval_queue)
+
+    elif args.command in ("approve", "reject"):
+        approval = approval_queue.decide(
+            args.run_id, approved=args.command == "approve", decided_by=args.by
+        )
+        print(
+            f"Approval '{approval['step_name']}' for "
+            f"run '{args.run_id}' {approval['status']}."
+        )
+        if args.resume:
+            resume_decided_missions(
+                approval_queue, checkpoint_store, run_id=args.run_id
+            )
+
+    elif args.command == "watch":
+        logger.info("[HITL] Watching the approval queue for decisions...")
+        try:
+            while True:
+                resume_decided_missions(approval_queue, checkpoint_store)
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            logger.info("[HITL] Approval watcher stopped.")
@@ -1,9 +1,17 @@
+import copy
 import os
+import threading
 
 import yaml
 
 
 class ConfigLoader:
+    # Parsed YAML files shared by all loaders, keyed by path and
+    # invalidated on modification.
+    # Long-lived processes (e.g. the mission server) thereby parse each file only once.
+    _cache = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, base_config_path="config"):
         self.base_config_path = base_config_path
 
@@ -11,8 +19,17 @@ class ConfigLoader:
         full_path = os.path.join(self.base_config_path, file_path)
         if not os.path.exists(full_path):
             raise FileNotFoundError(f"Configuration file not found: {full_path}")
-        with open(full_path, 'r') as f:
-            return yaml.safe_load(f)
+
+        mtime = os.path.getmtime(full_path)
+        with self._cache_lock:
+            cached = self._cache.get(full_path)
+        if cached is None or cached[0] != mtime:
+            with open(full_path, 'r') as f:
+                cached = (mtime, yaml.safe_load(f))
+            with self._cache_lock:
+                self._cache[full_path] = cached
+        # Callers get their own copy so the cached document is never mutated
+        return copy.deepcopy(cached[1])
 
     def load_mission_config(self, mission_id: str) -> dict:
         return self._load_yaml(os.path.join("missions", f"{mission_id}.yaml"))
@@ -31,3 +48,9 @@ class ConfigLoader:
 
     def load_llm_costs(self) -> dict:
         return self._load_yaml(os.path.join("llm_providers", "llm_costs.yaml"))
+
+    def load_budgets(self) -> dict:
+        return self._load_yaml("budgets.yaml")
+
+    def load_work_queue_config(self) -> dict:
+        return self._load_yaml("work_queue.yaml")
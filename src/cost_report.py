@@ -0,0 +1,86 @@
+import argparse
+
+from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import (
+    DEFAULT_COST_LEDGER_DB,
+    GROUP_BY_COLUMNS,
+    CostLedger,
+    utc_day,
+)
+
+
+def _print_report(rows: list[dict], group_by: list[str]):
+    if not rows or not rows[0]["entries"]:
+        print("No costs recorded for this selection.")
+        return
+
+    headers = (
+        group_by + [
+            "runs", "entries", "input_tokens", "cached_input_tokens", "output_tokens",
+            "cost_usd"
+        ]
+    )
+    table = [
+        [str(row[column]) for column in group_by]
+        + [str(row["runs"]), str(row["entries"]), str(row["input_tokens"] or 0),
+           str(row["cached_input_tokens"] or 0), str(row["output_tokens"] or 0),
+           f"${row['cost_usd']:.6f}"]
+        for row in rows
+    ]
+    widths = [
+        max(len(header), *(len(line[i]) for line in table))
+        for i, header in enumerate(headers)
+    ]
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for line in table:
+        print("  ".join(value.ljust(width) for value, width in zip(line, widths)))
+    if group_by:
+        print(f"\nTotal: ${sum(row['cost_usd'] for row in rows):.6f}")
+
+
+def _print_budgets(cost_ledger: CostLedger, day: str):
+    budgets = ConfigLoader().load_budgets().get("budgets", {})
+    print(f"Fleet budgets for {day}:")
+    day_limit = budgets.get("day")
+    if day_limit:
+        spent = cost_ledger.get_totals({"day": day})["day"]
+        print(f"- day: ${spent:.6f} of ${day_limit:.2f}")
+    for scope in ("mission_type", "team"):
+        for name, limit in (budgets.get(scope) or {}).items():
+            spent = cost_ledger.get_totals({scope: f"{day}/{name}"})[scope]
+            print(f"- {scope} '{name}': ${spent:.6f} of ${limit:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Report the LLM spend recorded in the Project Pantheon cost ledger."
+    )
+    parser.add_argument(
+        "--by", nargs="*", default=["mission_type"], choices=GROUP_BY_COLUMNS,
+        help="Columns to group the spend by (default: "
+             "mission_type). Pass no column for a grand total."
+    )
+    parser.add_argument("--since", help="First day to include (YYYY-MM-DD, UTC).")
+    parser.add_argument("--until", help="Last day to include (YYYY-MM-DD, UTC).")
+    parser.add_argument("--mission_type", help="Only include this mission type.")
+    parser.add_argument("--team", help="Only include this team.")
+    parser.add_argument(
+        "--budgets", action="store_true",
+        help="Also show today's spend against the fleet budgets."
+    )
+    parser.add_argument(
+        "--ledger", default=DEFAULT_COST_LEDGER_DB,
+        help="Path of the cost ledger database."
+    )
+    args = parser.parse_args()
+
+    cost_ledger = CostLedger(args.ledger)
+    rows = cost_ledger.aggregate(
+        args.by, since=args.since, until=args.until, mission_type=args.mission_type,
+        team=args.team
+    )
+    _print_report(rows, args.by)
+    if args.budgets:
+        print()
+        _print_budgets(cost_ledger, utc_day())
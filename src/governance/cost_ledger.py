@@ -0,0 +1,236 @@
+# src/pantheon/governance/cost_ledger.py
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from src.observability import logger
+
+DEFAULT_COST_LEDGER_DB = "checkpoints/cost_ledger.db"
+
+# Budget scopes above a single mission, from the narrowest to the widest. All of them
+# are per UTC day.
+BUDGET_SCOPES = ("mission_type", "team", "day")
+
+# Columns the aggregate queries may group by
+GROUP_BY_COLUMNS = (
+    "mission_type", "mission_id", "team", "day", "run_id", "agent_id", "category",
+    "llm_provider", "model"
+)
+
+
+def utc_day(timestamp: float = None) -> str:
+    return datetime.fromtimestamp(timestamp or time.time(), tz=timezone.utc).strftime(
+        "%Y-%m-%d"
+    )
+
+
+def is_exhausted(total: float, limit: float) -> bool:
+    """
+    A budget is exhausted once its total reaches the limit; shared by the ledger
+    and the governors.
+    """
+    return total >= limit
+
+
+class CostLedger:
+    """
+    An append-only ledger of every cost recorded by the economic governors of all
+    missions, stored in a local SQLite database in WAL mode so that concurrent
+    missions and processes share it.
+
+    Next to the entries, running totals are kept per run, mission type, team and day.
+    They are updated in the same immediate transaction as the entry, so budget checks
+    read a single row and are consistent across processes.
+    """
+    def __init__(self, db_path: str = DEFAULT_COST_LEDGER_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cost_entries (
+                    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recorded_at REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    run_id TEXT,
+                    mission_id TEXT,
+                    mission_type TEXT,
+                    team TEXT,
+                    agent_id TEXT,
+                    category TEXT NOT NULL,
+                    llm_provider TEXT,
+                    model TEXT,
+                    input_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    cost_usd REAL NOT NULL,
+                    cached_input_tokens INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            # Ledgers created before prompt caching was tracked
+            columns = {
+                row["name"]
+                for row in self._conn.execute("PRAGMA table_info(cost_entries)")
+            }
+            if "cached_input_tokens" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE cost_entries ADD COLUMN "
+                    "cached_input_tokens INTEGER NOT NULL DEFAULT 0"
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cost_entries_day ON cost_entries (day)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cost_totals (
+                    scope TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    total_usd REAL NOT NULL DEFAULT 0,
+                    entry_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (scope, key)
+                )
+                """
+            )
+
+    @staticmethod
+    def scope_keys(run_id: str, mission_type: str, team: str,
+                   day: str) -> dict[str, str]:
+        """
+        Returns the running-total key of every scope a cost is counted in.
+        """
+        return {
+            "run": run_id,
+            "mission_type": f"{day}/{mission_type}",
+            "team": f"{day}/{team}",
+            "day": day,
+        }
+
+    def record(self, run_id: str, mission_id: str, mission_type: str, team: str,
+               agent_id: str, category: str, llm_provider: str, model: str,
+               input_tokens: int, output_tokens: int, cost_usd: float,
+               budgets: dict = None, cached_input_tokens: int = 0) -> dict[str, float]:
+        """
+        Appends a cost entry and updates the running totals of its scopes atomically.
+
+        Args:
+            budgets: Optional limits per scope ("mission_type", "team", "day")
+                for this entry.
+            cached_input_tokens: The part of input_tokens served from the
+                provider's prompt cache.
+
+        Returns:
+            The new totals of the scopes whose budget is now exhausted, i.e. reached
+            (empty if none). They are read in the same transaction as the update, so the
+            mission whose cost exhausts a budget always learns it from this call.
+        """
+        now = time.time()
+        day = utc_day(now)
+        scope_keys = self.scope_keys(run_id, mission_type, team, day)
+        exceeded = {}
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                """
+                INSERT INTO cost_entries (
+                    recorded_at, day, run_id, mission_id, mission_type, team, agent_id,
+                    category, llm_provider, model, input_tokens, output_tokens,
+                    cost_usd, cached_input_tokens
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (now, day, run_id, mission_id, mission_type, team, agent_id, category,
+                 llm_provider, model, input_tokens, output_tokens, cost_usd,
+                 cached_input_tokens),
+            )
+            for scope, key in scope_keys.items():
+                self._conn.execute(
+                    """
+                    INSERT INTO cost_totals (scope, key, total_usd, entry_count)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT (scope, key) DO UPDATE SET
+                        total_usd = total_usd + excluded.total_usd,
+                        entry_count = entry_count + 1
+                    """,
+                    (scope, key, cost_usd),
+                )
+                limit = (budgets or {}).get(scope)
+                if limit:
+                    total = self._conn.execute(
+                        "SELECT total_usd FROM cost_totals WHERE scope = ? AND key = ?",
+                        (scope, key)
+                    ).fetchone()["total_usd"]
+                    if is_exhausted(total, limit):
+                        exceeded[scope] = total
+        if exceeded:
+            logger.critical(
+                "[CostLedger] Budgets exhausted after "
+                f"cost of run '{run_id}': {exceeded}"
+            )
+        return exceeded
+
+    def get_totals(self, scope_keys: dict[str, str]) -> dict[str, float]:
+        """
+        Returns the running total of each given scope key.
+        """
+        totals = {scope: 0.0 for scope in scope_keys}
+        with self._lock:
+            for scope, key in scope_keys.items():
+                row = self._conn.execute(
+                    "SELECT total_usd FROM cost_totals WHERE scope = ? AND key = ?",
+                    (scope, key)
+                ).fetchone()
+                if row:
+                    totals[scope] = row["total_usd"]
+        return totals
+
+    def aggregate(self, group_by: list[str], since: str = None, until: str = None,
+                  mission_type: str = None, team: str = None) -> list[dict]:
+        """
+        Sums the ledger entries grouped by the given columns, optionally filtered
+        by day range (inclusive, YYYY-MM-DD), mission type and team.
+        """
+        for column in group_by:
+            if column not in GROUP_BY_COLUMNS:
+                raise ValueError(
+                    f"Cannot group costs by '{column}'. Choose from {GROUP_BY_COLUMNS}."
+                )
+
+        filters, params = [], []
+        for clause, value in (
+            ("day >= ?", since), ("day <= ?", until),
+            ("mission_type = ?", mission_type), ("team = ?", team)
+        ):
+            if value:
+                filters.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        columns = ", ".join(group_by)
+        select_columns = f"{columns}, " if group_by else ""
+        group_clause = f"GROUP BY {columns} ORDER BY cost_usd DESC" if group_by else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {select_columns}COUNT(*) AS entries,
+                       COUNT(DISTINCT run_id) AS runs,
+                       SUM(input_tokens) AS input_tokens,
+                       SUM(cached_input_tokens) AS cached_input_tokens,
+                       SUM(output_tokens) AS output_tokens,
+                       COALESCE(SUM(cost_usd), 0) AS cost_usd
+                FROM cost_entries {where} {group_clause}
+                """,
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
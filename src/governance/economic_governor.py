@@ -1,57 +1,317 @@
 # src/pantheon/governance/economic_governor.py
 from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import BUDGET_SCOPES, CostLedger, is_exhausted, utc_day
 from src.observability import logger
 
 
 class EconomicGovernor:
     """
     Monitors the financial cost of a mission and enforces a budget.
+
+    With a CostLedger, every cost is also appended to the shared ledger, and the
+    fleet-wide budgets (per mission type, team and day, see config/budgets.yaml)
+    are enforced across all missions and processes.
     """
-    def __init__(self, mission_config: dict, llm_provider: str, model: str):
+    def __init__(self, mission_config: dict, llm_provider: str, model: str,
+                 cost_ledger: CostLedger = None, run_id: str = None):
         governance_config = mission_config.get("governance", {})
         eco_gov_config = governance_config.get("economic_governor", {})
         self.budget = float(eco_gov_config.get("budget_usd", 0.0))
         self.agent_costs = {}
+        self.discarded_costs = {} # Spend on speculative work that was thrown away
+        # Spend on duplicate requests sent to other providers whose answers
+        # lost the race
+        self.hedge_costs = {}
+        # Spend on checking semantically cached results with a cheaper model
+        self.verification_costs = {}
+        self.total_cost = 0.0 # Running total of the four above
+        # Attribution of the spend of batched tasks to their items (already in the
+        # totals)
+        self.item_costs = {}
         self.llm_provider = llm_provider
         self.model = model
 
         config_loader = ConfigLoader()
-        llm_costs_config = config_loader.load_llm_costs()
+        self.llm_costs = config_loader.load_llm_costs().get("llm_costs", {})
+
+        # Ledger attribution: the mission type defaults to the mission ID, the team to
+        # the agent definitions
+        self.cost_ledger = cost_ledger
+        self.run_id = run_id
+        self.mission_id = mission_config.get("mission_id")
+        self.mission_type = eco_gov_config.get("mission_type", self.mission_id)
+        self.team = mission_config.get("agent_definitions")
+        budgets_config = (
+            config_loader.load_budgets().get("budgets", {}) if cost_ledger else {}
+        )
+        self.fleet_budgets = {
+            "mission_type": (budgets_config.get("mission_type") or {}).get(
+                self.mission_type
+            ),
+            "team": (budgets_config.get("team") or {}).get(self.team),
+            "day": budgets_config.get("day"),
+        }
+        # Last known totals of the shared scopes
+        self.fleet_totals = {scope: 0.0 for scope in BUDGET_SCOPES}
+        # Fleet budgets the ledger reported exhausted when recording our costs
+        self.exceeded_fleet_budgets = {}
+        # Input tokens served from the provider's prompt cache
+        self.cached_input_tokens = 0
+        self.cache_savings = 0.0
 
         # Retrieve cost per token for the specific LLM provider and model
-        model_costs = llm_costs_config.get("llm_costs", {}).get(llm_provider, {}).get(model, {})
-        self.input_cost_per_token = model_costs.get("input_cost_per_million_tokens", 0.0) / 1_000_000
-        self.output_cost_per_token = model_costs.get("output_cost_per_million_tokens", 0.0) / 1_000_000
+        (
+            self.input_cost_per_token, self.output_cost_per_token,
+            self.cached_input_cost_per_token
+        ) = self._get_costs_per_token(llm_provider, model)
+
+    def _get_costs_per_token(self, llm_provider: str,
+                             model: str) -> tuple[float, float, float]:
+        model_costs = self.llm_costs.get(llm_provider, {}).get(model, {})
+        input_cost_per_token = (
+            model_costs.get("input_cost_per_million_tokens", 0.0) / 1_000_000
+        )
+        output_cost_per_token = (
+            model_costs.get("output_cost_per_million_tokens", 0.0) / 1_000_000
+        )
+        # Without a cached price, cache hits are conservatively priced as regular input
+        cached_input_cost_per_token = model_costs.get(
+            "cached_input_cost_per_million_tokens", input_cost_per_token * 1_000_000
+        ) / 1_000_000
+
+        if input_cost_per_token == 0.0 or output_cost_per_token == 0.0:
+            logger.warning(
+                "[EcoGov] Input or output cost per token not found for "
+                f"{llm_provider}/{model}. Cost tracking will be inaccurate."
+            )
+        return input_cost_per_token, output_cost_per_token, cached_input_cost_per_token
+
+    def _calculate_cost(self, input_tokens: int, output_tokens: int,
+                        cached_input_tokens: int = 0) -> float:
+        cached_input_tokens = min(cached_input_tokens, input_tokens)
+        return (
+            (input_tokens - cached_input_tokens) * self.input_cost_per_token
+            + cached_input_tokens * self.cached_input_cost_per_token
+            + output_tokens * self.output_cost_per_token
+        )
 
-        if self.input_cost_per_token == 0.0 or self.output_cost_per_token == 0.0:
-            logger.warning(f"[EcoGov] Input or output cost per token not found for {self.llm_provider}/{self.model}. Cost tracking will be inaccurate.")
+    def _track_cache_savings(self, input_tokens: int, cached_input_tokens: int):
+        cached_input_tokens = min(cached_input_tokens, input_tokens)
+        self.cached_input_tokens += cached_input_tokens
+        self.cache_savings += (
+            cached_input_tokens
+            * (self.input_cost_per_token - self.cached_input_cost_per_token)
+        )
 
-    def track_cost(self, agent_id: str, input_tokens: int, output_tokens: int):
+    def track_cost(self, agent_id: str, input_tokens: int, output_tokens: int,
+                   cached_input_tokens: int = 0):
         """
-        Updates the current cost based on input and output token usage for a specific agent.
+        Updates the current cost based on input and output token usage for a specific
+        agent. Input tokens served from the provider's prompt cache are priced at the
+        cached-input rate.
         """
-        cost = (input_tokens * self.input_cost_per_token) + (output_tokens * self.output_cost_per_token)
+        cost = self._calculate_cost(input_tokens, output_tokens, cached_input_tokens)
         if agent_id not in self.agent_costs:
             self.agent_costs[agent_id] = 0.0
         self.agent_costs[agent_id] += cost
+        self.total_cost += cost
+        self._track_cache_savings(input_tokens, cached_input_tokens)
+        self._record(
+            agent_id, "agent", self.llm_provider, self.model, input_tokens,
+            output_tokens, cost, cached_input_tokens
+        )
         total_cost = self.get_total_cost()
-        logger.info(f"[EcoGov] Cost for {agent_id}: ${cost:.6f} | Total Cost: ${total_cost:.6f} | Budget: ${self.budget:.2f}")
+        logger.info(
+            f"[EcoGov] Cost for {agent_id}: ${cost:.6f} | Total "
+            f"Cost: ${total_cost:.6f} | Budget: ${self.budget:.2f}"
+        )
+
+    def track_discarded_cost(self, agent_id: str, input_tokens: int, output_tokens: int,
+                             cached_input_tokens: int = 0):
+        """
+        Records the cost of speculative work that was discarded. It counts towards the
+        budget but is reported separately from the agents' committed work.
+        """
+        cost = self._calculate_cost(input_tokens, output_tokens, cached_input_tokens)
+        self.discarded_costs[agent_id] = self.discarded_costs.get(agent_id, 0.0) + cost
+        self.total_cost += cost
+        self._track_cache_savings(input_tokens, cached_input_tokens)
+        self._record(
+            agent_id, "discarded", self.llm_provider, self.model, input_tokens,
+            output_tokens, cost, cached_input_tokens
+        )
+        logger.info(
+            f"[EcoGov] Discarded speculative cost for {agent_id}: "
+            f"${cost:.6f} | Total Cost: ${self.get_total_cost():.6f}"
+        )
+
+    def track_hedge_cost(self, agent_id: str, llm_provider: str, model: str,
+                         input_tokens: int, output_tokens: int):
+        """
+        Records the cost of a hedged duplicate request whose answer was discarded,
+        priced at the provider/model it was sent to. It counts towards the budget but is
+        reported separately from the agents' committed work.
+        """
+        cost = self._get_provider_cost(llm_provider, model, input_tokens, output_tokens)
+        self.hedge_costs[agent_id] = self.hedge_costs.get(agent_id, 0.0) + cost
+        self.total_cost += cost
+        self._record(
+            agent_id, "hedge", llm_provider, model, input_tokens, output_tokens, cost
+        )
+        logger.info(
+            f"[EcoGov] Hedged request cost for {agent_id} on {llm_provider}/{model}: "
+            f"${cost:.6f} | Total Cost: ${self.get_total_cost():.6f}"
+        )
+
+    def track_verification_cost(self, agent_id: str, llm_provider: str, model: str,
+                                input_tokens: int, output_tokens: int):
+        """
+        Records the cost of verifying a semantically cached result for an agent's step,
+        priced at the provider/model of the verification model.
+        """
+        cost = self._get_provider_cost(llm_provider, model, input_tokens, output_tokens)
+        self.verification_costs[agent_id] = (
+            self.verification_costs.get(agent_id, 0.0) + cost
+        )
+        self.total_cost += cost
+        self._record(
+            agent_id, "cache_verification", llm_provider, model, input_tokens,
+            output_tokens, cost
+        )
+        logger.info(
+            f"[EcoGov] Cache verification cost for {agent_id} "
+            f"on {llm_provider}/{model}: ${cost:.6f} | Total "
+            f"Cost: ${self.get_total_cost():.6f}"
+        )
+
+    def track_item_costs(self, items: list[str], input_tokens: int, output_tokens: int,
+                         cached_input_tokens: int = 0,
+                         item_output_tokens: dict[str, int] = None):
+        """
+        Attributes the cost of one call of a batched task to the items it covered: the
+        input is shared evenly, the output by the size of each item's result. This is
+        attribution only; the call's cost is tracked for its agent with track_cost.
+        """
+        input_cost = self._calculate_cost(input_tokens, 0, cached_input_tokens)
+        output_cost = output_tokens * self.output_cost_per_token
+        item_output_tokens = item_output_tokens or {}
+        answered_tokens = sum(item_output_tokens.values())
+        for item in items:
+            # Items left unanswered share the output evenly when nothing was answered
+            output_share = (
+                item_output_tokens.get(item, 0) / answered_tokens if answered_tokens
+                else 1 / len(items)
+            )
+            self.item_costs[item] = (
+                self.item_costs.get(item, 0.0) + input_cost / len(items)
+                + output_cost * output_share
+            )
+
+    def _get_provider_cost(self, llm_provider: str, model: str, input_tokens: int,
+                           output_tokens: int) -> float:
+        input_cost_per_token, output_cost_per_token, _ = self._get_costs_per_token(
+            llm_provider, model
+        )
+        return (
+            (input_tokens * input_cost_per_token)
+            + (output_tokens * output_cost_per_token)
+        )
+
+    def _record(self, agent_id: str, category: str, llm_provider: str, model: str,
+                input_tokens: int, output_tokens: int, cost: float,
+                cached_input_tokens: int = 0):
+        """
+        Appends a cost to the shared ledger, if any, and refreshes the
+        fleet budget state.
+        """
+        if self.cost_ledger is None:
+            return
+        try:
+            self.exceeded_fleet_budgets = self.cost_ledger.record(
+                self.run_id, self.mission_id, self.mission_type, self.team, agent_id,
+                category, llm_provider, model, input_tokens, output_tokens, cost,
+                budgets=self.fleet_budgets, cached_input_tokens=cached_input_tokens
+            )
+            self.fleet_totals = self.cost_ledger.get_totals(self._fleet_scope_keys())
+        except Exception as e:
+            # The mission's own accounting stays correct; only the shared view is behind
+            logger.error(f"[EcoGov] Failed to record cost in the ledger: {e}")
+
+    def _fleet_scope_keys(self) -> dict[str, str]:
+        scope_keys = CostLedger.scope_keys(
+            self.run_id, self.mission_type, self.team, utc_day()
+        )
+        return {scope: scope_keys[scope] for scope in BUDGET_SCOPES}
+
     def get_total_cost(self) -> float:
         """
-        Calculates the total cost across all agents.
+        Returns the total cost across all agents, including discarded speculative work
+        and hedged requests.
         """
-        return sum(self.agent_costs.values())
+        return self.total_cost
 
     def is_budget_exceeded(self) -> bool:
         """
-        Checks if the mission has gone over budget.
+        Checks if the mission has gone over its budget, or a fleet-wide budget it counts
+        towards has been exhausted by any mission.
         """
         total_cost = self.get_total_cost()
         if self.budget > 0 and total_cost > self.budget:
-            logger.critical(f"[EcoGov] ALERT: Budget exceeded! Cost: ${total_cost:.2f}, Budget: ${self.budget:.2f}")
+            logger.critical(
+                "[EcoGov] ALERT: Budget exceeded! Cost: "
+                f"${total_cost:.2f}, Budget: ${self.budget:.2f}"
+            )
             return True
+
+        # Decided by the ledger in the transaction that recorded our last cost
+        for scope, total in self.exceeded_fleet_budgets.items():
+            logger.critical(
+                f"[EcoGov] ALERT: {scope} budget exhausted! Cost: "
+                f"${total:.2f}, Budget: ${self.fleet_budgets[scope]:.2f}"
+            )
+            return True
+
+        if self.cost_ledger is not None and any(self.fleet_budgets.values()):
+            # Read the shared totals, which other missions may have moved since
+            # our last record
+            self.fleet_totals = self.cost_ledger.get_totals(self._fleet_scope_keys())
+            for scope, limit in self.fleet_budgets.items():
+                if limit and is_exhausted(self.fleet_totals[scope], limit):
+                    logger.critical(
+                        f"[EcoGov] ALERT: {scope} budget exhausted! Cost: "
+                        f"${self.fleet_totals[scope]:.2f}, Budget: ${limit:.2f}"
+                    )
+                    return True
         return False
 
+    def as_budget_guard(self):
+        """
+        Returns an EventBus guard that halts a generation as soon as the tokens
+        streamed so far would take the mission over budget.
+        """
+        def guard(agent_id: str, text: str, token_count: int) -> str | None:
+            streamed_cost = token_count * self.output_cost_per_token
+            projected_cost = self.get_total_cost() + streamed_cost
+            if self.budget > 0 and projected_cost > self.budget:
+                return (
+                    f"budget of ${self.budget:.2f} exceeded "
+                    f"(projected cost ${projected_cost:.6f})"
+                )
+            for scope in self.exceeded_fleet_budgets:
+                return f"{scope} budget of ${self.fleet_budgets[scope]:.2f} exhausted"
+            # Fleet budgets are checked against the shared totals known at
+            # the last record
+            for scope, limit in self.fleet_budgets.items():
+                if limit and is_exhausted(
+                    self.fleet_totals[scope] + streamed_cost, limit
+                ):
+                    return (
+                        f"{scope} budget of ${limit:.2f} exceeded (projected "
+                        f"cost ${self.fleet_totals[scope] + streamed_cost:.6f})"
+                    )
+            return None
+        return guard
+
     def get_cost_breakdown(self) -> str:
         """
         Returns a formatted string with the cost breakdown per agent.
@@ -59,5 +319,64 @@ class EconomicGovernor:
         breakdown = "Cost Breakdown per Agent:\n"
         for agent_id, cost in self.agent_costs.items():
             breakdown += f"- {agent_id}: ${cost:.6f}\n"
+        if self.discarded_costs:
+            breakdown += "Discarded Speculative Work:\n"
+            for agent_id, cost in self.discarded_costs.items():
+                breakdown += f"- {agent_id}: ${cost:.6f}\n"
+        if self.hedge_costs:
+            breakdown += "Hedged Duplicate Requests:\n"
+            for agent_id, cost in self.hedge_costs.items():
+                breakdown += f"- {agent_id}: ${cost:.6f}\n"
+        if self.verification_costs:
+            breakdown += "Semantic Cache Verification:\n"
+            for agent_id, cost in self.verification_costs.items():
+                breakdown += f"- {agent_id}: ${cost:.6f}\n"
+        if self.item_costs:
+            most_expensive = max(self.item_costs, key=self.item_costs.get)
+            breakdown += (
+                f"Cost per Batched Item ({len(self.item_costs)} items): "
+                f"avg ${sum(self.item_costs.values()) / len(self.item_costs):.6f}, "
+                f"max ${self.item_costs[most_expensive]:.6f} ({most_expensive})\n"
+            )
+        if self.cached_input_tokens:
+            breakdown += (
+                f"Prompt Cache: {self.cached_input_tokens} cached "
+                f"input tokens, saved ${self.cache_savings:.6f}\n"
+            )
         breakdown += f"Total Mission Cost: ${self.get_total_cost():.6f}"
         return breakdown
+
+    def get_state(self) -> dict:
+        """
+        Returns a serializable snapshot of the governor's accounting,
+        used for checkpointing.
+        """
+        return {
+            "agent_costs": dict(self.agent_costs),
+            "discarded_costs": dict(self.discarded_costs),
+            "hedge_costs": dict(self.hedge_costs),
+            "verification_costs": dict(self.verification_costs),
+            "item_costs": dict(self.item_costs),
+            "cached_input_tokens": self.cached_input_tokens,
+            "cache_savings": self.cache_savings,
+        }
+
+    def restore_state(self, state: dict):
+        """
+        Restores the governor's accounting from a snapshot taken with get_state().
+        """
+        self.agent_costs = dict(state.get("agent_costs", {}))
+        self.discarded_costs = dict(state.get("discarded_costs", {}))
+        self.hedge_costs = dict(state.get("hedge_costs", {}))
+        self.verification_costs = dict(state.get("verification_costs", {}))
+        self.item_costs = dict(state.get("item_costs", {}))
+        self.cached_input_tokens = state.get("cached_input_tokens", 0)
+        self.cache_savings = state.get("cache_savings", 0.0)
+        self.total_cost = (
+            sum(self.agent_costs.values()) + sum(self.discarded_costs.values())
+            + sum(self.hedge_costs.values()) + sum(self.verification_costs.values())
+        )
+        logger.info(
+            "[EcoGov] Restored cost state from checkpoint. "
+            f"Total Cost: ${self.get_total_cost():.6f}"
+        )
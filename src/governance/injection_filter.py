@@ -0,0 +1,44 @@
+# src/pantheon/governance/injection_filter.py
+import re
+
+from src.observability import logger
+
+DEFAULT_PATTERNS = [
+    r"ignore (all )?(the )?previous instructions",
+    r"new primary goal",
+    r"allow all traffic",
+    r"disregard (all )?(your|the) (rules|instructions)",
+]
+
+
+class InjectionFilter:
+    """
+    Detects signs of prompt injection in text generated by the agents, so that a
+    compromised generation can be stopped before it turns into an action.
+    """
+    def __init__(self, patterns: list[str] | None = None):
+        self.patterns = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in (patterns or DEFAULT_PATTERNS)
+        ]
+
+    def check(self, text: str) -> str | None:
+        """
+        Returns a description of the first injection pattern found in the text, or None.
+        """
+        for pattern in self.patterns:
+            if pattern.search(text):
+                logger.warning(
+                    f"[InjectionFilter] Pattern '{pattern.pattern}' "
+                    "matched in generated text."
+                )
+                return f"possible prompt injection (matched '{pattern.pattern}')"
+        return None
+
+    def as_guard(self, window: int = 200):
+        """
+        Returns an EventBus guard that scans the tail of the text generated so far.
+        """
+        def guard(agent_id: str, text: str, token_count: int) -> str | None:
+            return self.check(text[-window:])
+        return guard
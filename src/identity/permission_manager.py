@@ -1,32 +1,49 @@
 # src/identity/permission_manager.py
+from src.identity.policy_engine import PolicyEngine
 from src.observability import logger
 
 
 class PermissionManager:
     """
     Manages agent permissions based on their loaded profiles.
+    The profiles (roles, wildcard permissions and argument conditions) are compiled
+    into a PolicyEngine, which also authorizes every tool call at runtime.
     """
-    def __init__(self, agent_definitions: dict | None):
-        self.permissions = {}
+    def __init__(self, agent_definitions: dict | None,
+                 known_permissions: list[str] = None):
         if not isinstance(agent_definitions, dict):
-            logger.warning(f"PermissionManager initialized with invalid agent_definitions (type: {type(agent_definitions)}). No permissions will be loaded.")
-            return
+            logger.warning(
+                "PermissionManager initialized with invalid agent_definitions "
+                f"(type: {type(agent_definitions)}). No permissions will be loaded."
+            )
+            agent_definitions = {}
 
-        for agent_config in agent_definitions.get("agents", []):
-            agent_id = agent_config.get("id")
-            permissions = agent_config.get("identity", {}).get("permissions", [])
-            if agent_id:
-                self.permissions[agent_id] = set(permissions)
-                logger.debug(f"Loaded permissions for agent '{agent_id}': {self.permissions[agent_id]}")
+        self.policy_engine = PolicyEngine(
+            agent_definitions, known_permissions=known_permissions
+        )
+        for agent_id in self.policy_engine.agent_ids:
+            logger.debug(
+                f"Loaded permissions for agent '{agent_id}': "
+                f"{self.get_permissions(agent_id)}"
+            )
 
     def is_allowed(self, agent_id: str, required_permission: str) -> bool:
         """
-        Checks if an agent has the required permission.
+        Checks if an agent has the required permission, conditionally or not.
+        Conditions on tool arguments are checked when the tool is called.
         """
-        agent_permissions = self.permissions.get(agent_id, set())
-        is_auth = required_permission in agent_permissions
+        is_auth = self.policy_engine.is_granted(agent_id, required_permission)
 
         status = 'ALLOWED' if is_auth else 'DENIED'
-        logger.debug(f"[Auth Check] Agent: {agent_id}, Required: '{required_permission}', Status: {status}")
+        logger.debug(
+            f"[Auth Check] Agent: {agent_id}, Required: "
+            f"'{required_permission}', Status: {status}"
+        )
 
         return is_auth
+
+    def get_permissions(self, agent_id: str) -> set[str]:
+        """
+        Returns the permissions granted to an agent.
+        """
+        return self.policy_engine.get_permissions(agent_id)
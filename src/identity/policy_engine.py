@@ -0,0 +1,294 @@
+# src/identity/policy_engine.py
+import fnmatch
+import ipaddress
+import re
+import threading
+from collections import Counter
+
+from src.observability import logger
+
+DENY = 0
+ALLOW = 1
+CONDITIONAL = 2
+
+_WILDCARD_CHARS = ("*", "?", "[")
+_MAX_CONDITIONAL_CACHE_SIZE = 4096
+
+
+def _compile_condition(argument: str, spec: dict):
+    """
+    Compiles the condition on one tool argument into a predicate on the argument's
+    value. Supported checks: `cidr` (a list of networks), `one_of` (a list of values)
+    and `pattern` (a regex).
+    """
+    checks = []
+    if "cidr" in spec:
+        networks = [ipaddress.ip_network(network) for network in spec["cidr"]]
+
+        def in_networks(value) -> bool:
+            try:
+                address = ipaddress.ip_address(str(value).strip())
+            except ValueError:
+                return False
+            return any(address in network for network in networks)
+        checks.append(in_networks)
+    if "one_of" in spec:
+        allowed_values = {str(value) for value in spec["one_of"]}
+        checks.append(lambda value: str(value) in allowed_values)
+    if "pattern" in spec:
+        regex = re.compile(spec["pattern"])
+        checks.append(lambda value: regex.fullmatch(str(value)) is not None)
+    if not checks:
+        raise ValueError(
+            f"Condition on argument '{argument}' has no supported check: {spec}"
+        )
+
+    def predicate(arguments: dict) -> bool:
+        if argument not in arguments:
+            return False
+        value = arguments[argument]
+        return all(check(value) for check in checks)
+    return predicate
+
+
+class PolicyEngine:
+    """
+    Compiles the roles, permissions and argument conditions of agent definitions
+    into a decision structure that can be checked on every tool call.
+
+    Permission names and agent IDs are interned to integers, each agent's unconditional
+    grants are a bitset, and decisions are cached per (agent, permission). Grants may
+    use wildcards (e.g. "read_*") and may carry conditions on the tool's arguments,
+    e.g.:
+
+        permissions:
+          - permission: "isolate_host"
+            conditions:
+              host_ip: { cidr: ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"] }
+    """
+    def __init__(self, agent_definitions: dict, known_permissions: list[str] = None):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.permission_ids = {} # Permission name -> bit index
+        self.permission_names = []
+        self.agent_ids = {} # Agent ID -> index
+        self._grant_bits = [] # Per agent: bitset of unconditional grants
+        # Per agent: {permission index: [[predicate, ...], ...]} (any grant, all
+        # predicates)
+        self._conditions = []
+        # Per agent: [(pattern, predicates)] applied to permissions interned later
+        self._wildcard_grants = []
+        # (agent index, permission index) -> ALLOW / DENY / CONDITIONAL
+        self._decisions = {}
+        self._conditional_decisions = {}
+        self.allowed = Counter()
+        self.denied = Counter()
+
+        roles = {role.get("id"): role for role in agent_definitions.get("roles", [])}
+        compiled_agents = []
+        for agent_config in agent_definitions.get("agents", []):
+            agent_id = agent_config.get("id")
+            identity = agent_config.get("identity", {})
+            grants = list(identity.get("permissions", []))
+            for role_id in identity.get("roles", []):
+                grants.extend(self._resolve_role(role_id, roles, ()))
+            compiled_agents.append((
+                agent_id, [self._compile_grant(grant) for grant in grants]
+            ))
+
+        for permission in known_permissions or []:
+            self._intern_permission(permission)
+        for _, grants in compiled_agents:
+            for pattern, _ in grants:
+                if not any(char in pattern for char in _WILDCARD_CHARS):
+                    self._intern_permission(pattern)
+
+        for agent_id, grants in compiled_agents:
+            agent_index = len(self._grant_bits)
+            self.agent_ids[agent_id] = agent_index
+            self._grant_bits.append(0)
+            self._conditions.append({})
+            self._wildcard_grants.append([
+                grant for grant in grants
+                if any(char in grant[0] for char in _WILDCARD_CHARS)
+            ])
+            for pattern, predicates in grants:
+                if pattern in self.permission_ids:
+                    self._add_grant(
+                        agent_index, self.permission_ids[pattern], predicates
+                    )
+                    continue
+                for permission_index, permission in enumerate(self.permission_names):
+                    if fnmatch.fnmatchcase(permission, pattern):
+                        self._add_grant(agent_index, permission_index, predicates)
+
+        logger.debug(
+            f"[Policy] Compiled {len(self.agent_ids)} agents "
+            f"over {len(self.permission_names)} permissions."
+        )
+
+    def _resolve_role(self, role_id: str, roles: dict, seen: tuple) -> list:
+        if role_id in seen:
+            raise ValueError(
+                f"Role inheritance cycle: {' -> '.join(seen + (role_id,))}"
+            )
+        role = roles.get(role_id)
+        if role is None:
+            raise ValueError(f"Unknown role '{role_id}'")
+        grants = list(role.get("permissions", []))
+        for parent_id in role.get("inherits", []):
+            grants.extend(self._resolve_role(parent_id, roles, seen + (role_id,)))
+        return grants
+
+    @staticmethod
+    def _compile_grant(grant: str | dict) -> tuple[str, list | None]:
+        # A grant is a permission name (or wildcard), or a mapping with a
+        # permission and conditions
+        if isinstance(grant, str):
+            return grant, None
+        conditions = grant.get("conditions") or {}
+        predicates = [
+            _compile_condition(argument, spec) for argument, spec in conditions.items()
+        ]
+        return grant["permission"], predicates or None
+
+    def _add_grant(self, agent_index: int, permission_index: int,
+                   predicates: list | None):
+        if predicates is None:
+            self._grant_bits[agent_index] |= 1 << permission_index
+        else:
+            self._conditions[agent_index].setdefault(permission_index, []).append(
+                predicates
+            )
+
+    def _intern_permission(self, permission: str) -> int:
+        permission_index = self.permission_ids.get(permission)
+        if permission_index is not None:
+            return permission_index
+        with self._lock:
+            if permission in self.permission_ids:
+                return self.permission_ids[permission]
+            permission_index = len(self.permission_names)
+            self.permission_names.append(permission)
+            # Wildcard grants also cover permissions first seen after compilation
+            for agent_index, wildcard_grants in enumerate(self._wildcard_grants):
+                for pattern, predicates in wildcard_grants:
+                    if fnmatch.fnmatchcase(permission, pattern):
+                        self._add_grant(agent_index, permission_index, predicates)
+            self.permission_ids[permission] = permission_index
+            return permission_index
+
+    def intern(self, agent_id: str, permission: str) -> tuple[int | None, int]:
+        """
+        Returns the interned (agent index, permission index) to pass to authorize_ids().
+        The agent index is None for an unknown agent, which is denied everything.
+        """
+        return self.agent_ids.get(agent_id), self._intern_permission(permission)
+
+    def _decide(self, agent_index: int | None, permission_index: int) -> int:
+        key = (agent_index, permission_index)
+        decision = self._decisions.get(key)
+        if decision is None:
+            if agent_index is None:
+                decision = DENY
+            elif (self._grant_bits[agent_index] >> permission_index) & 1:
+                decision = ALLOW
+            elif permission_index in self._conditions[agent_index]:
+                decision = CONDITIONAL
+            else:
+                decision = DENY
+            self._decisions[key] = decision
+        return decision
+
+    def _check_conditions(self, agent_index: int, permission_index: int,
+                          arguments: dict) -> bool:
+        try:
+            key = (agent_index, permission_index, tuple(sorted(arguments.items())))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None and key in self._conditional_decisions:
+            return self._conditional_decisions[key]
+
+        allowed = any(
+            all(predicate(arguments) for predicate in predicates)
+            for predicates in self._conditions[agent_index][permission_index]
+        )
+        if key is not None:
+            if len(self._conditional_decisions) >= _MAX_CONDITIONAL_CACHE_SIZE:
+                self._conditional_decisions.clear()
+            self._conditional_decisions[key] = allowed
+        return allowed
+
+    def authorize_ids(self, agent_index: int | None, permission_index: int,
+                      arguments: dict = None) -> bool:
+        """
+        Decides a call on interned IDs (see intern()) and counts the decision.
+        Conditional grants are evaluated against the call's arguments.
+        """
+        # Hot path: one cache lookup and one counted decision
+        # for unconditional decisions
+        key = (agent_index, permission_index)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decide(agent_index, permission_index)
+        allowed = decision == ALLOW or (
+            decision == CONDITIONAL
+            and self._check_conditions(agent_index, permission_index, arguments or {})
+        )
+        # Counter updates are read-modify-writes, and agents may call tools
+        # from several threads
+        with self._stats_lock:
+            if allowed:
+                self.allowed[key] += 1
+            else:
+                self.denied[key] += 1
+        return allowed
+
+    def authorize(self, agent_id: str, permission: str, arguments: dict = None) -> bool:
+        """
+        Decides whether an agent may perform an action requiring the permission, with
+        the given arguments.
+        """
+        return self.authorize_ids(*self.intern(agent_id, permission), arguments)
+
+    def is_granted(self, agent_id: str, permission: str) -> bool:
+        """
+        Checks whether an agent holds a permission at all, conditionally or not.
+        Used when equipping agents; it is not counted as a decision.
+        """
+        return self._decide(*self.intern(agent_id, permission)) != DENY
+
+    def get_permissions(self, agent_id: str) -> set[str]:
+        """
+        Returns the known permissions an agent holds, conditionally or not.
+        """
+        agent_index = self.agent_ids.get(agent_id)
+        if agent_index is None:
+            return set()
+        return {
+            permission
+            for permission_index, permission in enumerate(self.permission_names)
+            if self._decide(agent_index, permission_index) != DENY
+        }
+
+    def get_stats(self) -> dict:
+        """
+        Returns the allow/deny counters, in total and per agent and permission.
+        """
+        agent_names = {index: agent_id for agent_id, index in self.agent_ids.items()}
+        with self._stats_lock:
+            allowed, denied = Counter(self.allowed), Counter(self.denied)
+
+        def by_name(counter: Counter) -> dict:
+            return {
+                f"{agent_names.get(agent_index, '<unknown>')}:"
+                f"{self.permission_names[permission_index]}": count
+                for (agent_index, permission_index), count in counter.items()
+            }
+        return {
+            "allowed": sum(allowed.values()),
+            "denied": sum(denied.values()),
+            "allowed_by_agent_permission": by_name(allowed),
+            "denied_by_agent_permission": by_name(denied),
+        }
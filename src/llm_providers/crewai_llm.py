@@ -0,0 +1,134 @@
+# src/pantheon/llm_providers/crewai_llm.py
+from typing import Any
+
+from crewai.events.types.llm_events import LLMCallType
+from crewai.llms.base_llm import BaseLLM, llm_call_context
+from crewai.utilities.i18n import I18N_DEFAULT
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import convert_to_messages
+
+from src.llm_providers.prompt_cache import get_message_usage
+
+# CrewAI's tool listing in its system prompt starts with the header and ends
+# at the footer
+TOOLS_HEADER, TOOLS_FOOTER = I18N_DEFAULT.slice("tools").split("{tools}")
+TOOLS_FOOTER = TOOLS_FOOTER.split("{tool_names}")[0]
+# Stands in for the listing, whose tools the prompt prefix already describes
+TOOLS_REMINDER = (
+    "\nYou ONLY have access to the tools listed above, "
+    "and should NEVER make up tools that are not listed."
+)
+
+
+def render_crewai_persona(role: str, goal: str, backstory: str) -> str:
+    """
+    Renders the persona CrewAI writes at the start of an agent's system prompt.
+    The prompt prefix carries the persona and the tools, so the adapter puts it in place
+    of this text and of CrewAI's tool listing instead of sending them twice.
+    """
+    return (
+        I18N_DEFAULT.slice("role_playing").replace("{goal}", goal).replace(
+            "{role}", role
+        )
+        .replace("{backstory}", backstory)
+    )
+
+
+class CrewAILLMAdapter(BaseLLM):
+    """
+    Lets CrewAI agents call a chat model built by the LLMFactory (the provider model,
+    its rate limiter or a router over several routes). CrewAI only runs LLMs of its own
+    type and rebuilds any other model from its name, which would bypass those layers.
+
+    Calls are streamed: the chat model's callbacks (see StreamingCallbackHandler) get
+    every token as it is generated, and may halt the generation by raising
+    MissionHalted. The agent's prompt prefix (see build_prompt_prefix) leads every
+    prompt, so providers can serve it from their prompt cache. It replaces the persona
+    CrewAI renders into its system prompt (see render_crewai_persona).
+    """
+    llm_type: str = "langchain"
+    chat_model: BaseChatModel
+    prompt_prefix: str | None = None
+    persona_prompt: str | None = None
+    stream: bool | None = True
+
+    def call(self, messages: str | list[dict], tools: list[dict] | None = None,
+             callbacks: list[Any] | None = None,
+             available_functions: dict[str, Any] | None = None, from_task: Any = None,
+             from_agent: Any = None, response_model: Any = None) -> str:
+        with llm_call_context():
+            messages = self._format_messages(messages)
+            self._emit_call_started_event(
+                messages=messages, tools=tools, callbacks=callbacks,
+                available_functions=available_functions, from_task=from_task,
+                from_agent=from_agent
+            )
+            self._invoke_before_llm_call_hooks(messages, from_agent)
+            try:
+                response = self._stream(messages, from_task, from_agent)
+            except Exception as e:
+                self._emit_call_failed_event(
+                    error=str(e), from_task=from_task, from_agent=from_agent
+                )
+                raise
+
+            usage = self._track_usage(response)
+            text = self._apply_stop_words(response.text if response is not None else "")
+            text = self._invoke_after_llm_call_hooks(messages, text, from_agent)
+            self._emit_call_completed_event(
+                response=text, call_type=LLMCallType.LLM_CALL, from_task=from_task,
+                from_agent=from_agent, messages=messages, usage=usage
+            )
+            return text
+
+    def _with_prompt_prefix(self, messages: list[dict]) -> list[dict]:
+        if not self.prompt_prefix:
+            return messages
+        if messages and messages[0]["role"] == "system" and isinstance(
+            messages[0]["content"], str
+        ):
+            content = messages[0]["content"]
+            if self.persona_prompt and content.startswith(self.persona_prompt):
+                content = content[len(self.persona_prompt):]
+                tools_end = (
+                    content.find(TOOLS_FOOTER) if content.startswith(TOOLS_HEADER)
+                    else -1
+                )
+                if tools_end != -1:
+                    content = TOOLS_REMINDER + content[tools_end:]
+                content = f"{self.prompt_prefix}{content}"
+            else:
+                # A system prompt CrewAI rendered differently keeps its persona
+                # after the prefix
+                content = f"{self.prompt_prefix}\n\n{content}"
+            return [{**messages[0], "content": content}, *messages[1:]]
+        return [{"role": "system", "content": self.prompt_prefix}, *messages]
+
+    def _stream(self, messages: list[dict], from_task: Any = None,
+                from_agent: Any = None):
+        response = None
+        messages = convert_to_messages(self._with_prompt_prefix(messages))
+        for chunk in self.chat_model.stream(messages, stop=self.stop_sequences or None):
+            response = chunk if response is None else response + chunk
+            if chunk.text:
+                # Also surfaced on CrewAI's own event bus, for its listeners
+                self._emit_stream_chunk_event(
+                    chunk.text, from_task=from_task, from_agent=from_agent,
+                    call_type=LLMCallType.LLM_CALL
+                )
+        return response
+
+    def _track_usage(self, response) -> dict | None:
+        # The provider-reported usage (incl. prompt cache hits) is published
+        # by the callbacks;
+        # CrewAI keeps its own per-LLM totals as well
+        usage = get_message_usage(response)
+        if not usage:
+            return None
+        usage = {
+            "prompt_tokens": usage["input_tokens"],
+            "completion_tokens": usage["output_tokens"],
+            "cached_prompt_tokens": usage["cached_input_tokens"],
+        }
+        self._track_token_usage_internal(usage)
+        return usage
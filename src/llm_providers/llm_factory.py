@@ -1,35 +1,172 @@
-from dotenv import load_dotenv
-
-# Load environment variables from .env file before anything else
-load_dotenv()
-
 import os
 
+from dotenv import load_dotenv
 from langchain_google_vertexai import ChatVertexAI
 from langchain_openai import ChatOpenAI
 
 from src.config.config_loader import ConfigLoader
+from src.llm_providers.crewai_llm import CrewAILLMAdapter
+from src.llm_providers.rate_limited_chat_model import RateLimitedChatModel
+from src.llm_providers.rate_limiter import get_rate_limiter
+from src.llm_providers.routing_chat_model import LLMRoute, RoutingChatModel
 from src.observability import logger
 
+# Load environment variables from .env file before any provider client is built
+load_dotenv()
+
 
 class LLMFactory:
     def __init__(self):
         self.config_loader = ConfigLoader()
 
-    def create_llm(self, provider_id: str):
+    def create_llm(self, provider_id: str, callbacks: list = None,
+                   prompt_cache_key: str = None):
         """
         Creates an LLM instance based on a provider ID.
 
+        If the provider config defines `rate_limits`, the LLM is wrapped so that its
+        calls are metered by the provider's shared token bucket and retried with backoff
+        on rate-limit errors (configured under `retry`). A provider of type "router"
+        spreads requests over its `routes` (see RoutingChatModel).
+
         Args:
-            provider_id: The generic provider ID (e.g., "google_gemini", "openai").
+            provider_id: The generic provider ID (e.g., "google_gemini", "openai",
+                "router").
+            callbacks: Optional LangChain callback handlers. When given, the LLM streams
+                its tokens to them as they are generated.
+            prompt_cache_key: Optional handle of the caller's stable prompt prefix,
+                passed to providers that route requests to their prompt cache by key.
 
         Returns:
             An instance of a LangChain LLM.
         """
         config = self.config_loader.load_llm_config(provider_id)
+        if config.get("provider") == "router":
+            return self._create_router_llm(
+                config, callbacks=callbacks, prompt_cache_key=prompt_cache_key
+            )
+        return self._create_rate_limited_llm(
+            provider_id, config, streaming=bool(callbacks), callbacks=callbacks,
+            prompt_cache_key=prompt_cache_key
+        )
+
+    def create_agent_llm(self, provider_id: str, callbacks: list = None,
+                         prompt_cache_key: str = None, prompt_prefix: str = None,
+                         persona_prompt: str = None) -> CrewAILLMAdapter:
+        """
+        Creates the LLM of a CrewAI agent: the chat model of create_llm, adapted so that
+        CrewAI sends every call of the agent through it. The prompt_prefix, if given,
+        leads every prompt of the agent in place of CrewAI's persona_prompt.
+        """
+        chat_model = self.create_llm(
+            provider_id, callbacks=callbacks, prompt_cache_key=prompt_cache_key
+        )
+        _, primary_config = self.get_primary_route(provider_id)
+        return CrewAILLMAdapter(
+            model=primary_config.get("model") or provider_id, chat_model=chat_model,
+            prompt_prefix=prompt_prefix, persona_prompt=persona_prompt
+        )
+
+    def get_primary_route(self, provider_id: str) -> tuple[str, dict]:
+        """
+        Returns the provider ID and config of the provider that serves a request first,
+        i.e. the first route of a router, or the provider itself.
+        """
+        config = self.config_loader.load_llm_config(provider_id)
+        if config.get("provider") != "router":
+            return provider_id, config
+        return self._load_route_config(config["routes"][0])
+
+    def _load_route_config(self, route: str | dict) -> tuple[str, dict]:
+        # A route is a provider ID, or a mapping with a provider ID and an
+        # optional model override
+        if isinstance(route, str):
+            route = {"provider": route}
+        config = self.config_loader.load_llm_config(route["provider"])
+        if route.get("model"):
+            config["model"] = route["model"]
+        return route["provider"], config
+
+    def _create_router_llm(self, config: dict, callbacks: list = None,
+                           prompt_cache_key: str = None) -> RoutingChatModel:
+        hedging_config = config.get("hedging", {})
+        breaker_config = config.get("circuit_breaker", {})
+
+        routes = []
+        for route in config.get("routes", []):
+            route_provider_id, route_config = self._load_route_config(route)
+            # The router forwards the streamed tokens of the winning route to
+            # the callbacks itself
+            llm = self._create_rate_limited_llm(
+                route_provider_id, route_config, streaming=bool(callbacks),
+                prompt_cache_key=prompt_cache_key
+            )
+            routes.append(LLMRoute(
+                provider_id=route_provider_id,
+                model=route_config.get("model"),
+                llm=llm,
+                failure_threshold=breaker_config.get("failure_threshold", 3),
+                recovery_seconds=breaker_config.get("recovery_seconds", 60.0),
+            ))
+        if not routes:
+            raise ValueError(
+                "A router LLM provider needs at least one entry in 'routes'"
+            )
 
+        logger.debug(f"Routing LLM requests over {[route.key for route in routes]}.")
+        return RoutingChatModel(
+            routes=routes, hedging_enabled=hedging_config.get("enabled", True),
+            latency_percentile=hedging_config.get("latency_percentile", 95.0),
+            min_latency_samples=hedging_config.get("min_samples", 20),
+            initial_hedge_delay_seconds=hedging_config.get(
+                "initial_delay_seconds", 10.0
+            ),
+            max_hedges=hedging_config.get("max_hedges", 1), callbacks=callbacks,
+        )
+
+    def _create_rate_limited_llm(self, provider_id: str, config: dict,
+                                 streaming: bool = False, callbacks: list = None,
+                                 prompt_cache_key: str = None):
+        rate_limits = config.get("rate_limits")
+        if not rate_limits:
+            return self._create_provider_llm(
+                config, streaming=streaming, callbacks=callbacks,
+                prompt_cache_key=prompt_cache_key
+            )
+
+        retry_config = config.get("retry", {})
+        # Retries are handled by the wrapper so they can respect the shared quota;
+        # the callbacks are attached to the wrapper, which forwards the streamed tokens.
+        llm = self._create_provider_llm(
+            config, streaming=streaming, callbacks=None, max_retries=0,
+            prompt_cache_key=prompt_cache_key
+        )
+        limiter = get_rate_limiter(provider_id, config.get("model"), rate_limits)
+        logger.debug(f"Rate limiting '{provider_id}' with {rate_limits}.")
+        return RateLimitedChatModel(
+            llm=llm,
+            limiter=limiter,
+            max_retries=retry_config.get("max_retries", 5),
+            initial_backoff_seconds=retry_config.get("initial_backoff_seconds", 1.0),
+            max_backoff_seconds=retry_config.get("max_backoff_seconds", 60.0),
+            expected_output_tokens=rate_limits.get("expected_output_tokens", 512),
+            callbacks=callbacks,
+        )
+
+    def _create_provider_llm(self, config: dict, streaming: bool = False,
+                             callbacks: list = None, max_retries: int = None,
+                             prompt_cache_key: str = None):
+        """
+        Creates the provider's LangChain chat model from its config.
+
+        Gemini 2.5 models cache repeated prompt prefixes implicitly; OpenAI additionally
+        takes a prompt_cache_key that routes requests sharing a prefix to the same
+        cache.
+        """
         provider_type = config.get("provider")
         model = config.get("model")
+        # Only override the client's own retry policy when asked to
+        retry_kwargs = {"max_retries": max_retries} if max_retries is not None else {}
 
         if provider_type == "google_vertex_ai":
             # For Google, project_id and location are needed.
@@ -38,10 +175,18 @@ class LLMFactory:
             location = os.getenv("GCP_LOCATION")
 
             if not project_id or not location:
-                raise ValueError("GCP_PROJECT_ID and GCP_LOCATION must be set in the .env file")
+                raise ValueError(
+                    "GCP_PROJECT_ID and GCP_LOCATION must be set in the .env file"
+                )
 
-            logger.debug(f"Attempting to create ChatVertexAI with project: {project_id}, location: {location}, model: {model}")
-            llm = ChatVertexAI(model_name=model, project=project_id, location=location)
+            logger.debug(
+                "Attempting to create ChatVertexAI with project: "
+                f"{project_id}, location: {location}, model: {model}"
+            )
+            llm = ChatVertexAI(
+                model_name=model, project=project_id, location=location,
+                streaming=streaming, callbacks=callbacks, **retry_kwargs
+            )
             logger.debug("Successfully created ChatVertexAI instance.")
             return llm
 
@@ -51,7 +196,17 @@ class LLMFactory:
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY must be set in the .env file")
-            return ChatOpenAI(model_name=model, api_key=api_key, temperature=1.0)
+            cache_kwargs = (
+                {"extra_body": {"prompt_cache_key": prompt_cache_key}}
+                if prompt_cache_key else {}
+            )
+            return ChatOpenAI(
+                model_name=model, api_key=api_key, temperature=1.0, streaming=streaming,
+                callbacks=callbacks,
+                # Report token usage (incl. cached tokens) when streaming, too
+                stream_usage=True,
+                **retry_kwargs, **cache_kwargs
+            )
 
         else:
             raise ValueError(f"Unsupported LLM provider: {provider_type}")
@@ -0,0 +1,57 @@
+# src/pantheon/llm_providers/prompt_cache.py
+import hashlib
+import json
+
+from crewai.utilities.string_utils import sanitize_tool_name
+
+
+def build_prompt_prefix(role: str, goal: str, backstory: str, tools: list) -> str:
+    """
+    Renders the static part of an agent's prompt (persona and tool schemas)
+    deterministically, so that it is byte-identical on every call and providers
+    can serve it from their prompt cache. Tools are named as the agent calls them.
+    """
+    tool_schemas = []
+    for tool in sorted(tools, key=lambda tool: tool.name):
+        args_schema = getattr(tool, "args_schema", None)
+        tool_schemas.append({
+            "name": sanitize_tool_name(tool.name),
+            "description": tool.description,
+            "parameters": args_schema.model_json_schema() if args_schema else {},
+        })
+    return (
+        f"Role: {role}\nGoal: {goal}\nBackstory: {backstory}\n"
+        f"Tools: {json.dumps(tool_schemas, sort_keys=True, separators=(',', ':'))}"
+    )
+
+
+def get_prompt_cache_key(agent_id: str, prompt_prefix: str) -> str:
+    """
+    Returns the cache handle of a prompt prefix. It changes whenever the prefix does,
+    so requests are only routed to a cache that can actually hold their prefix.
+    """
+    digest = hashlib.sha256(prompt_prefix.encode("utf-8")).hexdigest()[:16]
+    return f"pantheon-{agent_id}-{digest}"
+
+
+def get_usage(generation) -> dict | None:
+    """
+    Extracts the provider-reported token usage of a LangChain chat generation, including
+    the input tokens served from the provider's prompt cache.
+    """
+    return get_message_usage(getattr(generation, "message", None))
+
+
+def get_message_usage(message) -> dict | None:
+    """
+    Extracts the provider-reported token usage of a LangChain AI message, see get_usage.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return None
+    input_token_details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "cached_input_tokens": input_token_details.get("cache_read", 0) or 0,
+        "output_tokens": usage.get("output_tokens", 0),
+    }
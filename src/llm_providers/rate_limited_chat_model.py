@@ -0,0 +1,108 @@
+# src/pantheon/llm_providers/rate_limited_chat_model.py
+import time
+from typing import Any, Iterator
+
+import tiktoken
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from src.llm_providers.rate_limiter import (
+    TokenBucketLimiter,
+    compute_backoff,
+    get_retry_after,
+    is_rate_limit_error,
+)
+from src.observability import logger
+
+_encoding = tiktoken.get_encoding("cl100k_base")
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Wraps a LangChain chat model so that every call is metered by the provider's
+    shared token bucket before dispatch, and retried with jittered exponential
+    backoff (honouring Retry-After) when the provider answers with a rate limit.
+    """
+    llm: BaseChatModel
+    limiter: TokenBucketLimiter
+    max_retries: int = 5
+    initial_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 60.0
+    expected_output_tokens: int = 512
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate_limited_{self.llm._llm_type}"
+
+    def _estimate_tokens(self, messages: list[BaseMessage]) -> int:
+        prompt = "\n".join(str(message.content) for message in messages)
+        return len(_encoding.encode(prompt)) + self.expected_output_tokens
+
+    @staticmethod
+    def _actual_tokens(result: ChatResult) -> int | None:
+        for generation in result.generations:
+            usage = getattr(generation.message, "usage_metadata", None)
+            if usage:
+                return usage.get("total_tokens")
+        token_usage = (result.llm_output or {}).get("token_usage") or {}
+        return token_usage.get("total_tokens")
+
+    def _wait_before_retry(self, error: Exception, attempt: int):
+        retry_after = get_retry_after(error)
+        self.limiter.penalize(retry_after)
+        delay = compute_backoff(
+            attempt, self.initial_backoff_seconds, self.max_backoff_seconds, retry_after
+        )
+        logger.warning(
+            f"[RateLimit] Attempt {attempt + 1}/{self.max_retries + 1} "
+            f"rate limited, retrying in {delay:.2f}s."
+        )
+        time.sleep(delay)
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                  run_manager: CallbackManagerForLLMRun | None = None,
+                  **kwargs: Any) -> ChatResult:
+        estimated_tokens = self._estimate_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(estimated_tokens)
+            try:
+                result = self.llm._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self._wait_before_retry(e, attempt)
+                continue
+            self.limiter.reconcile(estimated_tokens, self._actual_tokens(result))
+            return result
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                run_manager: CallbackManagerForLLMRun | None = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        estimated_tokens = self._estimate_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(estimated_tokens)
+            started = False
+            try:
+                for chunk in self.llm._stream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Once tokens have been emitted the call cannot be transparently retried
+                if started or not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self._wait_before_retry(e, attempt)
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        # Let the wrapped model format the tools for its provider, but keep the calls
+        # going through this wrapper
+        bound = self.llm.bind_tools(tools, **kwargs)
+        return self.bind(**bound.kwargs)
@@ -0,0 +1,217 @@
+# src/pantheon/llm_providers/rate_limiter.py
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from src.observability import logger
+
+DEFAULT_RATE_LIMIT_DB = "checkpoints/rate_limits.db"
+
+RATE_LIMIT_ERROR_NAMES = ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+class TokenBucketLimiter:
+    """
+    A token bucket metering both requests and LLM tokens for one provider/model.
+
+    The bucket state lives in a SQLite database, and every update runs in an
+    immediate transaction, so the quota is shared by all threads and all worker
+    processes of the host that use the same database file.
+    """
+    def __init__(self, key: str, requests_per_minute: float = None,
+                 tokens_per_minute: float = None, db_path: str = DEFAULT_RATE_LIMIT_DB):
+        self.key = key
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    request_allowance REAL NOT NULL,
+                    token_allowance REAL NOT NULL,
+                    blocked_until REAL NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO rate_limit_buckets VALUES (?, ?, ?, 0, ?)",
+                (key, requests_per_minute or 0, tokens_per_minute or 0, time.time()),
+            )
+
+    def _refill(self, row: tuple, now: float) -> tuple[float, float]:
+        request_allowance, token_allowance, _, updated_at = row
+        elapsed = max(0.0, now - updated_at)
+        if self.requests_per_minute:
+            request_allowance = min(
+                self.requests_per_minute,
+                request_allowance + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            token_allowance = min(
+                self.tokens_per_minute,
+                token_allowance + elapsed * self.tokens_per_minute / 60
+            )
+        return request_allowance, token_allowance
+
+    def _try_acquire(self, tokens: float) -> float:
+        """
+        Takes one request and the given tokens from the bucket if available.
+        Returns 0 on success, otherwise the number of seconds to wait before retrying.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT request_allowance, token_allowance, blocked_until, "
+                "updated_at FROM rate_limit_buckets WHERE key = ?",
+                (self.key,),
+            ).fetchone()
+            blocked_until = row[2]
+            request_allowance, token_allowance = self._refill(row, now)
+
+            wait = max(0.0, blocked_until - now)
+            if self.requests_per_minute and request_allowance < 1:
+                wait = max(
+                    wait, (1 - request_allowance) * 60 / self.requests_per_minute
+                )
+            if self.tokens_per_minute and token_allowance < tokens:
+                wait = max(
+                    wait, (tokens - token_allowance) * 60 / self.tokens_per_minute
+                )
+
+            if wait == 0:
+                request_allowance -= 1
+                token_allowance -= tokens
+            self._conn.execute(
+                "UPDATE rate_limit_buckets SET request_allowance = ?, "
+                "token_allowance = ?, updated_at = ? WHERE key = ?",
+                (request_allowance, token_allowance, now, self.key),
+            )
+        return wait
+
+    def acquire(self, estimated_tokens: int = 0):
+        """
+        Blocks until the bucket allows one more request of the estimated token size.
+        """
+        # A request larger than the whole per-minute quota would otherwise wait forever
+        tokens = (
+            min(estimated_tokens, self.tokens_per_minute) if self.tokens_per_minute
+            else 0
+        )
+        waited = 0.0
+        while (wait := self._try_acquire(tokens)) > 0:
+            # Jitter spreads out waiters so they do not all retry at the same instant
+            delay = wait + random.uniform(0, min(1.0, wait))
+            logger.debug(f"[RateLimit] '{self.key}' throttled, waiting {delay:.2f}s.")
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            logger.info(
+                f"[RateLimit] '{self.key}' request admitted after {waited:.2f}s."
+            )
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """
+        Corrects the token allowance once the actual usage of a request is known.
+        """
+        if not self.tokens_per_minute or actual_tokens is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE rate_limit_buckets SET token_allowance = MIN(?, "
+                "token_allowance + ?) WHERE key = ?",
+                (self.tokens_per_minute, estimated_tokens - actual_tokens, self.key),
+            )
+
+    def penalize(self, retry_after: float = None):
+        """
+        Reacts to a rate-limit response from the provider: empties the bucket and, if
+        the provider said when to retry, blocks every caller sharing the bucket until
+        then.
+        """
+        now = time.time()
+        blocked_until = now + retry_after if retry_after else now
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE rate_limit_buckets SET "
+                "request_allowance = MIN(request_allowance, 0), "
+                "blocked_until = MAX(blocked_until, ?), updated_at = ? WHERE key = ?",
+                (blocked_until, now, self.key),
+            )
+        logger.warning(
+            f"[RateLimit] '{self.key}' rate limited by "
+            f"provider (retry after: {retry_after})."
+        )
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider_id: str, model: str, rate_limits: dict,
+                     db_path: str = DEFAULT_RATE_LIMIT_DB) -> TokenBucketLimiter:
+    """
+    Returns the process-wide limiter of a provider/model, creating it on first use.
+    """
+    key = f"{provider_id}/{model}"
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = TokenBucketLimiter(
+                key=key,
+                requests_per_minute=rate_limits.get("requests_per_minute"),
+                tokens_per_minute=rate_limits.get("tokens_per_minute"),
+                db_path=db_path,
+            )
+        return _limiters[key]
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Checks whether an exception raised by a provider client is a rate-limit (429) error.
+    """
+    status_code = (
+        getattr(error, "status_code", None)
+        or getattr(getattr(error, "response", None), "status_code", None)
+    )
+    return status_code == 429 or type(error).__name__ in RATE_LIMIT_ERROR_NAMES
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """
+    Extracts the Retry-After delay (in seconds) from a provider error, if
+    it carries one.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000 if header == "retry-after-ms" else seconds
+    return getattr(error, "retry_after", None)
+
+
+def compute_backoff(attempt: int, initial_backoff: float, max_backoff: float,
+                    retry_after: float = None) -> float:
+    """
+    Exponential backoff with full jitter, never shorter than the provider's Retry-After.
+    """
+    delay = random.uniform(0, min(max_backoff, initial_backoff * (2 ** attempt)))
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
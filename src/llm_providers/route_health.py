@@ -0,0 +1,95 @@
+# src/pantheon/llm_providers/route_health.py
+import threading
+import time
+from collections import deque
+
+from src.observability import logger
+
+
+class CircuitBreaker:
+    """
+    Tracks the consecutive failures of one LLM route. After `failure_threshold`
+    failures in a row the circuit opens and the route is skipped for `recovery_seconds`;
+    afterwards requests are let through again, and a single further failure re-opens it.
+    """
+    def __init__(self, key: str, failure_threshold: int = 3,
+                 recovery_seconds: float = 60.0):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            return time.monotonic() >= self.open_until
+
+    def record_success(self):
+        with self._lock:
+            if self.consecutive_failures >= self.failure_threshold:
+                logger.info(f"[Router] Circuit of '{self.key}' closed again.")
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.recovery_seconds
+                logger.warning(
+                    f"[Router] Circuit of '{self.key}' opened after "
+                    f"{self.consecutive_failures} consecutive failures, "
+                    f"skipping it for {self.recovery_seconds}s."
+                )
+
+
+class LatencyTracker:
+    """
+    Keeps a sliding window of the latencies observed on one LLM route.
+    """
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float, min_samples: int = 1) -> float | None:
+        """
+        Returns the given percentile of the window, or None until
+        min_samples were recorded.
+        """
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+
+_breakers = {}
+_latency_trackers = {}
+_health_lock = threading.Lock()
+
+
+def get_circuit_breaker(key: str, failure_threshold: int = 3,
+                        recovery_seconds: float = 60.0) -> CircuitBreaker:
+    """
+    Returns the process-wide circuit breaker of a route, creating it on first use.
+    """
+    with _health_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(key, failure_threshold, recovery_seconds)
+        return _breakers[key]
+
+
+def get_latency_tracker(key: str) -> LatencyTracker:
+    """
+    Returns the process-wide latency tracker of a route, creating it on first use.
+    """
+    with _health_lock:
+        if key not in _latency_trackers:
+            _latency_trackers[key] = LatencyTracker()
+        return _latency_trackers[key]
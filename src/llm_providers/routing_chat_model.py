@@ -0,0 +1,296 @@
+# src/pantheon/llm_providers/routing_chat_model.py
+import queue
+import threading
+import time
+from typing import Any, Iterator
+
+import tiktoken
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from src.llm_providers.route_health import get_circuit_breaker, get_latency_tracker
+from src.observability import logger
+
+_encoding = tiktoken.get_encoding("cl100k_base")
+
+
+class LLMRoute:
+    """
+    One provider/model a RoutingChatModel can send requests to, with its health state.
+    """
+    def __init__(self, provider_id: str, model: str, llm: BaseChatModel,
+                 failure_threshold: int = 3, recovery_seconds: float = 60.0):
+        self.provider_id = provider_id
+        self.model = model
+        self.llm = llm
+        self.key = f"{provider_id}/{model}"
+        self.breaker = get_circuit_breaker(
+            self.key, failure_threshold, recovery_seconds
+        )
+
+    def latency(self, streaming: bool):
+        # Time to first chunk and time to a full response are tracked separately
+        return get_latency_tracker(
+            f"{self.key}:{'stream' if streaming else 'generate'}"
+        )
+
+
+class _Attempt:
+    """
+    A request sent to one route as part of a routed call.
+    """
+    def __init__(self, route: LLMRoute):
+        self.route = route
+        self.started_at = time.monotonic()
+        self.cancelled = threading.Event()
+        self.failed = False
+        self.won = False
+        self.text = "" # Output received so far, used to cost a discarded attempt
+
+
+class RoutingChatModel(BaseChatModel):
+    """
+    Sends each request to an ordered list of provider/model routes.
+
+    The first route whose circuit is closed is the primary. If it has not answered
+    within the configured latency percentile, a hedged duplicate is sent to the next
+    route and the first answer wins. Failed routes are failed over, and routes that keep
+    failing are skipped by their circuit breaker until they recover. The usage of
+    discarded hedges is reported in the generation info under `hedge_usage`.
+    """
+    routes: list[LLMRoute]
+    hedging_enabled: bool = True
+    latency_percentile: float = 95.0
+    min_latency_samples: int = 20
+    initial_hedge_delay_seconds: float = 10.0
+    max_hedges: int = 1
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "routing"
+
+    def _available_routes(self) -> list[LLMRoute]:
+        routes = [route for route in self.routes if route.breaker.allow_request()]
+        if not routes:
+            logger.warning(
+                "[Router] Every route has an open circuit, trying all of them."
+            )
+            return list(self.routes)
+        return routes
+
+    def _hedge_delay(self, route: LLMRoute, streaming: bool) -> float:
+        delay = route.latency(streaming).percentile(
+            self.latency_percentile, self.min_latency_samples
+        )
+        return self.initial_hedge_delay_seconds if delay is None else delay
+
+    @staticmethod
+    def _run_attempt(attempt: _Attempt, events: queue.Queue,
+                     messages: list[BaseMessage], stop: list[str] | None,
+                     streaming: bool, kwargs: dict):
+        # Tools bound to the router are formatted for each route
+        # separately (see bind_tools)
+        route_kwargs = kwargs.get("route_kwargs", {}).get(attempt.route.key, {})
+        kwargs = {
+            **{key: value for key, value in kwargs.items() if key != "route_kwargs"},
+            **route_kwargs
+        }
+        try:
+            if streaming:
+                # Chunks are forwarded to the callbacks by the router, once it knows
+                # which attempt won
+                stream = attempt.route.llm._stream(
+                    messages, stop=stop, run_manager=None, **kwargs
+                )
+                try:
+                    for chunk in stream:
+                        if attempt.cancelled.is_set():
+                            break
+                        events.put((attempt, "chunk", chunk))
+                finally:
+                    stream.close()
+            else:
+                events.put((
+                    attempt, "result",
+                    attempt.route.llm._generate(
+                        messages, stop=stop, run_manager=None, **kwargs
+                    )
+                ))
+            events.put((attempt, "done", None))
+        except Exception as e:
+            events.put((attempt, "error", e))
+
+    def _route(self, messages: list[BaseMessage], stop: list[str] | None,
+               streaming: bool, attempts: list[_Attempt],
+               kwargs: dict) -> Iterator[Any]:
+        """
+        Runs the request over the routes and yields the chunks (or the result) of the
+        winning attempt. Every attempt made is appended to `attempts`.
+        """
+        routes = self._available_routes()
+        events = queue.Queue()
+        running = set()
+        winner = None
+        hedges = 0
+        last_error = None
+
+        def launch() -> bool:
+            if len(attempts) >= len(routes):
+                return False
+            attempt = _Attempt(routes[len(attempts)])
+            attempts.append(attempt)
+            running.add(attempt)
+            threading.Thread(
+                target=self._run_attempt,
+                args=(attempt, events, messages, stop, streaming, kwargs), daemon=True
+            ).start()
+            return True
+
+        launch()
+        try:
+            while running:
+                timeout = None
+                if (self.hedging_enabled and winner is None and hedges < self.max_hedges
+                        and len(attempts) < len(routes)):
+                    latest = attempts[-1]
+                    hedge_delay = self._hedge_delay(latest.route, streaming)
+                    timeout = max(
+                        0.0, latest.started_at + hedge_delay - time.monotonic()
+                    )
+                try:
+                    attempt, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    hedges += 1
+                    logger.info(
+                        f"[Router] '{latest.route.key}' has not "
+                        f"answered within {hedge_delay:.2f}s, "
+                        f"hedging to '{routes[len(attempts)].key}'."
+                    )
+                    launch()
+                    continue
+
+                if kind == "error":
+                    running.discard(attempt)
+                    attempt.failed = True
+                    attempt.route.breaker.record_failure()
+                    logger.warning(
+                        f"[Router] Request to '{attempt.route.key}' failed: {payload}"
+                    )
+                    if attempt is winner:
+                        raise payload
+                    last_error = payload
+                    if winner is None and not running and launch():
+                        logger.info(
+                            f"[Router] Failing over to '{attempts[-1].route.key}'."
+                        )
+                    continue
+
+                if winner is None:
+                    winner = attempt
+                    attempt.won = True
+                    attempt.route.latency(streaming).record(
+                        time.monotonic() - attempt.started_at
+                    )
+                    attempt.route.breaker.record_success()
+                    for other in running:
+                        if other is not winner:
+                            other.cancelled.set()
+                    if attempt is not attempts[0]:
+                        logger.info(
+                            f"[Router] Request answered by '{attempt.route.key}'."
+                        )
+
+                if attempt is not winner:
+                    if kind == "chunk":
+                        attempt.text += payload.text
+                    elif kind == "result":
+                        attempt.text = (
+                            payload.generations[0].text if payload.generations else ""
+                        )
+                    else:
+                        running.discard(attempt)
+                    continue
+
+                if kind == "done":
+                    return
+                yield payload
+        finally:
+            for attempt in attempts:
+                attempt.cancelled.set()
+
+        raise last_error or RuntimeError("No LLM route answered the request.")
+
+    def _hedge_usage(self, messages: list[BaseMessage], attempts: list[_Attempt],
+                     output_text: str, streaming: bool) -> list[dict]:
+        """
+        Estimates the usage of the attempts whose answers were discarded.
+        """
+        input_tokens = len(
+            _encoding.encode("\n".join(str(message.content) for message in messages))
+        )
+        usage = []
+        for attempt in attempts:
+            if attempt.won or attempt.failed:
+                continue
+            # A cancelled stream stops at the chunks received; a request still in flight
+            # when the winner answered is assumed to produce as much output
+            # as the winner
+            output = attempt.text if streaming else attempt.text or output_text
+            usage.append({
+                "provider_id": attempt.route.provider_id,
+                "model": attempt.route.model,
+                "input_tokens": input_tokens,
+                "output_tokens": len(_encoding.encode(output)),
+            })
+        return usage
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                  run_manager: CallbackManagerForLLMRun | None = None,
+                  **kwargs: Any) -> ChatResult:
+        attempts = []
+        route = self._route(messages, stop, False, attempts, kwargs)
+        try:
+            result = next(route)
+        finally:
+            route.close()
+        output_text = result.generations[0].text if result.generations else ""
+        hedge_usage = self._hedge_usage(
+            messages, attempts, output_text, streaming=False
+        )
+        if hedge_usage and result.generations:
+            generation = result.generations[0]
+            generation.generation_info = {
+                **(generation.generation_info or {}), "hedge_usage": hedge_usage
+            }
+        return result
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                run_manager: CallbackManagerForLLMRun | None = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        attempts = []
+        output_text = ""
+        for chunk in self._route(messages, stop, True, attempts, kwargs):
+            output_text += chunk.text
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+        hedge_usage = self._hedge_usage(messages, attempts, output_text, streaming=True)
+        if hedge_usage:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=""),
+                generation_info={"hedge_usage": hedge_usage}
+            )
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        # Each route formats the tools for its own provider; the attempt picks
+        # its route's arguments
+        route_kwargs = {
+            route.key: route.llm.bind_tools(tools, **kwargs).kwargs
+            for route in self.routes
+        }
+        return self.bind(route_kwargs=route_kwargs)
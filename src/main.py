@@ -1,60 +1,307 @@
 import argparse
-
-from crewai import Crew, Task
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Callable, Iterator
 
 from src.agents.agent_factory import AgentFactory
 from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import CostLedger
 from src.governance.economic_governor import EconomicGovernor
-from src.memory.long_term_memory import LongTermMemory
+from src.governance.injection_filter import InjectionFilter
+from src.llm_providers.llm_factory import LLMFactory
+from src.memory.learning_queue import LearningQueue, get_learning_queue
 from src.observability import logger
+from src.observability.events import EventBus, MissionEvent
+from src.observability.streaming import ConsoleStreamPrinter
+from src.orchestrators.work_queue import (
+    COMPLETED,
+    MISSION_JOB,
+    RemoteStepExecutor,
+    WorkQueue,
+    create_work_queue,
+)
 from src.tasks.task_factory import TaskFactory
+from src.workflows.approval_queue import ApprovalQueue
+from src.workflows.checkpoint_store import CheckpointStore
+from src.workflows.human_in_the_loop import HITLManager
 from src.workflows.workflow_factory import WorkflowFactory
 
 
 class MissionControl:
-    def __init__(self, mission_id: str, llm_provider: str, orchestrator_override: str = None):
+    def __init__(self, mission_id: str, llm_provider: str,
+                 orchestrator_override: str = None, run_id: str = None,
+                 checkpoint_store: CheckpointStore = None, approval_mode: str = None,
+                 speculative: bool = False, agent_factory: AgentFactory = None,
+                 agents: dict = None, cost_ledger: CostLedger = None,
+                 learning_queue: LearningQueue = None, work_queue: WorkQueue = None,
+                 distribute_steps: bool = False):
+        """
+        A pre-built agent_factory and its agents can be passed in to reuse warm agents
+        across missions (see src/server.py); otherwise they are built for this mission.
+        The post-mission learning runs on the learning_queue (the process-wide one by
+        default). With distribute_steps, the task executions run on the worker fleet of
+        the work_queue (see src/worker.py) while this process keeps the workflow, its
+        approvals and its budget.
+        """
         self.mission_id = mission_id
         self.llm_provider = llm_provider
+        self.checkpoint_store = checkpoint_store or CheckpointStore()
+        self.approval_queue = ApprovalQueue(self.checkpoint_store.db_path)
+        self.hitl_manager = HITLManager(
+            approval_queue=self.approval_queue, mode=approval_mode
+        )
+        self.learning_queue = learning_queue or get_learning_queue()
+        self.item_results = {}
 
-        logger.info(f"Initializing mission '{mission_id}' with LLM provider '{llm_provider}'.")
+        logger.info(
+            f"Initializing mission '{mission_id}' with LLM provider '{llm_provider}'."
+        )
 
         self.config_loader = ConfigLoader()
         self.mission_config = self.config_loader.load_mission_config(mission_id)
 
         # The orchestrator can be overridden by a command-line argument
-        self.orchestrator = orchestrator_override or self.mission_config.get("orchestrator_adapter")
+        self.orchestrator = (
+            orchestrator_override or self.mission_config.get("orchestrator_adapter")
+        )
         logger.info(f"Using orchestrator: {self.orchestrator}")
 
-        # Determine the model name for cost calculation
-        llm_config = self.config_loader.load_llm_config(self.llm_provider)
+        # Every run is checkpointed; an existing run ID resumes that run instead
+        if run_id:
+            self.run_id = run_id
+            logger.info(f"Attaching to existing run '{run_id}'.")
+        else:
+            self.run_id = self.checkpoint_store.create_run(
+                self.mission_id, self.llm_provider, self.orchestrator
+            )
+        self.event_bus = EventBus(self.run_id)
+
+        # Determine the model name for cost calculation (a router's work is priced at
+        # its primary route)
+        cost_provider, llm_config = LLMFactory().get_primary_route(self.llm_provider)
         model_name = llm_config.get("model")
         if not model_name:
-            raise ValueError(f"Model name not found in config for provider '{self.llm_provider}'")
-
-        agent_definitions_path = self.mission_config.get("agent_definitions") + ".yaml"
-        agent_definitions = self.config_loader.load_agent_definitions(agent_definitions_path)
+            raise ValueError(
+                f"Model name not found in config for provider '{cost_provider}'"
+            )
 
-        self.agent_factory = AgentFactory(llm_provider=self.llm_provider)
-        self.agents = self.agent_factory.create_agents(agent_definitions)
+        if agent_factory is not None and agents is not None:
+            self.agent_factory = agent_factory
+            self.agent_factory.bind_event_bus(self.event_bus)
+            self.agents = agents
+        else:
+            agent_definitions_path = (
+                self.mission_config.get("agent_definitions") + ".yaml"
+            )
+            agent_definitions = self.config_loader.load_agent_definitions(
+                agent_definitions_path
+            )
+            self.agent_factory = AgentFactory(
+                llm_provider=self.llm_provider, event_bus=self.event_bus
+            )
+            # Only the agents the workflow uses are built
+            self.agents = self.agent_factory.create_agents(
+                agent_definitions,
+                agent_ids=AgentFactory.get_workflow_agent_ids(self.mission_config)
+            )
 
         self.task_factory = TaskFactory()
-        self.tasks = self.task_factory.create_tasks(self.mission_config, self.agents, orchestrator_override=self.orchestrator)
+        self.tasks = self.task_factory.create_tasks(
+            self.mission_config, self.agents, orchestrator_override=self.orchestrator
+        )
 
         self.economic_governor = EconomicGovernor(
             mission_config=self.mission_config,
-            llm_provider=self.llm_provider,
-            model=model_name
+            llm_provider=cost_provider,
+            model=model_name,
+            cost_ledger=cost_ledger or CostLedger(),
+            run_id=self.run_id
         )
+        self._register_stream_guards()
+        self.event_bus.subscribe(self._track_hedge_cost)
         self.workflow = WorkflowFactory.create_workflow(
             mission_config=self.mission_config, agents=self.agents, tasks=self.tasks,
-            economic_governor=self.economic_governor, orchestrator_override=self.orchestrator
+            economic_governor=self.economic_governor,
+            orchestrator_override=self.orchestrator,
+            checkpoint_store=self.checkpoint_store, run_id=self.run_id,
+            hitl_manager=self.hitl_manager, event_bus=self.event_bus
         )
+        if speculative:
+            self.workflow.speculative_execution = True
+        if distribute_steps:
+            work_queue_config = self.config_loader.load_work_queue_config().get(
+                "work_queue", {}
+            )
+            self.workflow.step_executor = RemoteStepExecutor(
+                work_queue or create_work_queue(work_queue_config), self.mission_id,
+                self.llm_provider, self.orchestrator, self.run_id,
+                max_attempts=work_queue_config.get("max_attempts", 3),
+                timeout_seconds=work_queue_config.get("step_timeout_seconds")
+            )
+
+    @classmethod
+    def resume(cls, run_id: str, checkpoint_store: CheckpointStore = None,
+               approval_mode: str = None, speculative: bool = False,
+               **kwargs) -> "MissionControl":
+        """
+        Rebuilds the MissionControl of a checkpointed run so it continues from its first
+        incomplete step. Further keyword arguments (e.g. distribute_steps) are passed on
+        to the constructor.
+        """
+        checkpoint_store = checkpoint_store or CheckpointStore()
+        run = checkpoint_store.get_run(run_id)
+        if not run:
+            raise ValueError(f"No checkpointed run found with ID '{run_id}'.")
+        if run["status"] == "completed":
+            raise ValueError(f"Run '{run_id}' has already completed.")
+
+        return cls(
+            mission_id=run["mission_id"],
+            llm_provider=run["llm_provider"],
+            orchestrator_override=run["orchestrator"],
+            run_id=run_id,
+            checkpoint_store=checkpoint_store,
+            approval_mode=approval_mode,
+            speculative=speculative,
+            **kwargs
+        )
+
+    @staticmethod
+    def enqueue(mission_id: str, llm_provider: str, orchestrator_override: str = None,
+                work_queue: WorkQueue = None) -> tuple[WorkQueue, str]:
+        """
+        Submits a whole mission to the worker fleet instead of running it here.
+        Returns the work queue and the job ID to collect the result from.
+        """
+        work_queue_config = ConfigLoader().load_work_queue_config().get(
+            "work_queue", {}
+        )
+        work_queue = work_queue or create_work_queue(work_queue_config)
+        job_id = work_queue.enqueue(
+            MISSION_JOB,
+            {
+                "mission_id": mission_id, "llm_provider": llm_provider,
+                "orchestrator": orchestrator_override
+            },
+            max_attempts=work_queue_config.get("max_attempts", 3)
+        )
+        return work_queue, job_id
+
+    def _register_stream_guards(self):
+        """Registers the guards that can halt an agent mid-generation."""
+        self.event_bus.add_guard(self.economic_governor.as_budget_guard())
+
+        injection_filter_config = self.mission_config.get("governance", {}).get(
+            "injection_filter", {}
+        )
+        if injection_filter_config.get("enabled", False):
+            injection_filter = InjectionFilter(injection_filter_config.get("patterns"))
+            self.event_bus.add_guard(injection_filter.as_guard())
+
+    def _track_hedge_cost(self, event: MissionEvent):
+        """
+        Charges the duplicate requests discarded by a routing LLM to the mission budget.
+        """
+        if event.type == "llm_hedge":
+            self.economic_governor.track_hedge_cost(
+                event.agent_id, event.data["provider_id"], event.data["model"],
+                event.data["input_tokens"], event.data["output_tokens"]
+            )
+
+    def run(self, callbacks: list[Callable[[MissionEvent], None]] = None):
+        """
+        Assembles and runs the mission.
+        Callbacks receive every MissionEvent (tokens, steps, approvals) as it happens.
+        """
+        for callback in callbacks or []:
+            self.event_bus.subscribe(callback)
+        try:
+            return self._run()
+        finally:
+            for callback in callbacks or []:
+                self.event_bus.unsubscribe(callback)
+
+    def stream(self) -> Iterator[MissionEvent]:
+        """
+        Runs the mission in a background thread and yields its events as they happen.
+        """
+        events = queue.Queue()
+        finished = object()
+        errors = []
+
+        def run_mission():
+            try:
+                self.run(callbacks=[events.put])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                events.put(finished)
+
+        thread = threading.Thread(
+            target=run_mission, name=f"mission-{self.run_id}", daemon=True
+        )
+        thread.start()
+        while (event := events.get()) is not finished:
+            yield event
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    async def astream(self) -> AsyncIterator[MissionEvent]:
+        """
+        Async variant of stream(): runs the mission in an executor and
+        yields its events.
+        """
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def forward(event: MissionEvent):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        mission = loop.run_in_executor(None, lambda: self.run(callbacks=[forward]))
+        while not mission.done():
+            next_event = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait(
+                {next_event, mission}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if next_event in done:
+                yield next_event.result()
+            else:
+                next_event.cancel()
+        while not events.empty():
+            yield events.get_nowait()
+        await mission # Re-raise any mission error
+
+    def _run(self):
+        logger.info(f"--- Running Mission: {self.mission_id} (run '{self.run_id}') ---")
+        self.checkpoint_store.set_run_status(self.run_id, "running")
+        try:
+            final_result_data = self.workflow.execute()
+        except Exception:
+            self.checkpoint_store.set_run_status(self.run_id, "failed")
+            logger.error(
+                f"Mission {self.mission_id} failed. "
+                f"Resume it with '--resume {self.run_id}'."
+            )
+            raise
+        status = final_result_data.get("status", "completed")
+        self.checkpoint_store.set_run_status(self.run_id, status)
+        final_result = final_result_data.get(
+            "result", "No result returned from workflow."
+        )
+        # Results of the batched tasks, per item of their list input
+        self.item_results = final_result_data.get("items", {})
+        self.event_bus.publish("mission_completed", status=status, result=final_result)
+
+        if status == "suspended":
+            # The worker is released here; the run continues once the
+            # approval is decided
+            logger.info(
+                f"--- Mission {self.mission_id} Suspended (run '{self.run_id}') ---"
+            )
+            return final_result
 
-    def run(self):
-        """Assembles and runs the mission."""
-        logger.info(f"--- Running Mission: {self.mission_id} ---")
-        final_result_data = self.workflow.execute()
-        final_result = final_result_data.get("result", "No result returned from workflow.")
         logger.info(f"--- Mission {self.mission_id} Completed ---")
         logger.info(f"Final Result: {final_result}")
 
@@ -77,6 +324,7 @@ class MissionControl:
 
         print(f"\n{CYAN}--- Mission Summary ---{RESET}")
         print(f"{BOLD}{WHITE}Mission Name:{RESET} {self.mission_id}")
+        print(f"{BOLD}{WHITE}Run ID:{RESET} {self.run_id}")
 
         # Construct purpose from task descriptions
         purpose = f"{GREEN}Purpose:{RESET} "
@@ -86,101 +334,142 @@ class MissionControl:
         purpose += " ".join(task_descriptions)
         print(purpose)
 
-        print(f"{YELLOW}LLM Used:{RESET} {self.llm_provider} ({self.economic_governor.model})")
+        print(
+            f"{YELLOW}LLM Used:{RESET} {self.llm_provider} "
+            f"({self.economic_governor.model})"
+        )
         print(f"{YELLOW}Orchestrator Used:{RESET} {self.orchestrator}")
+        if self.agent_factory.policy_engine is not None:
+            # Counted since the agents were built, so warm agents include
+            # their earlier missions
+            policy_stats = self.agent_factory.policy_engine.get_stats()
+            print(
+                f"{YELLOW}Tool Calls Authorized:{RESET} {policy_stats['allowed']} "
+                f"allowed, {policy_stats['denied']} denied"
+            )
+        cache_outcomes = self.workflow.semantic_cache_outcomes
+        cache_lookups = sum(cache_outcomes.values())
+        if cache_lookups:
+            print(
+                f"{YELLOW}Semantic Cache:{RESET} "
+                f"{cache_outcomes['hit']}/{cache_lookups} steps served "
+                f"({cache_outcomes['rejected']} rejected by verification), "
+                f"hit rate {cache_outcomes['hit'] / cache_lookups:.0%}"
+            )
         print(f"\n{MAGENTA}{self.economic_governor.get_cost_breakdown()}{RESET}")
         print(f"{CYAN}-----------------------{RESET}")
 
     def _run_post_mission_learning(self, final_result: str):
-        logger.info("--- Post-mission Learning Phase ---")
-        ltm = LongTermMemory(self.mission_id)
-
-        # Create the Archivist agent
-        specialized_agents_config = self.config_loader.load_agent_definitions("specialized_agents.yaml")
-        archivist_config = specialized_agents_config['agents'][0]
-
-        # Use create_agent for a single agent instance
-        archivist_agent = self.agent_factory.create_agent(archivist_config)
-
-        # Define the learning task
-        learning_task_description = (
-            f"Analyze this mission result: '{final_result}'. "
-            "Summarize the single most important lesson learned as a concise sentence."
-        )
-
-        logger.info("Executing learning task with Archivist agent...")
-        lesson_learned = None
-        archivist_input_tokens = 0 # Placeholder
-        archivist_output_tokens = 0 # Placeholder
-        archivist_agent_id = archivist_config.get("id", "AI Mission Archivist") # Get agent ID
-
-        if self.orchestrator == "crewai":
-            # If crewai orchestrator, convert to crewai.Task and use Crew
-            crewai_learning_task = Task(
-                description=learning_task_description,
-                agent=archivist_agent._crewai_agent, # Use the underlying crewai.Agent
-                expected_output="A single sentence summarizing the key lesson."
-            )
-            learning_crew = Crew(
-                agents=[archivist_agent._crewai_agent],
-                tasks=[crewai_learning_task],
-                verbose=False
-            )
-            lesson_learned = learning_crew.kickoff()
-            # TODO: Extract actual token usage from crewai_learning_task or learning_crew result
-            # For now, using a rough estimate or placeholder
-            archivist_input_tokens = len(learning_task_description.split()) * 2 # Rough estimate
-            if lesson_learned:
-                lesson_text = lesson_learned.raw if hasattr(lesson_learned, "raw") else str(lesson_learned)
-                archivist_output_tokens = len(lesson_text.split()) * 2 # Rough estimate
-
-        else:
-            # For other orchestrators, directly invoke the agent with the task
-            # description
-            # This assumes the generic agent's invoke method can handle a simple prompt
-            # and return a string output.
-            result = archivist_agent.invoke({"input": learning_task_description, "tool_names": "", "tools": ""})
-            lesson_learned = result.get(
-                "output"
-            ) # Assuming the generic agent returns a dict with 'output'
-            # TODO: Extract actual token usage from result
-            # For now, using a rough estimate or placeholder
-            archivist_input_tokens = len(learning_task_description.split()) * 2 # Rough estimate
-            if lesson_learned:
-                archivist_output_tokens = len(lesson_learned.split()) * 2 # Rough estimate
-
-        # Track cost for Archivist agent
-        self.economic_governor.track_cost(
-            agent_id=archivist_agent_id,
-            input_tokens=archivist_input_tokens,
-            output_tokens=archivist_output_tokens
+        """
+        Queues the post-mission learning phase (Archivist lesson and long-term memory)
+        on the background learning queue, so the mission's latency does not include it.
+        """
+        logger.info("--- Post-mission Learning Phase (queued) ---")
+        self.learning_queue.enqueue(
+            self.run_id, self.mission_id, self.llm_provider, self.orchestrator,
+            final_result
         )
 
-        # Add the lesson to Long-Term Memory
-        if lesson_learned:
-            # Handle both string and RichText output from crewAI or direct string output
-            lesson_text = (
-                lesson_learned.raw
-                if hasattr(lesson_learned, "raw")
-                else str(lesson_learned)
-            )
-            ltm.add_lesson(lesson_text)
-
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a mission in Project Pantheon.")
-    parser.add_argument("--mission_id", required=True, help="The ID of the mission to run.")
-    parser.add_argument("--llm_provider", "--llm", default="google_gemini", help="The LLM provider to use (e.g., 'google_gemini', 'openai'). Defaults to 'google_gemini' if not specified.")
-    parser.add_argument("--orchestrator", help="Override the orchestrator specified in the mission config.")
+    parser.add_argument("--mission_id", help="The ID of the mission to run.")
+    parser.add_argument(
+        "--llm_provider", "--llm", default="google_gemini",
+        help="The LLM provider to use (e.g., 'google_gemini', "
+             "'openai', or 'router' for hedged multi-provider "
+             "routing). Defaults to 'google_gemini' if not specified."
+    )
+    parser.add_argument(
+        "--orchestrator",
+        help="Override the orchestrator specified in the mission config."
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID",
+        help="Resume a checkpointed run from its first incomplete step."
+    )
+    parser.add_argument(
+        "--speculative", action="store_true",
+        help="Speculatively run side-effect free steps while an approval is pending."
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Show agent output live as it is generated."
+    )
+    parser.add_argument(
+        "--approval_mode", choices=["console", "queue"],
+        help="How human approvals are collected. Defaults to "
+             "'console' on a terminal and 'queue' otherwise."
+    )
+    parser.add_argument(
+        "--enqueue", action="store_true",
+        help="Run the mission on the worker fleet (python "
+             "-m src.worker) and wait for its result."
+    )
+    parser.add_argument(
+        "--distribute_steps", action="store_true",
+        help="Run the mission's task executions on the worker fleet."
+    )
 
     args = parser.parse_args()
+    if not args.mission_id and not args.resume:
+        parser.error("--mission_id is required unless --resume is given.")
+
+    if args.enqueue and args.resume:
+        parser.error("--enqueue cannot be combined with --resume.")
 
     try:
-        control_plane = MissionControl(
-            mission_id=args.mission_id,
-            llm_provider=args.llm_provider,
-            orchestrator_override=args.orchestrator
-        )
-        control_plane.run()
+        if args.enqueue:
+            work_queue, job_id = MissionControl.enqueue(
+                args.mission_id, args.llm_provider, args.orchestrator
+            )
+            logger.info(
+                f"Mission '{args.mission_id}' queued as "
+                f"job '{job_id}', waiting for a worker..."
+            )
+            work_queue_config = ConfigLoader().load_work_queue_config().get(
+                "work_queue", {}
+            )
+            job = work_queue.wait(
+                job_id, timeout=work_queue_config.get("mission_timeout_seconds")
+            )
+            if job["status"] != COMPLETED:
+                raise RuntimeError(
+                    f"Job '{job_id}' failed after "
+                    f"{job['attempts']} attempt(s): {job['error']}"
+                )
+            job_result = job["result"]
+            logger.info(
+                f"Run '{job_result['run_id']}' ({job_result['status']}) "
+                f"finished on worker '{job_result['worker_id']}'."
+            )
+            print(job_result["result"])
+            print(job_result["cost_breakdown"])
+        else:
+            if args.resume:
+                control_plane = MissionControl.resume(
+                    args.resume, approval_mode=args.approval_mode,
+                    speculative=args.speculative, distribute_steps=args.distribute_steps
+                )
+            else:
+                control_plane = MissionControl(
+                    mission_id=args.mission_id,
+                    llm_provider=args.llm_provider,
+                    orchestrator_override=args.orchestrator,
+                    approval_mode=args.approval_mode,
+                    speculative=args.speculative,
+                    distribute_steps=args.distribute_steps
+                )
+            control_plane.run(
+                callbacks=[ConsoleStreamPrinter()] if args.stream else None
+            )
+            # The result is already out; the process only stays up to finish
+            # the queued learning
+            if control_plane.learning_queue.get_pending_count():
+                logger.info(
+                    "Finishing the post-mission learning in the background queue..."
+                )
+                control_plane.learning_queue.drain(timeout=300)
+                control_plane.learning_queue.stop()
     except Exception as e:
         logger.exception(f"An error occurred during mission execution: {e}")
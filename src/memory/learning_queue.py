@@ -0,0 +1,354 @@
+# src/pantheon/memory/learning_queue.py
+import os
+import sqlite3
+import threading
+import time
+
+from crewai import Crew, Task
+
+from src.agents.agent_factory import AgentFactory
+from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import CostLedger
+from src.governance.economic_governor import EconomicGovernor
+from src.llm_providers.llm_factory import LLMFactory
+from src.memory.long_term_memory import LongTermMemory, get_embedding_model
+from src.observability import logger
+
+DEFAULT_LEARNING_QUEUE_DB = "checkpoints/learning_queue.db"
+
+LEARNING_TASK_DESCRIPTION = (
+    "Analyze this mission result: '{final_result}'. "
+    "Summarize the single most important lesson learned as a concise sentence."
+)
+
+
+class LearningQueue:
+    """
+    A durable queue of post-mission learning jobs, processed by a background worker
+    so that a mission returns as soon as its result is known.
+
+    Jobs are written to SQLite before enqueue() returns, so no lesson is lost when the
+    process stops: claimed jobs are leased, and jobs left unfinished are picked up again
+    by the next worker on the database. The worker lets jobs accumulate for a short
+    window, extracts the lesson of each with the Archivist agent, then embeds all the
+    lessons of the batch in one pass and commits them to long-term memory in bulk.
+    """
+    def __init__(self, db_path: str = DEFAULT_LEARNING_QUEUE_DB, batch_size: int = 16,
+                 batch_window_seconds: float = 2.0, lease_seconds: float = 600.0,
+                 max_attempts: int = 3, cost_ledger: CostLedger = None):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.batch_size = batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # One connection for all the jobs of the process
+        self.cost_ledger = cost_ledger or CostLedger()
+        self.config_loader = ConfigLoader()
+        # llm_provider -> (archivist config, agent), only used by the worker
+        self._archivists = {}
+        # (mission_id, llm_provider) -> EconomicGovernor, only used by the worker
+        self._governors = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._worker = None
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS learning_jobs (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT,
+                    mission_id TEXT NOT NULL,
+                    llm_provider TEXT NOT NULL,
+                    orchestrator TEXT,
+                    final_result TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    leased_until REAL NOT NULL DEFAULT 0,
+                    lesson TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_learning_jobs_status "
+                "ON learning_jobs (status, job_id)"
+            )
+
+    def enqueue(self, run_id: str, mission_id: str, llm_provider: str,
+                orchestrator: str, final_result: str) -> int:
+        """
+        Durably queues the learning phase of a finished mission and returns immediately.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO learning_jobs (run_id, mission_id, llm_provider,
+                                           orchestrator, final_result, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run_id, mission_id, llm_provider, orchestrator, str(final_result),
+                    time.time()
+                ),
+            )
+        job_id = cursor.lastrowid
+        logger.info(
+            f"[Learning] Queued learning job {job_id} for "
+            f"run '{run_id}' of mission '{mission_id}'."
+        )
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def start(self):
+        """
+        Starts the background worker, which also resumes jobs left by
+        a previous process.
+        """
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopping.clear()
+            self._worker = threading.Thread(
+                target=self._worker_loop, name="learning-worker", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stops the worker after its current batch. Jobs still queued stay
+        in the database.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued job is processed. Returns False if the
+        timeout expired first.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.get_pending_count():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self._wakeup.set()
+            time.sleep(0.5)
+        return True
+
+    def get_pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM learning_jobs "
+                "WHERE status IN ('pending', 'claimed')"
+            ).fetchone()[0]
+
+    def _claim_batch(self) -> list[dict]:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                """
+                SELECT * FROM learning_jobs
+                WHERE status = 'pending' OR (status = 'claimed' AND leased_until < ?)
+                ORDER BY job_id LIMIT ?
+                """,
+                (now, self.batch_size),
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE learning_jobs SET status = 'claimed', "
+                    "leased_until = ?, attempts = attempts + 1 WHERE job_id = ?",
+                    [(now + self.lease_seconds, row["job_id"]) for row in rows],
+                )
+        return [dict(row, attempts=row["attempts"] + 1) for row in rows]
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            # Let the jobs of concurrently finishing missions accumulate into one batch
+            if self._stopping.wait(self.batch_window_seconds):
+                break
+            jobs = self._claim_batch()
+            if not jobs:
+                # Jobs queued by other processes on the same database are
+                # polled for, too
+                self._wakeup.wait(timeout=30)
+                self._wakeup.clear()
+                continue
+            try:
+                self._process_batch(jobs)
+            except Exception as e:
+                # Jobs that were not finished or released are retried once
+                # their lease expires
+                logger.exception(f"[Learning] Batch of {len(jobs)} job(s) failed: {e}")
+
+    def _process_batch(self, jobs: list[dict]):
+        learned = []
+        for job in jobs:
+            try:
+                lesson = self._extract_lesson(job)
+            except Exception as e:
+                logger.warning(
+                    "[Learning] Lesson extraction failed "
+                    f"for run '{job['run_id']}': {e}"
+                )
+                self._release([job], str(e))
+                continue
+            if lesson:
+                learned.append((job, lesson))
+            else:
+                self._finish(job, None)
+
+        if learned:
+            try:
+                self._commit_lessons(learned)
+            except Exception as e:
+                logger.warning(
+                    f"[Learning] Committing {len(learned)} "
+                    f"lesson(s) to long-term memory failed: {e}"
+                )
+                self._release([job for job, _ in learned], str(e))
+                return
+            for job, lesson in learned:
+                self._finish(job, lesson)
+        logger.info(
+            f"[Learning] Processed a batch of {len(jobs)} "
+            f"job(s), {len(learned)} lesson(s) committed."
+        )
+
+    def _commit_lessons(self, learned: list[tuple[dict, str]]):
+        # One vectorized pass over the lessons of all missions in the batch
+        embeddings = get_embedding_model().embed_documents([
+            lesson for _, lesson in learned
+        ])
+        by_mission = {}
+        for (job, lesson), embedding in zip(learned, embeddings):
+            lessons, mission_embeddings = by_mission.setdefault(
+                job["mission_id"], ([], [])
+            )
+            lessons.append(lesson)
+            mission_embeddings.append(embedding)
+        for mission_id, (lessons, mission_embeddings) in by_mission.items():
+            LongTermMemory(mission_id).add_lessons(
+                lessons, embeddings=mission_embeddings
+            )
+
+    def _finish(self, job: dict, lesson: str | None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE learning_jobs SET status = 'done', "
+                "lesson = ?, finished_at = ? WHERE job_id = ?",
+                (lesson, time.time(), job["job_id"]),
+            )
+
+    def _release(self, jobs: list[dict], error: str):
+        # Failed jobs are retried by a later batch until they run out of attempts
+        with self._lock, self._conn:
+            for job in jobs:
+                status = "failed" if job["attempts"] >= self.max_attempts else "pending"
+                self._conn.execute(
+                    "UPDATE learning_jobs SET status = ?, "
+                    "leased_until = 0, error = ? WHERE job_id = ?",
+                    (status, error, job["job_id"]),
+                )
+
+    def _get_archivist(self, llm_provider: str) -> tuple[dict, object]:
+        if llm_provider not in self._archivists:
+            specialized_agents_config = self.config_loader.load_agent_definitions(
+                "specialized_agents.yaml"
+            )
+            archivist_config = specialized_agents_config['agents'][0]
+            # The archivist's tokens are not streamed: no caller is waiting for them
+            archivist_agent = AgentFactory(llm_provider=llm_provider).create_agent(
+                archivist_config, roles=specialized_agents_config.get("roles")
+            )
+            self._archivists[llm_provider] = (archivist_config, archivist_agent)
+        return self._archivists[llm_provider]
+
+    def _get_governor(self, mission_id: str, llm_provider: str) -> EconomicGovernor:
+        """
+        Returns the governor charging the learning phases of a mission, created on first
+        use. Only its ledger records matter, so it is reused for every run of the
+        mission.
+        """
+        key = (mission_id, llm_provider)
+        if key not in self._governors:
+            mission_config = self.config_loader.load_mission_config(mission_id)
+            cost_provider, llm_config = LLMFactory().get_primary_route(llm_provider)
+            self._governors[key] = EconomicGovernor(
+                mission_config=mission_config, llm_provider=cost_provider,
+                model=llm_config.get("model"), cost_ledger=self.cost_ledger
+            )
+        return self._governors[key]
+
+    def _extract_lesson(self, job: dict) -> str | None:
+        """
+        Runs the Archivist on a mission result and charges its cost to
+        the mission's run.
+        """
+        archivist_config, archivist_agent = self._get_archivist(job["llm_provider"])
+        archivist_agent_id = archivist_config.get("id", "AI Mission Archivist")
+        learning_task_description = LEARNING_TASK_DESCRIPTION.format(
+            final_result=job["final_result"]
+        )
+
+        if job["orchestrator"] == "crewai":
+            crewai_learning_task = Task(
+                description=learning_task_description,
+                agent=archivist_agent._crewai_agent, # Use the underlying crewai.Agent
+                expected_output="A single sentence summarizing the key lesson."
+            )
+            learning_crew = Crew(
+                agents=[archivist_agent._crewai_agent], tasks=[crewai_learning_task],
+                verbose=False
+            )
+            lesson_learned = learning_crew.kickoff()
+        else:
+            result = archivist_agent.invoke({
+                "input": learning_task_description, "tool_names": "", "tools": ""
+            })
+            lesson_learned = result.get("output")
+
+        # Handle both the CrewOutput of crewAI and a direct string output
+        lesson_text = None
+        if lesson_learned:
+            lesson_text = (
+                lesson_learned.raw if hasattr(lesson_learned, "raw")
+                else str(lesson_learned)
+            )
+
+        # Rough estimates, as before; the learning phase is charged to the mission's run
+        # in the cost ledger
+        economic_governor = self._get_governor(job["mission_id"], job["llm_provider"])
+        economic_governor.run_id = job["run_id"]
+        economic_governor.track_cost(
+            agent_id=archivist_agent_id,
+            input_tokens=len(learning_task_description.split()) * 2,
+            output_tokens=len(lesson_text.split()) * 2 if lesson_text else 0
+        )
+        return lesson_text
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_learning_queue(db_path: str = DEFAULT_LEARNING_QUEUE_DB) -> LearningQueue:
+    """
+    Returns the process-wide learning queue of a database, creating it on first use.
+    """
+    with _queues_lock:
+        if db_path not in _queues:
+            _queues[db_path] = LearningQueue(db_path)
+        return _queues[db_path]
@@ -1,25 +1,62 @@
+import os
+from functools import lru_cache
+
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from src.observability import logger
 
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=None)
+def get_embedding_model(
+        model_name: str = EMBEDDING_MODEL_NAME) -> HuggingFaceEmbeddings:
+    """Loads an embedding model once per process and shares it between memories."""
+    logger.info(f"[LTM] Loading embedding model '{model_name}'.")
+    return HuggingFaceEmbeddings(model_name=model_name)
+
 
 class LongTermMemory:
     def __init__(self, mission_id):
-        self.embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        self.embedding_model = get_embedding_model()
         self.vector_store_path = f"memory_store/{mission_id}"
         self.vector_store = None
+        if os.path.exists(os.path.join(self.vector_store_path, "index.faiss")):
+            # The store is only written by this project, so its pickled
+            # docstore is trusted
+            self.vector_store = FAISS.load_local(
+                self.vector_store_path, self.embedding_model,
+                allow_dangerous_deserialization=True
+            )
 
     def add_lesson(self, lesson: str):
         """Adds a new lesson to the memory."""
+        self.add_lessons([lesson])
+
+    def add_lessons(self, lessons: list[str], embeddings: list[list[float]] = None):
+        """
+        Adds lessons to the memory in bulk and saves it. The lessons are embedded in one
+        batch unless their embeddings are given, e.g. computed for several memories at
+        once.
+        """
+        if not lessons:
+            return
+        if embeddings is None:
+            embeddings = self.embedding_model.embed_documents(lessons)
+
+        text_embeddings = list(zip(lessons, embeddings))
         if self.vector_store is None:
-            self.vector_store = FAISS.from_texts(texts=[lesson], embedding=self.embedding_model)
+            self.vector_store = FAISS.from_embeddings(
+                text_embeddings, self.embedding_model
+            )
         else:
-            self.vector_store.add_texts(texts=[lesson])
-
-        # In a real system, you'd save to a persistent location
-        # self.vector_store.save_local(self.vector_store_path)
-        logger.info(f"[LTM] Lesson added: '{lesson}'")
+            self.vector_store.add_embeddings(text_embeddings)
+        self.vector_store.save_local(self.vector_store_path)
+        logger.info(
+            f"[LTM] {len(lessons)} lesson(s) added to "
+            f"'{self.vector_store_path}': {lessons}"
+        )
 
     def recall_lessons(self, query: str, num_lessons: int = 2) -> list:
         """Recalls relevant lessons based on a query."""
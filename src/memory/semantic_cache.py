@@ -0,0 +1,238 @@
+# src/pantheon/memory/semantic_cache.py
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from src.memory.long_term_memory import get_embedding_model
+from src.observability import logger
+
+DEFAULT_SEMANTIC_CACHE_DB = "checkpoints/semantic_cache.db"
+
+VERIFICATION_REJECTED = "REJECT"
+
+VERIFICATION_PROMPT = (
+    "You are checking a draft answer that was written for a similar, earlier task.\n"
+    "New task:\n{task}\n\n"
+    "Draft answer:\n{draft}\n\n"
+    "If the draft answers the new task, return it adapted to the specifics "
+    "of the new task (identifiers, addresses, hosts) and nothing else. If "
+    f"it does not apply, reply with the single word {VERIFICATION_REJECTED}."
+)
+
+
+def get_cache_query(agent_id: str, task_description: str) -> str:
+    """Renders the text that is embedded to look up a task step's cached results."""
+    return f"Agent: {agent_id}\nTask: {task_description}"
+
+
+class SemanticCache:
+    """
+    Caches the results of task steps and serves them to later steps whose rendered
+    description is semantically close, e.g. the same triage task for a different IP.
+
+    Entries are kept in a SQLite database shared by all missions and processes, and
+    indexed in memory with one FAISS inner-product index per namespace (agent and task),
+    built with the LongTermMemory embedding model. Embeddings are normalized, so the
+    scores are cosine similarities. Entries written by other processes are picked up
+    on the next lookup; expired entries are dropped from the index when they are hit.
+    """
+    def __init__(self, db_path: str = DEFAULT_SEMANTIC_CACHE_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.embedding_model = get_embedding_model()
+        self._indexes = {} # namespace -> FAISS vector store
+        self._last_entry_ids = {} # namespace -> last entry loaded into its index
+        # namespace -> Counter of lookups, hits, misses, rejections, stores
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS semantic_cache (
+                    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_semantic_cache_namespace "
+                "ON semantic_cache (namespace, entry_id)"
+            )
+
+    def _embed(self, query: str) -> np.ndarray:
+        embedding = np.asarray(
+            self.embedding_model.embed_query(query), dtype=np.float32
+        )
+        return embedding / (np.linalg.norm(embedding) or 1.0)
+
+    def _sync_index(self, namespace: str):
+        """
+        Adds the live entries of a namespace stored since the index was last synced.
+        """
+        rows = self._conn.execute(
+            """
+            SELECT entry_id, query, embedding, expires_at FROM semantic_cache
+            WHERE namespace = ? AND entry_id > ? AND expires_at > ? ORDER BY entry_id
+            """,
+            (namespace, self._last_entry_ids.get(namespace, 0), time.time()),
+        ).fetchall()
+        if not rows:
+            return
+
+        text_embeddings = [
+            (row["query"], np.frombuffer(row["embedding"], dtype=np.float32).tolist())
+            for row in rows
+        ]
+        metadatas = [
+            {"entry_id": row["entry_id"], "expires_at": row["expires_at"]}
+            for row in rows
+        ]
+        ids = [str(row["entry_id"]) for row in rows]
+        index = self._indexes.get(namespace)
+        if index is None:
+            self._indexes[namespace] = FAISS.from_embeddings(
+                text_embeddings, self.embedding_model, metadatas=metadatas, ids=ids,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+            )
+        else:
+            index.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        self._last_entry_ids[namespace] = rows[-1]["entry_id"]
+
+    def lookup(self, namespace: str, query: str,
+               similarity_threshold: float) -> tuple[str, float] | None:
+        """
+        Returns the cached result of the most similar live entry and its similarity,
+        or None if no entry reaches the threshold.
+        """
+        embedding = self._embed(query)
+        with self._lock:
+            stats = self.stats.setdefault(namespace, Counter())
+            stats["lookups"] += 1
+            self._sync_index(namespace)
+            index = self._indexes.get(namespace)
+            match = None
+            if index is not None:
+                now = time.time()
+                expired = []
+                for document, score in index.similarity_search_with_score_by_vector(
+                    embedding.tolist(), k=4
+                ):
+                    if document.metadata["expires_at"] <= now:
+                        expired.append(str(document.metadata["entry_id"]))
+                    elif score >= similarity_threshold and (
+                        match is None or score > match[1]
+                    ):
+                        match = (document.metadata["entry_id"], score)
+                if expired:
+                    index.delete(expired)
+
+            row = None
+            if match is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE semantic_cache SET hits = hits + 1 WHERE entry_id = ?",
+                        (match[0],)
+                    )
+                    # The entry may have been pruned by another process in the meantime
+                    row = self._conn.execute(
+                        "SELECT result FROM semantic_cache WHERE entry_id = ?",
+                        (match[0],)
+                    ).fetchone()
+            if row is None:
+                stats["misses"] += 1
+                return None
+            stats["hits"] += 1
+        logger.info(
+            f"[SemanticCache] Hit in '{namespace}' (similarity {match[1]:.3f})."
+        )
+        return row["result"], float(match[1])
+
+    def record_rejection(self, namespace: str):
+        """Counts a hit whose cached result was rejected by the verification model."""
+        with self._lock:
+            self.stats.setdefault(namespace, Counter())["rejections"] += 1
+
+    def store(self, namespace: str, query: str, result: str, ttl_seconds: float):
+        """Caches the result of a task step for ttl_seconds."""
+        embedding = self._embed(query)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO semantic_cache (namespace, query, result, embedding,
+                                            created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (namespace, query, result, embedding.tobytes(), now, now + ttl_seconds),
+            )
+            # Expired entries are not served anymore, so they are pruned
+            # with every write
+            self._conn.execute(
+                "DELETE FROM semantic_cache WHERE expires_at <= ?", (now,)
+            )
+            self.stats.setdefault(namespace, Counter())["stores"] += 1
+        logger.debug(
+            f"[SemanticCache] Stored result in '{namespace}' for {ttl_seconds}s."
+        )
+
+    def get_stats(self, namespace: str = None) -> dict:
+        """
+        Returns the lookup counters and hit rate of a namespace, or of all namespaces.
+        Hits rejected by the verification model are not counted as served.
+        """
+        with self._lock:
+            if namespace is not None:
+                counters = Counter(self.stats.get(namespace, {}))
+            else:
+                counters = sum(self.stats.values(), Counter())
+        served = counters["hits"] - counters["rejections"]
+        return {
+            "lookups": counters["lookups"],
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "rejections": counters["rejections"],
+            "stores": counters["stores"],
+            "hit_rate": served / counters["lookups"] if counters["lookups"] else 0.0,
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(db_path: str = DEFAULT_SEMANTIC_CACHE_DB) -> SemanticCache:
+    """
+    Returns the process-wide semantic cache of a database, creating it on first use.
+    """
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = SemanticCache(db_path)
+        return _caches[db_path]
+
+
+def get_semantic_cache_stats() -> dict[str, dict]:
+    """
+    Returns the hit-rate metrics of the semantic caches used by this
+    process, by database.
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    return {db_path: cache.get_stats() for db_path, cache in caches.items()}
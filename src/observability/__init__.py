@@ -11,6 +11,11 @@ logger.remove()
 log_file_path = "logs/app.log"
 
 logger.add(log_file_path, rotation="10 MB", retention="7 days", level="DEBUG")
-logger.add(sys.stderr, level="CRITICAL", format="<level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>")
+logger.add(
+    sys.stderr, level="CRITICAL",
+    format="<level>{level: <8}</level> | "
+           "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> "
+           "- <level>{message}</level>"
+)
 
 # The logger is now configured and can be imported directly from this module.
@@ -0,0 +1,93 @@
+# src/pantheon/observability/events.py
+import threading
+import time
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field
+
+from src.observability import logger
+
+
+class MissionEvent(BaseModel):
+    """
+    A single event emitted while a mission runs, e.g. a streamed token or
+    a completed step.
+    """
+    type: str
+    run_id: str | None = None
+    agent_id: str | None = None
+    step: str | None = None
+    data: dict[str, Any] = Field(default_factory=dict)
+    timestamp: float = Field(default_factory=time.time)
+
+
+class MissionHalted(Exception):
+    """
+    Raised when a guard trips while an agent is generating, to stop the mission early.
+    """
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class EventBus:
+    """
+    Dispatches mission events to subscribed callbacks and evaluates the guards
+    (budget, injection filter, ...) that may halt a generation mid-stream.
+    """
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id
+        self._subscribers = []
+        self._guards = []
+        self._lock = threading.Lock()
+        # Set once a guard has halted a generation of this mission
+        self.halted_reason = None
+
+    def subscribe(self, callback: Callable[[MissionEvent], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[MissionEvent], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def add_guard(self, guard: Callable[[str, str, int], str | None]):
+        """
+        Registers a guard called with (agent_id, text generated so far, tokens generated
+        so far). A guard returns a reason string to halt the generation, or None to let
+        it continue.
+        """
+        with self._lock:
+            self._guards.append(guard)
+
+    def publish(self, type: str, agent_id: str = None, step: str = None, **data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        event = MissionEvent(
+            type=type, run_id=self.run_id, agent_id=agent_id, step=step, data=data
+        )
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(
+                    f"[Events] Subscriber failed to handle '{type}' event: {e}"
+                )
+
+    def check_guards(self, agent_id: str, text: str, token_count: int):
+        """
+        Raises MissionHalted if any guard trips for the text generated so far.
+        """
+        for guard in self._guards:
+            reason = guard(agent_id, text, token_count)
+            if reason:
+                logger.critical(
+                    f"[Events] Generation of agent '{agent_id}' halted: {reason}"
+                )
+                self.halted_reason = reason
+                self.publish("mission_halted", agent_id=agent_id, reason=reason)
+                raise MissionHalted(reason)
@@ -0,0 +1,113 @@
+# src/pantheon/observability/streaming.py
+import sys
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.llm_providers.prompt_cache import get_usage
+from src.observability.events import EventBus, MissionEvent, MissionHalted
+
+
+class StreamingCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler forwarding the tokens generated by an agent's LLM
+    to the mission EventBus, and checking the bus guards as the text grows.
+    The bus can be rebound, so a warm agent can serve successive missions.
+    """
+    # Let MissionHalted propagate out of the LLM call instead of being
+    # logged and ignored
+    raise_error = True
+
+    def __init__(self, event_bus: EventBus | None, agent_id: str):
+        self.event_bus = event_bus
+        self.agent_id = agent_id
+        self._generations = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *,
+                            run_id: Any = None, **kwargs: Any):
+        # Agent frameworks retry failed calls; once the mission is halted, no new
+        # generation is started
+        if self.event_bus is not None and self.event_bus.halted_reason:
+            raise MissionHalted(self.event_bus.halted_reason)
+
+    def on_llm_new_token(self, token: str, *, run_id: Any = None, **kwargs: Any):
+        if self.event_bus is None:
+            return
+        text, token_count = self._generations.get(run_id, ("", 0))
+        text += token
+        token_count += 1
+        self._generations[run_id] = (text, token_count)
+
+        self.event_bus.publish("token", agent_id=self.agent_id, token=token)
+        self.event_bus.check_guards(self.agent_id, text, token_count)
+
+    def on_llm_end(self, response: Any, *, run_id: Any = None, **kwargs: Any):
+        self._generations.pop(run_id, None)
+        if self.event_bus is None:
+            return
+        # Provider-reported usage (incl. prompt cache hits) and
+        # duplicate requests discarded
+        # by a RoutingChatModel are reported for cost tracking
+        for generations in getattr(response, "generations", []):
+            usage = get_usage(generations[0]) if generations else None
+            if usage:
+                self.event_bus.publish("llm_usage", agent_id=self.agent_id, **usage)
+            for generation in generations:
+                for usage in (generation.generation_info or {}).get("hedge_usage", []):
+                    self.event_bus.publish("llm_hedge", agent_id=self.agent_id, **usage)
+
+    def on_llm_error(self, error: BaseException, *, run_id: Any = None, **kwargs: Any):
+        self._generations.pop(run_id, None)
+
+
+class ConsoleStreamPrinter:
+    """
+    Renders mission events live on the console.
+    """
+    RESET = "\033[0m"
+    BOLD = "\033[1m"
+    CYAN = "\033[36m"
+    YELLOW = "\033[33m"
+    RED = "\033[31m"
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._current_agent = None
+
+    def __call__(self, event: MissionEvent):
+        if event.type == "token":
+            if event.agent_id != self._current_agent:
+                self._current_agent = event.agent_id
+                self._write(f"\n{self.BOLD}[{event.agent_id}]{self.RESET} ")
+            self._write(event.data.get("token", ""))
+        elif event.type == "agent_step":
+            self._write(
+                f"\n{self.BOLD}[{event.agent_id}]{self.RESET} "
+                f"{event.data.get('output', '')}"
+            )
+        elif event.type == "step_started":
+            self._current_agent = None
+            self._write(
+                f"\n{self.CYAN}>>> Step '{event.step}' "
+                f"started ({event.agent_id}){self.RESET}\n"
+            )
+        elif event.type == "step_completed":
+            self._write(f"\n{self.CYAN}<<< Step '{event.step}' completed{self.RESET}\n")
+        elif event.type == "approval_pending":
+            self._write(
+                f"\n{self.YELLOW}... Waiting for approval '{event.step}'{self.RESET}\n"
+            )
+        elif event.type == "mission_halted":
+            self._write(
+                f"\n{self.RED}!!! Mission halted: "
+                f"{event.data.get('reason')}{self.RESET}\n"
+            )
+        elif event.type == "mission_completed":
+            self._write(
+                f"\n{self.CYAN}=== Mission "
+                f"{event.data.get('status', 'completed')} ==={self.RESET}\n"
+            )
+
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
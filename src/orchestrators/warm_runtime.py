@@ -0,0 +1,89 @@
+# src/pantheon/orchestrators/warm_runtime.py
+import threading
+
+from src.agents.agent_factory import AgentFactory
+from src.config.config_loader import ConfigLoader
+from src.memory.long_term_memory import get_embedding_model
+from src.observability import logger
+from src.workflows.checkpoint_store import CheckpointStore
+from src.workflows.langgraph_workflow import get_compiled_graph
+
+
+class WarmRuntime:
+    """
+    Keeps the expensive, reusable parts of a mission warm across missions in a
+    long-lived process: parsed configuration, built agents with their LLM clients
+    and tools, the compiled LangGraph graph and the embedding model.
+
+    Agents hold per-mission state while they run, so each set of agents is checked
+    out by one mission at a time and returned to an idle pool afterwards.
+    """
+    def __init__(self, checkpoint_store: CheckpointStore):
+        self.config_loader = ConfigLoader()
+        self.checkpoint_store = checkpoint_store
+        self._idle_agent_sets = {}
+        self._lock = threading.Lock()
+
+    def _agent_set_key(self, mission_id: str,
+                       llm_provider: str) -> tuple[str, tuple[str, ...], str]:
+        # Missions share a set of agents when they use the same agents of the same team
+        mission_config = self.config_loader.load_mission_config(mission_id)
+        agent_ids = tuple(sorted(AgentFactory.get_workflow_agent_ids(mission_config)))
+        return mission_config.get("agent_definitions"), agent_ids, llm_provider
+
+    def _build_agent_set(self, agent_definitions: str, agent_ids: tuple[str, ...],
+                         llm_provider: str) -> tuple[AgentFactory, dict]:
+        logger.info(
+            f"[WarmRuntime] Building agents {list(agent_ids)} of "
+            f"'{agent_definitions}' for provider '{llm_provider}'."
+        )
+        definitions = self.config_loader.load_agent_definitions(
+            agent_definitions + ".yaml"
+        )
+        agent_factory = AgentFactory(llm_provider=llm_provider)
+        return agent_factory, agent_factory.create_agents(
+            definitions, agent_ids=list(agent_ids)
+        )
+
+    def preload(self, mission_ids: list[str], llm_providers: list[str]):
+        """
+        Warms everything the given missions need before the first submission arrives.
+        """
+        for mission_id in mission_ids:
+            for llm_provider in llm_providers:
+                key = self._agent_set_key(mission_id, llm_provider)
+                with self._lock:
+                    already_warm = bool(self._idle_agent_sets.get(key))
+                if not already_warm:
+                    self.checkin_agents(
+                        mission_id, llm_provider, *self._build_agent_set(*key)
+                    )
+        get_compiled_graph(self.checkpoint_store.db_path)
+        get_embedding_model()
+        logger.info(
+            "[WarmRuntime] Preloaded missions "
+            f"{mission_ids} for providers {llm_providers}."
+        )
+
+    def checkout_agents(self, mission_id: str,
+                        llm_provider: str) -> tuple[AgentFactory, dict]:
+        """
+        Takes an idle set of agents for the mission's team, building one if
+        none is idle.
+        """
+        key = self._agent_set_key(mission_id, llm_provider)
+        with self._lock:
+            idle_sets = self._idle_agent_sets.get(key)
+            if idle_sets:
+                return idle_sets.pop()
+        return self._build_agent_set(*key)
+
+    def checkin_agents(self, mission_id: str, llm_provider: str,
+                       agent_factory: AgentFactory, agents: dict):
+        """
+        Returns a set of agents to the idle pool once its mission has finished.
+        """
+        agent_factory.bind_event_bus(None)
+        key = self._agent_set_key(mission_id, llm_provider)
+        with self._lock:
+            self._idle_agent_sets.setdefault(key, []).append((agent_factory, agents))
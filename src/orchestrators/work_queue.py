@@ -0,0 +1,371 @@
+# src/pantheon/orchestrators/work_queue.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+from src.observability import logger
+
+DEFAULT_WORK_QUEUE_DB = "checkpoints/work_queue.db"
+
+# Kinds of work a submitter can hand to the worker fleet
+MISSION_JOB = "mission"
+STEP_JOB = "step"
+
+# Job states; a job is final once it is "completed" or "failed"
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class WorkQueue(ABC):
+    """
+    A queue of missions and workflow steps shared by a fleet of worker processes,
+    possibly on several hosts.
+
+    A worker claims a job with a lease and keeps it alive with heartbeats. A job whose
+    lease expires (its worker died or lost connectivity) is handed to another worker,
+    up to the job's maximum number of attempts. The result, including its cost records,
+    is stored with the job for the submitter to collect.
+    """
+    @abstractmethod
+    def enqueue(self, kind: str, payload: dict, max_attempts: int = 3) -> str:
+        """Queues a job and returns its ID."""
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, kinds: list[str] = None,
+              lease_seconds: float = 60.0) -> dict | None:
+        """
+        Leases the oldest available job of the given kinds to a worker, or returns None.
+        """
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str,
+                  lease_seconds: float = 60.0) -> bool:
+        """Extends a job's lease. Returns False if the worker no longer holds it."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: dict) -> bool:
+        """
+        Stores a job's result. Returns False if the worker no longer holds the job.
+        """
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Records a failed attempt; the job is retried while it has attempts left."""
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> dict | None:
+        pass
+
+    def wait(self, job_id: str, timeout: float = None,
+             poll_interval: float = 1.0) -> dict:
+        """
+        Blocks until a job is final and returns it. Raises TimeoutError if the
+        timeout expires first.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.get_job(job_id)
+            if job is None:
+                raise ValueError(f"Unknown job '{job_id}'.")
+            if job["status"] in (COMPLETED, FAILED):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"Job '{job_id}' is still {job['status']} after {timeout}s."
+                )
+            time.sleep(poll_interval)
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    The reference WorkQueue backend: a SQLite database that needs no external service.
+
+    On a single host the database runs in WAL mode. For workers on several hosts, put
+    the database on a shared filesystem with working POSIX locks (e.g. NFSv4) and use
+    the "delete" journal mode, since WAL needs memory shared by all its clients. Every
+    state change runs in an immediate transaction, so a job is leased to one worker at a
+    time.
+    """
+    def __init__(self, db_path: str = DEFAULT_WORK_QUEUE_DB, journal_mode: str = "wal",
+                 retry_backoff_seconds: float = 5.0):
+        self.db_path = db_path
+        self.retry_backoff_seconds = retry_backoff_seconds
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    worker_id TEXT,
+                    leased_until REAL NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_work_jobs_status "
+                "ON work_jobs (status, available_at)"
+            )
+
+    def enqueue(self, kind: str, payload: dict, max_attempts: int = 3) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO work_jobs (job_id, kind, payload, status, max_attempts,
+                                       available_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, kind, json.dumps(payload), PENDING, max_attempts, now, now),
+            )
+        logger.info(f"[WorkQueue] Queued {kind} job '{job_id}'.")
+        return job_id
+
+    def claim(self, worker_id: str, kinds: list[str] = None,
+              lease_seconds: float = 60.0) -> dict | None:
+        now = time.time()
+        kinds = kinds or [MISSION_JOB, STEP_JOB]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Jobs whose lease expired were lost with their worker and are failed or
+            # handed out again
+            expired = self._conn.execute(
+                "SELECT job_id, attempts, max_attempts "
+                "FROM work_jobs WHERE status = ? AND leased_until < ?",
+                (RUNNING, now)
+            ).fetchall()
+            for row in expired:
+                if row["attempts"] >= row["max_attempts"]:
+                    self._conn.execute(
+                        "UPDATE work_jobs SET status = ?, "
+                        "error = ?, finished_at = ? WHERE job_id = ?",
+                        (
+                            FAILED, "Lease expired on the last attempt.", now,
+                            row["job_id"]
+                        ),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE work_jobs SET status = ?, "
+                        "worker_id = NULL WHERE job_id = ?",
+                        (PENDING, row["job_id"])
+                    )
+                logger.warning(
+                    f"[WorkQueue] Lease of job '{row['job_id']}' expired "
+                    f"(attempt {row['attempts']}/{row['max_attempts']})."
+                )
+
+            placeholders = ", ".join("?" for _ in kinds)
+            row = self._conn.execute(
+                f"""
+                SELECT * FROM work_jobs
+                WHERE status = ? AND available_at <= ? AND kind IN ({placeholders})
+                ORDER BY created_at LIMIT 1
+                """,
+                (PENDING, now, *kinds),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE work_jobs SET status = ?, worker_id = ?, "
+                "leased_until = ?, attempts = attempts + 1 WHERE job_id = ?",
+                (RUNNING, worker_id, now + lease_seconds, row["job_id"]),
+            )
+        job = self._to_job(row)
+        job.update(status=RUNNING, worker_id=worker_id, attempts=row["attempts"] + 1)
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str,
+                  lease_seconds: float = 60.0) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE work_jobs SET leased_until = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: dict) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                UPDATE work_jobs
+                SET status = ?, result = ?, finished_at = ?, leased_until = 0
+                WHERE job_id = ? AND worker_id = ? AND status = ?
+                """,
+                (
+                    COMPLETED, json.dumps(result, default=str), time.time(), job_id,
+                    worker_id, RUNNING
+                ),
+            )
+        if cursor.rowcount != 1:
+            logger.warning(
+                f"[WorkQueue] Result of job '{job_id}' from "
+                f"'{worker_id}' dropped: the job was reassigned."
+            )
+            return False
+        return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts FROM work_jobs "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            if row["attempts"] >= row["max_attempts"]:
+                self._conn.execute(
+                    "UPDATE work_jobs SET status = ?, error = ?, "
+                    "finished_at = ?, leased_until = 0 WHERE job_id = ?",
+                    (FAILED, error, now, job_id),
+                )
+            else:
+                # Retried after a backoff that grows with every attempt
+                self._conn.execute(
+                    """
+                    UPDATE work_jobs
+                    SET status = ?, error = ?, worker_id = NULL, leased_until = 0,
+                        available_at = ?
+                    WHERE job_id = ?
+                    """,
+                    (
+                        PENDING, error,
+                        now + self.retry_backoff_seconds * 2 ** (row["attempts"] - 1),
+                        job_id
+                    ),
+                )
+        return True
+
+    def get_job(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM work_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS jobs FROM work_jobs GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["jobs"] for row in rows}
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class RemoteStepExecutor:
+    """
+    Sends the task executions of a mission's workflow to the worker fleet through the
+    work queue and waits for their results. The submitter keeps the mission itself:
+    its checkpoints, approvals, budget checks and cost accounting.
+    """
+    def __init__(self, work_queue: WorkQueue, mission_id: str, llm_provider: str,
+                 orchestrator: str, run_id: str, max_attempts: int = 3,
+                 timeout_seconds: float = None):
+        self.work_queue = work_queue
+        self.mission_id = mission_id
+        self.llm_provider = llm_provider
+        self.orchestrator = orchestrator
+        self.run_id = run_id
+        self.max_attempts = max_attempts
+        self.timeout_seconds = timeout_seconds
+
+    def execute(self, step_index: int, step: dict, description: str,
+                speculative: bool = False,
+                batch_key: str = None) -> tuple[str, int, int, int]:
+        """
+        Runs one task execution on a worker and returns its result with the input,
+        cached input and output token counts reported by the worker.
+        """
+        payload = {
+            "mission_id": self.mission_id,
+            "llm_provider": self.llm_provider,
+            "orchestrator": self.orchestrator,
+            "run_id": self.run_id,
+            "step_index": step_index,
+            "step": step,
+            "description": description,
+            "speculative": speculative,
+            "batch_key": batch_key,
+        }
+        job_id = self.work_queue.enqueue(
+            STEP_JOB, payload, max_attempts=self.max_attempts
+        )
+        job = self.work_queue.wait(job_id, timeout=self.timeout_seconds)
+        if job["status"] == FAILED:
+            raise RuntimeError(
+                f"Step {step_index} ('{step.get('task_id')}') "
+                f"failed on the worker fleet: {job['error']}"
+            )
+        result = job["result"]
+        logger.info(
+            f"[WorkQueue] Step {step_index} ('{step.get('task_id')}') "
+            f"completed by worker '{result['worker_id']}'."
+        )
+        return (
+            result["result"], result["input_tokens"], result["cached_input_tokens"],
+            result["output_tokens"]
+        )
+
+
+# Backends by name, so deployments can plug in their own queue (e.g. backed by
+# a message broker)
+WORK_QUEUE_BACKENDS = {
+    "sqlite": SQLiteWorkQueue,
+}
+
+
+def register_work_queue_backend(name: str, backend_class: type):
+    WORK_QUEUE_BACKENDS[name] = backend_class
+
+
+def create_work_queue(config: dict = None) -> WorkQueue:
+    """
+    Creates the work queue described by a `work_queue`
+    config (see config/work_queue.yaml).
+    """
+    config = dict(config or {})
+    backend = config.pop("backend", "sqlite")
+    if backend not in WORK_QUEUE_BACKENDS:
+        raise ValueError(
+            f"Unknown work queue backend '{backend}'. "
+            f"Choose from {list(WORK_QUEUE_BACKENDS)}."
+        )
+    return WORK_QUEUE_BACKENDS[backend](**config.get("options", {}))
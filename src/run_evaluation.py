@@ -7,7 +7,9 @@ if __name__ == "__main__":
     adversarial_mission_id = "red_team_scenario_001"
     llm_provider = "google_gemini"
 
-    logger.info(f"Initializing red team evaluation for mission: {adversarial_mission_id}")
+    logger.info(
+        f"Initializing red team evaluation for mission: {adversarial_mission_id}"
+    )
 
     # Initialize the control plane for that mission
     control_plane = MissionControl(adversarial_mission_id, llm_provider)
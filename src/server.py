@@ -0,0 +1,486 @@
+import argparse
+import itertools
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.governance.cost_ledger import CostLedger
+from src.main import MissionControl
+from src.memory.learning_queue import get_learning_queue
+from src.memory.semantic_cache import get_semantic_cache_stats
+from src.observability import logger
+from src.orchestrators.warm_runtime import WarmRuntime
+from src.workflows.approval_queue import ApprovalQueue
+from src.workflows.checkpoint_store import CheckpointStore
+
+
+class MissionServer:
+    """
+    A long-lived mission daemon. Submissions go into bounded per-provider queues
+    (rejected with backpressure when full) and are executed by a pool of workers on warm
+    agents. A worker only takes a mission whose provider is below its concurrency limit,
+    so missions waiting for a busy provider never hold up those of the others.
+    """
+    def __init__(self, workers: int = 4, max_queue: int = 32,
+                 provider_limits: dict = None, default_provider_limit: int = 2,
+                 checkpoint_store: CheckpointStore = None,
+                 max_finished_jobs: int = 1000):
+        self.checkpoint_store = checkpoint_store or CheckpointStore()
+        # Shared by the workers; other processes share it through the database
+        self.cost_ledger = CostLedger()
+        self.approval_queue = ApprovalQueue(self.checkpoint_store.db_path)
+        # Post-mission learning runs off the workers
+        self.learning_queue = get_learning_queue()
+        self.runtime = WarmRuntime(self.checkpoint_store)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.provider_limits = provider_limits or {}
+        self.default_provider_limit = default_provider_limit
+        self.max_finished_jobs = max_finished_jobs
+        self._queued_jobs = {} # Per provider, in submission order
+        self._running_jobs = {} # Per provider
+        self._job_sequence = itertools.count()
+        self._job_states = {}
+        # Oldest first, evicted beyond max_finished_jobs
+        self._finished_runs = OrderedDict()
+        self._lock = threading.Lock()
+        self._admission = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"mission-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        # Learning jobs left queued by a previous shutdown are resumed
+        self.learning_queue.start()
+        logger.info(f"[Server] Started {self.workers} mission worker(s).")
+
+    def stop(self):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self.learning_queue.stop(timeout=5)
+
+    def _set_state(self, run_id: str, **state):
+        with self._lock:
+            self._job_states.setdefault(run_id, {}).update(state)
+            if state.get("state") in ("finished", "failed"):
+                # Results of old runs stay available from the checkpoint store
+                self._finished_runs[run_id] = None
+                self._finished_runs.move_to_end(run_id)
+                while len(self._finished_runs) > self.max_finished_jobs:
+                    evicted_run_id, _ = self._finished_runs.popitem(last=False)
+                    self._job_states.pop(evicted_run_id, None)
+            elif run_id in self._finished_runs:
+                del self._finished_runs[run_id] # Resumed
+
+    def submit(self, mission_id: str, llm_provider: str = "google_gemini",
+               orchestrator: str = None) -> str:
+        """
+        Queues a new mission and returns its run ID. Raises queue.Full when the
+        server is saturated.
+        """
+        # Validate the mission before accepting it
+        mission_config = self.runtime.config_loader.load_mission_config(mission_id)
+        orchestrator = orchestrator or mission_config.get("orchestrator_adapter")
+        run_id = self.checkpoint_store.create_run(
+            mission_id, llm_provider, orchestrator
+        )
+        try:
+            self._enqueue(run_id, mission_id, llm_provider, orchestrator)
+        except queue.Full:
+            self.checkpoint_store.set_run_status(run_id, "rejected")
+            raise
+        return run_id
+
+    def resume(self, run_id: str) -> str:
+        """
+        Queues a checkpointed run (e.g. after its approval was decided) to continue
+        where it stopped.
+        """
+        run = self.checkpoint_store.get_run(run_id)
+        if not run:
+            raise ValueError(f"No checkpointed run found with ID '{run_id}'.")
+        self._enqueue(
+            run_id, run["mission_id"], run["llm_provider"], run["orchestrator"]
+        )
+        return run_id
+
+    def resume_decided(self, run_id: str) -> bool:
+        """
+        Queues a run whose approval has been decided, unless another resumer (e.g. the
+        approval watcher) already claimed it. Returns whether this call queued the run.
+        """
+        if not self.approval_queue.claim_decided(run_id):
+            logger.info(f"[Server] Run '{run_id}' was already resumed elsewhere.")
+            return False
+        try:
+            self.resume(run_id)
+        except Exception:
+            # Left to the approval watcher
+            self.approval_queue.release_claim(run_id)
+            raise
+        return True
+
+    def _enqueue(self, run_id: str, mission_id: str, llm_provider: str,
+                 orchestrator: str):
+        job = {
+            "run_id": run_id, "mission_id": mission_id, "llm_provider": llm_provider,
+            "orchestrator": orchestrator, "sequence": next(self._job_sequence),
+        }
+        with self._admission:
+            queued = self._count_queued()
+            if queued >= self.max_queue:
+                logger.warning(
+                    "[Server] Queue full, rejected run "
+                    f"'{run_id}' of mission '{mission_id}'."
+                )
+                raise queue.Full
+            self._queued_jobs.setdefault(llm_provider, deque()).append(job)
+            self._admission.notify()
+        self._set_state(run_id, state="queued", queued_at=time.time())
+        logger.info(
+            f"[Server] Queued run '{run_id}' of mission "
+            f"'{mission_id}' ({queued + 1} queued)."
+        )
+
+    def _count_queued(self) -> int:
+        return sum(len(jobs) for jobs in self._queued_jobs.values())
+
+    def _admit_next(self, timeout: float) -> dict | None:
+        """
+        Takes the oldest queued job whose provider is below its concurrency limit,
+        waiting up to `timeout` seconds for one.
+        """
+        with self._admission:
+            admissible = [
+                jobs[0] for llm_provider, jobs in self._queued_jobs.items()
+                if jobs and self._running_jobs.get(llm_provider, 0)
+                < self.provider_limits.get(llm_provider, self.default_provider_limit)
+            ]
+            if not admissible:
+                self._admission.wait(timeout)
+                return None
+            job = min(admissible, key=lambda job: job["sequence"])
+            self._queued_jobs[job["llm_provider"]].popleft()
+            self._running_jobs[job["llm_provider"]] = (
+                self._running_jobs.get(job["llm_provider"], 0) + 1
+            )
+            return job
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            job = self._admit_next(timeout=0.5)
+            if job is None:
+                continue
+            try:
+                self._run_job(job)
+            except Exception as e:
+                # E.g. the checkpoint store was unreachable when storing the outcome;
+                # the slot keeps serving
+                logger.exception(
+                    f"[Server] Could not finish run '{job['run_id']}': {e}"
+                )
+            finally:
+                with self._admission:
+                    self._running_jobs[job["llm_provider"]] -= 1
+                    self._admission.notify_all()
+
+    def _run_job(self, job: dict):
+        run_id = job["run_id"]
+        self._set_state(run_id, state="running", started_at=time.time())
+        agent_factory = agents = None
+        try:
+            # Building the agents may fail as well, e.g. without the provider's API key
+            agent_factory, agents = self.runtime.checkout_agents(
+                job["mission_id"], job["llm_provider"]
+            )
+            control_plane = MissionControl(
+                mission_id=job["mission_id"],
+                llm_provider=job["llm_provider"],
+                orchestrator_override=job["orchestrator"],
+                run_id=run_id,
+                checkpoint_store=self.checkpoint_store,
+                approval_mode="queue",
+                agent_factory=agent_factory,
+                agents=agents,
+                cost_ledger=self.cost_ledger,
+                learning_queue=self.learning_queue
+            )
+            result = control_plane.run()
+            run = self.checkpoint_store.get_run(run_id)
+            self._set_state(
+                run_id, state="finished", finished_at=time.time(), result=result,
+                total_cost_usd=control_plane.economic_governor.get_total_cost(),
+                status=run["status"] if run else None,
+                item_results=control_plane.item_results,
+                item_costs_usd=control_plane.economic_governor.item_costs
+            )
+        except Exception as e:
+            logger.exception(f"[Server] Run '{run_id}' failed: {e}")
+            self._set_state(
+                run_id, state="failed", finished_at=time.time(), error=str(e)
+            )
+        finally:
+            if agent_factory is not None:
+                self.runtime.checkin_agents(
+                    job["mission_id"], job["llm_provider"], agent_factory, agents
+                )
+
+    def get_status(self, run_id: str) -> dict | None:
+        run = self.checkpoint_store.get_run(run_id)
+        if not run:
+            return None
+        with self._lock:
+            state = dict(self._job_states.get(run_id, {}))
+        state.pop("result", None)
+        state.pop("item_results", None)
+        return {**run, **state}
+
+    def get_result(self, run_id: str) -> dict | None:
+        with self._lock:
+            state = self._job_states.get(run_id)
+            return dict(state) if state else None
+
+    def get_health(self) -> dict:
+        with self._lock:
+            queued = {
+                llm_provider: len(jobs)
+                for llm_provider, jobs in self._queued_jobs.items() if jobs
+            }
+            running = {
+                llm_provider: count
+                for llm_provider, count in self._running_jobs.items() if count
+            }
+        return {
+            "queued": sum(queued.values()), "max_queue": self.max_queue,
+            "workers": self.workers, "queued_by_provider": queued,
+            "running_by_provider": running,
+            "learning_jobs_pending": self.learning_queue.get_pending_count(),
+            "semantic_cache": get_semantic_cache_stats(),
+        }
+
+
+class MissionRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the mission server:
+      POST /missions                  {"mission_id", "llm_provider", "orchestrator"}
+                                      -> 202 {"run_id"}
+      GET  /missions/<run_id>         run status
+      GET  /missions/<run_id>/result  final result (and per-item results of batched
+                                      tasks) once finished; 410 once evicted from
+                                      the last `max_finished_jobs` runs
+      POST /approvals/<run_id>        {"approved": bool, "decided_by"} -> decides and
+                                      resumes the run
+      GET  /approvals                 pending approvals
+      GET  /health                    queue depth, workers, pending learning jobs and
+                                      semantic cache hit rates
+    """
+    server_version = "PantheonMissionServer/0.1"
+    mission_server: MissionServer = None
+
+    def _send_json(self, status: HTTPStatus, payload: dict, headers: dict = None):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("/") if part]
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, self.mission_server.get_health())
+        elif parts == ["approvals"]:
+            self._send_json(
+                HTTPStatus.OK,
+                {"approvals": self.mission_server.approval_queue.list_pending()}
+            )
+        elif len(parts) == 2 and parts[0] == "missions":
+            status = self.mission_server.get_status(parts[1])
+            if status is None:
+                self._send_json(
+                    HTTPStatus.NOT_FOUND, {"error": f"Unknown run '{parts[1]}'."}
+                )
+            else:
+                self._send_json(HTTPStatus.OK, status)
+        elif len(parts) == 3 and parts[0] == "missions" and parts[2] == "result":
+            state = self.mission_server.get_result(parts[1])
+            run = (
+                self.mission_server.checkpoint_store.get_run(parts[1]) if state is None
+                else None
+            )
+            if run and run["status"] != "running":
+                # Finished before this server started, or evicted from the finished runs
+                # kept in memory
+                self._send_json(HTTPStatus.GONE, {
+                    "run_id": parts[1], "status": run["status"],
+                    "error": "The result is no longer held by the server."
+                })
+            elif not state or state.get("state") not in ("finished", "failed"):
+                self._send_json(
+                    HTTPStatus.ACCEPTED,
+                    {"run_id": parts[1], "state": (state or {}).get("state", "unknown")}
+                )
+            else:
+                self._send_json(HTTPStatus.OK, {"run_id": parts[1], **state})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+
+    def do_POST(self):
+        parts = [part for part in self.path.split("/") if part]
+        try:
+            payload = self._read_json()
+        except json.JSONDecodeError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Invalid JSON body."})
+            return
+
+        try:
+            if parts == ["missions"]:
+                if not payload.get("mission_id"):
+                    self._send_json(
+                        HTTPStatus.BAD_REQUEST, {"error": "'mission_id' is required."}
+                    )
+                    return
+                run_id = self.mission_server.submit(
+                    payload["mission_id"], payload.get("llm_provider", "google_gemini"),
+                    payload.get("orchestrator")
+                )
+                self._send_json(
+                    HTTPStatus.ACCEPTED, {"run_id": run_id, "state": "queued"}
+                )
+            elif len(parts) == 2 and parts[0] == "approvals":
+                approval = self.mission_server.approval_queue.decide(
+                    parts[1], approved=bool(payload.get("approved")),
+                    decided_by=payload.get("decided_by", "api")
+                )
+                resumed = self.mission_server.resume_decided(parts[1])
+                self._send_json(HTTPStatus.ACCEPTED, {
+                    "run_id": parts[1], "approval": approval["status"],
+                    "state": "queued" if resumed else "resumed_elsewhere"
+                })
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+        except queue.Full:
+            self._send_json(
+                HTTPStatus.TOO_MANY_REQUESTS, {"error": "Mission queue is full."},
+                headers={"Retry-After": "5"}
+            )
+        except (FileNotFoundError, ValueError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"[Server] {self.address_string()} - {format % args}")
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+    def get_request(self):
+        # Unix socket clients have no (host, port) address, which the
+        # request handler expects
+        request, _ = super().get_request()
+        return request, ("unix-socket", 0)
+
+
+def _parse_provider_limits(values: list[str]) -> dict:
+    limits = {}
+    for value in values or []:
+        provider, _, limit = value.partition("=")
+        if not limit.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"Invalid provider limit '{value}', expected PROVIDER=N."
+            )
+        limits[provider] = int(limit)
+    return limits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the Project Pantheon mission server."
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Host to bind the HTTP API to."
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="Port to bind the HTTP API to."
+    )
+    parser.add_argument(
+        "--socket", help="Serve the API on this unix socket path instead of TCP."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Number of missions run concurrently."
+    )
+    parser.add_argument(
+        "--max_queue", type=int, default=32,
+        help="Maximum number of queued missions before submissions are rejected."
+    )
+    parser.add_argument(
+        "--provider_limit", action="append", metavar="PROVIDER=N",
+        help="Maximum concurrent missions for an LLM provider (repeatable)."
+    )
+    parser.add_argument(
+        "--default_provider_limit", type=int, default=2,
+        help="Concurrency limit for providers without an explicit limit."
+    )
+    parser.add_argument(
+        "--max_finished_jobs", type=int, default=1000,
+        help="Number of finished runs whose results are kept in memory."
+    )
+    parser.add_argument(
+        "--preload", nargs="*", default=[], metavar="MISSION_ID",
+        help="Missions to warm up at startup."
+    )
+    parser.add_argument(
+        "--preload_providers", nargs="*", default=["google_gemini"], metavar="PROVIDER",
+        help="LLM providers to warm up the preloaded missions for."
+    )
+
+    args = parser.parse_args()
+
+    mission_server = MissionServer(
+        workers=args.workers,
+        max_queue=args.max_queue,
+        provider_limits=_parse_provider_limits(args.provider_limit),
+        default_provider_limit=args.default_provider_limit,
+        max_finished_jobs=args.max_finished_jobs
+    )
+    if args.preload:
+        mission_server.runtime.preload(args.preload, args.preload_providers)
+    mission_server.start()
+
+    MissionRequestHandler.mission_server = mission_server
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        httpd = ThreadingUnixHTTPServer(args.socket, MissionRequestHandler)
+        logger.info(f"[Server] Listening on unix socket {args.socket}")
+    else:
+        httpd = ThreadingHTTPServer((args.host, args.port), MissionRequestHandler)
+        logger.info(f"[Server] Listening on http://{args.host}:{args.port}")
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("[Server] Shutting down.")
+    finally:
+        httpd.server_close()
+        mission_server.stop()
@@ -0,0 +1,124 @@
+# src/pantheon/tasks/batching.py
+import hashlib
+import json
+import math
+from string import Formatter
+
+BATCH_OUTPUT_INSTRUCTIONS = (
+    "\n\nThis task covers {count} {input_name} values: {items_json}. "
+    "Handle each of them separately. Return only a JSON object whose "
+    "keys are exactly these values and whose values are the complete "
+    "result for that value, with no text outside the JSON object."
+)
+
+
+def render_inputs(mission_inputs: dict) -> dict:
+    """
+    Renders list-valued mission inputs as comma-separated text
+    for unbatched descriptions.
+    """
+    return {
+        name: (
+            ", ".join(str(item) for item in value) if isinstance(value, list) else value
+        )
+        for name, value in (mission_inputs or {}).items()
+    }
+
+
+def get_batch_input(template: str, mission_inputs: dict) -> str | None:
+    """
+    Returns the name of the list-valued mission input a task description refers to,
+    i.e. the input the task is batched over, or None if the task is not batched.
+    """
+    field_names = {
+        field_name for _, field_name, _, _ in Formatter().parse(template) if field_name
+    }
+    list_inputs = [
+        name for name in field_names
+        if isinstance((mission_inputs or {}).get(name), list)
+    ]
+    if len(list_inputs) > 1:
+        raise ValueError(
+            "A task can only be batched over one list "
+            f"input, but it refers to {sorted(list_inputs)}."
+        )
+    return list_inputs[0] if list_inputs else None
+
+
+def render_batch_description(template: str, mission_inputs: dict, input_name: str,
+                             items: list[str]) -> str:
+    """
+    Renders a task description for a batch of items of a list input, asking for one
+    result per item.
+    """
+    inputs = render_inputs(mission_inputs)
+    inputs[input_name] = ", ".join(items)
+    return template.format(**inputs) + BATCH_OUTPUT_INSTRUCTIONS.format(
+        count=len(items), input_name=input_name, items_json=json.dumps(items)
+    )
+
+
+def get_batch_key(items: list[str]) -> str:
+    """Returns a stable identifier of a batch of items."""
+    return hashlib.sha1(json.dumps(items).encode("utf-8")).hexdigest()[:12]
+
+
+def parse_batch_output(text: str, items: list[str]) -> dict[str, str]:
+    """
+    Splits the structured output of a batched task into the results of its items.
+    Items missing from the output (e.g. because it was truncated) are left out.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        parsed = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    results = {}
+    for item in items:
+        value = parsed.get(item)
+        if value is not None:
+            results[item] = value if isinstance(value, str) else json.dumps(value)
+    return results
+
+
+class BatchSizer:
+    """
+    Chooses how many items go into the next call of a batched task.
+
+    A batch must fit the model's context window (prompt plus the items and their
+    expected results) and its output limit. Within those bounds, the size adapts:
+    it grows while batches come back complete and is halved when items are missing
+    from the output, which is how truncated or confused answers show up.
+    """
+    def __init__(self, context_window_tokens: int, max_output_tokens: int,
+                 max_batch_size: int = 50, initial_batch_size: int = 10,
+                 output_tokens_per_item: int = 300, context_utilization: float = 0.5):
+        self.context_window_tokens = context_window_tokens
+        self.max_output_tokens = max_output_tokens
+        self.max_batch_size = max_batch_size
+        self.output_tokens_per_item = output_tokens_per_item
+        self.context_utilization = context_utilization
+        self.batch_size = max(1, min(initial_batch_size, max_batch_size))
+
+    def get_limit(self, prompt_tokens: int, item_tokens: int) -> int:
+        """The largest batch the model's context window and output limit can hold."""
+        available_tokens = (
+            self.context_window_tokens * self.context_utilization - prompt_tokens
+        )
+        by_context = available_tokens // (item_tokens + self.output_tokens_per_item)
+        by_output = self.max_output_tokens // self.output_tokens_per_item
+        return max(1, int(min(self.max_batch_size, by_context, by_output)))
+
+    def next_size(self, prompt_tokens: int, item_tokens: int) -> int:
+        return min(self.batch_size, self.get_limit(prompt_tokens, item_tokens))
+
+    def record(self, requested: int, answered: int):
+        if answered < requested:
+            self.batch_size = max(1, requested // 2)
+        elif requested >= self.batch_size:
+            self.batch_size = min(self.max_batch_size, math.ceil(self.batch_size * 1.5))
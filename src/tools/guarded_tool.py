@@ -0,0 +1,59 @@
+# src/pantheon/tools/guarded_tool.py
+from typing import Any
+
+from crewai.tools import BaseTool
+
+from src.identity.policy_engine import PolicyEngine
+from src.observability import logger
+
+
+class GuardedTool(BaseTool):
+    """
+    Wraps a tool given to one agent so that every call is authorized by the
+    PolicyEngine, including the conditions on the call's arguments, before it runs.
+    Both orchestrators call the agents' tools through this wrapper.
+    """
+    tool: BaseTool
+    agent_id: str
+    permission: str
+    policy_engine: PolicyEngine
+    agent_index: int | None = None
+    permission_index: int = 0
+    argument_names: list[str] = []
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def __init__(self, tool: BaseTool, agent_id: str, permission: str,
+                 policy_engine: PolicyEngine):
+        agent_index, permission_index = policy_engine.intern(agent_id, permission)
+        super().__init__(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            tool=tool,
+            agent_id=agent_id,
+            permission=permission,
+            policy_engine=policy_engine,
+            agent_index=agent_index,
+            permission_index=permission_index,
+            # Positional arguments are matched to their names for
+            # the argument conditions
+            argument_names=(
+                list(tool.args_schema.model_fields) if tool.args_schema else []
+            ),
+        )
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        arguments = dict(zip(self.argument_names, args), **kwargs) if args else kwargs
+        if not self.policy_engine.authorize_ids(
+            self.agent_index, self.permission_index, arguments
+        ):
+            logger.warning(
+                f"[Policy] DENIED: Agent '{self.agent_id}' "
+                f"calling '{self.name}' with {arguments}."
+            )
+            return (
+                f"Permission denied: agent '{self.agent_id}' is not "
+                f"allowed to use '{self.name}' with these arguments."
+            )
+        return self.tool._run(*args, **kwargs)
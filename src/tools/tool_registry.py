@@ -3,17 +3,38 @@ from crewai.tools import BaseTool
 
 from src.config.config_loader import ConfigLoader
 from src.observability import logger
+from src.tools.log_ingestion import DEFAULT_LOG_PATHS, get_log_columns
 
 
 # --- Placeholder Tools for MVP ---
 # In a real system, these would be custom classes that interact with actual APIs.
 class SiemLogReaderTool(BaseTool):
     name: str = "SIEM Log Reader"
-    description: str = "Reads and searches SIEM security logs for a specific string indicator. The input to this tool should be a single query string."
+    description: str = (
+        "Reads and searches SIEM security logs for a specific string "
+        "indicator. The input to this tool should be a single query string."
+    )
     def _run(self, query: str) -> str:
         # Simulate reading logs and finding a suspicious event
         logger.debug(f"TOOL_LOG: Searching SIEM for '{query}'")
-        return f"Log search results for query: '{query}'... Found 1 suspicious event related to IP 198.51.100.42. [Simulated]"
+        return (
+            f"Log search results for query: '{query}'... Found 1 "
+            "suspicious event related to IP 198.51.100.42. [Simulated]"
+        )
+
+class SiemLogAggregatorTool(BaseTool):
+    name: str = "SIEM Log Aggregator"
+    description: str = (
+        "Summarizes the SIEM logs instead of returning raw lines: line "
+        "counts per level, source/destination IP, port and hour, first "
+        "and last seen, the most frequent and the rare messages, with "
+        "a few exemplar lines. The input is an IP address, a port or a "
+        "keyword to focus on; an empty string summarizes all logs."
+    )
+    log_paths: str = DEFAULT_LOG_PATHS
+    def _run(self, query: str = "") -> str:
+        logger.debug(f"TOOL_LOG: Aggregating SIEM logs for '{query}'")
+        return get_log_columns(self.log_paths).summarize(query.strip() or None)
 
 class ThreatDBQuerierTool(BaseTool):
     name: str = "Threat Database Querier"
@@ -21,7 +42,10 @@ class ThreatDBQuerierTool(BaseTool):
     def _run(self, indicator: str) -> str:
         # Simulate finding the IP in a threat database
         logger.debug(f"TOOL_LOG: Querying Threat DB for '{indicator}'")
-        return f"Threat database results for indicator: '{indicator}'... IP is associated with known C2 server 'Zeus'. [Simulated]"
+        return (
+            f"Threat database results for indicator: '{indicator}'... "
+            "IP is associated with known C2 server 'Zeus'. [Simulated]"
+        )
 
 class FirewallRuleProposerTool(BaseTool):
     name: str = "Firewall Rule Proposer"
@@ -29,7 +53,10 @@ class FirewallRuleProposerTool(BaseTool):
     def _run(self, rule_spec: str) -> str:
         # Simulate drafting a rule for a human to review
         logger.debug(f"TOOL_LOG: Drafting firewall rule '{rule_spec}'")
-        return f"Firewall rule proposal drafted: '{rule_spec}'. Awaiting human approval. [Simulated]"
+        return (
+            f"Firewall rule proposal drafted: '{rule_spec}'. "
+            "Awaiting human approval. [Simulated]"
+        )
 
 class IsolateHostTool(BaseTool):
     name: str = "Isolate Host"
@@ -45,43 +72,88 @@ class CreateTicketTool(BaseTool):
     def _run(self, title: str, description: str) -> str:
         # Simulate creating a ticket
         logger.debug(f"TOOL_LOG: Creating ticket with title '{title}'")
-        return f"Ticket created with title '{title}' and description '{description}'. [Simulated]"
+        return (
+            f"Ticket created with title '{title}' and "
+            f"description '{description}'. [Simulated]"
+        )
 
 # --- Tool Registry ---
 class ToolRegistry:
     """
     Manages the lifecycle of tools, loading them from configuration
     and providing them to authorized agents.
+
+    Tools are only instantiated when an agent is first equipped with them, and the
+    tool configuration is indexed once so lookups do not scan the tool list.
     """
+    # Mapping of tool IDs from the YAML to the tool classes implementing them
+    TOOL_CLASSES = {
+        "siem_log_reader": SiemLogReaderTool,
+        "siem_log_aggregator": SiemLogAggregatorTool,
+        "threat_db_querier": ThreatDBQuerierTool,
+        "firewall_rule_proposer": FirewallRuleProposerTool,
+        "isolate_host": IsolateHostTool,
+        "create_ticket": CreateTicketTool,
+    }
+
     def __init__(self, tool_config_file="cyber_tools.yaml"):
-        # Mapping of tool IDs from the YAML to the actual tool class instances
-        self.tool_map = {
-            "siem_log_reader": SiemLogReaderTool(),
-            "threat_db_querier": ThreatDBQuerierTool(),
-            "firewall_rule_proposer": FirewallRuleProposerTool(),
-            "isolate_host": IsolateHostTool(),
-            "create_ticket": CreateTicketTool(),
-        }
+        self.tool_map = {} # Tool instances, created on first use
         config_loader = ConfigLoader()
         self.config = config_loader.load_tool_config(tool_config_file)
 
+        # Index the tool definitions by ID and by the permission they require
+        self.tool_definitions = {}
+        self.tool_ids_by_permission = {}
+        for tool_def in self.config.get("tools", []):
+            tool_id = tool_def.get("id")
+            self.tool_definitions[tool_id] = tool_def
+            self.tool_ids_by_permission.setdefault(
+                tool_def.get("permission_required"), []
+            ).append(tool_id)
+
+    def has_tool(self, tool_id: str) -> bool:
+        """
+        Checks whether a tool has an implementation, without instantiating it.
+        """
+        return tool_id in self.TOOL_CLASSES
+
     def get_tool(self, tool_id: str) -> BaseTool | None:
         """
-        Retrieves an instantiated tool object by its ID.
+        Retrieves an instantiated tool object by its ID, instantiating it on first use.
         """
-        return self.tool_map.get(tool_id)
+        if tool_id not in self.tool_map:
+            tool_class = self.TOOL_CLASSES.get(tool_id)
+            if tool_class is None:
+                return None
+            self.tool_map[tool_id] = tool_class()
+        return self.tool_map[tool_id]
 
     def get_permission_for_tool(self, tool_id: str) -> str | None:
         """
         Retrieves the permission required to use a specific tool.
         """
-        for tool_def in self.config.get("tools", []):
-            if tool_def.get("id") == tool_id:
-                return tool_def.get("permission_required")
-        return None
+        return self.tool_definitions.get(tool_id, {}).get("permission_required")
+
+    def get_tool_ids_for_permissions(self, permissions: set[str]) -> list[str]:
+        """
+        Returns the IDs of the tools usable with the given permissions,
+        in configuration order.
+        """
+        tool_ids = {
+            tool_id for permission in permissions
+            for tool_id in self.tool_ids_by_permission.get(permission, [])
+        }
+        return [tool_id for tool_id in self.tool_definitions if tool_id in tool_ids]
+
+    def has_side_effects(self, tool_id: str) -> bool:
+        """
+        Checks whether a tool changes external state. Tools are treated as
+        side-effecting unless their configuration declares otherwise.
+        """
+        return self.tool_definitions.get(tool_id, {}).get("side_effects", True)
 
     def get_all_tool_ids(self) -> list[str]:
         """
         Returns a list of all tool IDs defined in the configuration.
         """
-        return [tool.get("id") for tool in self.config.get("tools", [])]
+        return list(self.tool_definitions)
@@ -0,0 +1,255 @@
+import argparse
+import socket
+import threading
+import time
+import uuid
+
+from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import CostLedger
+from src.governance.injection_filter import InjectionFilter
+from src.main import MissionControl
+from src.memory.learning_queue import get_learning_queue
+from src.observability import logger
+from src.observability.events import EventBus
+from src.orchestrators.warm_runtime import WarmRuntime
+from src.orchestrators.work_queue import (
+    MISSION_JOB,
+    STEP_JOB,
+    WorkQueue,
+    create_work_queue,
+)
+from src.tasks.task_factory import TaskFactory
+from src.workflows.checkpoint_store import CheckpointStore
+from src.workflows.workflow_factory import WorkflowFactory
+
+
+class QueueWorker:
+    """
+    A worker process of the fleet. It claims missions and workflow steps from the shared
+    work queue, runs them on warm agents and stores their results, with their cost
+    records, back on the queue. While a job runs, a heartbeat keeps its lease alive; if
+    the worker dies, the lease expires and another worker picks the job up.
+    """
+    def __init__(self, work_queue: WorkQueue, worker_id: str = None,
+                 concurrency: int = 2, lease_seconds: float = 60.0,
+                 heartbeat_seconds: float = 15.0, kinds: list[str] = None,
+                 checkpoint_store: CheckpointStore = None):
+        self.work_queue = work_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.kinds = kinds or [MISSION_JOB, STEP_JOB]
+        self.checkpoint_store = checkpoint_store or CheckpointStore()
+        # Cost records reach the fleet-wide ledger through its database
+        self.cost_ledger = CostLedger()
+        self.learning_queue = get_learning_queue()
+        self.runtime = WarmRuntime(self.checkpoint_store)
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"queue-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self.learning_queue.start()
+        logger.info(
+            f"[Worker] '{self.worker_id}' started "
+            f"{self.concurrency} slot(s) for {self.kinds} jobs."
+        )
+
+    def stop(self, timeout: float = None):
+        """
+        Stops claiming jobs and waits for the running ones. Jobs interrupted by a hard
+        stop are handed to another worker once their lease expires.
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self.learning_queue.stop(timeout=5)
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.work_queue.claim(
+                    self.worker_id, kinds=self.kinds, lease_seconds=self.lease_seconds
+                )
+            except Exception as e:
+                logger.warning(f"[Worker] Could not claim a job: {e}")
+                job = None
+            if job is None:
+                self._stopping.wait(1.0)
+                continue
+            try:
+                self._run_job(job)
+            except Exception as e:
+                # E.g. the queue was unreachable when storing the outcome; the job is
+                # retried once its lease expires
+                logger.exception(
+                    f"[Worker] Could not finish job '{job['job_id']}': {e}"
+                )
+
+    def _run_job(self, job: dict):
+        job_id = job["job_id"]
+        logger.info(
+            f"[Worker] Running {job['kind']} job '{job_id}' "
+            f"(attempt {job['attempts']}/{job['max_attempts']})."
+        )
+        finished = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(job_id, finished), daemon=True
+        )
+        heartbeat.start()
+        try:
+            if job["kind"] == MISSION_JOB:
+                result = self._run_mission(job["payload"])
+            elif job["kind"] == STEP_JOB:
+                result = self._run_step(job["payload"])
+            else:
+                raise ValueError(f"Unknown job kind '{job['kind']}'.")
+        except Exception as e:
+            logger.exception(f"[Worker] Job '{job_id}' failed: {e}")
+            finished.set()
+            self.work_queue.fail(job_id, self.worker_id, str(e))
+            return
+        finished.set()
+        self.work_queue.complete(
+            job_id, self.worker_id, {**result, "worker_id": self.worker_id}
+        )
+
+    def _heartbeat_loop(self, job_id: str, finished: threading.Event):
+        while not finished.wait(self.heartbeat_seconds):
+            if not self.work_queue.heartbeat(
+                job_id, self.worker_id, lease_seconds=self.lease_seconds
+            ):
+                # The job was reassigned; its result will be dropped when
+                # this attempt finishes
+                logger.warning(f"[Worker] Lost the lease of job '{job_id}'.")
+                return
+
+    def _run_mission(self, payload: dict) -> dict:
+        mission_id, llm_provider = payload["mission_id"], payload["llm_provider"]
+        agent_factory, agents = self.runtime.checkout_agents(mission_id, llm_provider)
+        try:
+            control_plane = MissionControl(
+                mission_id=mission_id,
+                llm_provider=llm_provider,
+                orchestrator_override=payload.get("orchestrator"),
+                run_id=payload.get("run_id"),
+                checkpoint_store=self.checkpoint_store,
+                approval_mode="queue",
+                agent_factory=agent_factory,
+                agents=agents,
+                cost_ledger=self.cost_ledger,
+                learning_queue=self.learning_queue
+            )
+            result = control_plane.run()
+            run = self.checkpoint_store.get_run(control_plane.run_id)
+            return {
+                "run_id": control_plane.run_id,
+                "status": run["status"] if run else None,
+                "result": str(result),
+                "item_results": control_plane.item_results,
+                "total_cost_usd": control_plane.economic_governor.get_total_cost(),
+                "costs": control_plane.economic_governor.get_state(),
+                "cost_breakdown": control_plane.economic_governor.get_cost_breakdown(),
+            }
+        finally:
+            self.runtime.checkin_agents(mission_id, llm_provider, agent_factory, agents)
+
+    def _run_step(self, payload: dict) -> dict:
+        """
+        Runs one task execution of a mission whose workflow runs on the submitter.
+        The submitter charges its cost from the token counts returned here.
+        """
+        mission_id, llm_provider = payload["mission_id"], payload["llm_provider"]
+        mission_config = self.runtime.config_loader.load_mission_config(mission_id)
+        agent_factory, agents = self.runtime.checkout_agents(mission_id, llm_provider)
+        event_bus = EventBus(payload["run_id"])
+        agent_factory.bind_event_bus(event_bus)
+        try:
+            injection_filter_config = mission_config.get("governance", {}).get(
+                "injection_filter", {}
+            )
+            if injection_filter_config.get("enabled", False):
+                event_bus.add_guard(InjectionFilter(injection_filter_config.get("patterns")).as_guard())
+
+            tasks = TaskFactory().create_tasks(
+                mission_config, agents, orchestrator_override=payload["orchestrator"]
+            )
+            workflow = WorkflowFactory.create_workflow(
+                mission_config=mission_config, agents=agents, tasks=tasks,
+                economic_governor=None, orchestrator_override=payload["orchestrator"],
+                checkpoint_store=self.checkpoint_store, run_id=payload["run_id"],
+                event_bus=event_bus
+            )
+            step = payload["step"]
+            # The submitter renders the description, e.g. for a batch of items
+            task = tasks[step["task_id"]].model_copy(
+                update={"description": payload["description"]}
+            )
+            result, input_tokens, cached_input_tokens, output_tokens = (
+                workflow.execute_step(
+                    payload["step_index"], step,
+                    speculative=payload.get("speculative", False), task=task,
+                    batch_key=payload.get("batch_key")
+                )
+            )
+            return {
+                "result": str(result), "input_tokens": input_tokens,
+                "cached_input_tokens": cached_input_tokens,
+                "output_tokens": output_tokens,
+            }
+        finally:
+            self.runtime.checkin_agents(mission_id, llm_provider, agent_factory, agents)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a Project Pantheon worker on the shared work queue."
+    )
+    parser.add_argument(
+        "--worker_id",
+        help="Identifier of this worker. Defaults to the host name and a random suffix."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=2, help="Number of jobs run concurrently."
+    )
+    parser.add_argument(
+        "--kinds", nargs="*", default=[MISSION_JOB, STEP_JOB],
+        choices=[MISSION_JOB, STEP_JOB], help="Kinds of jobs to claim."
+    )
+    parser.add_argument(
+        "--preload", nargs="*", default=[], metavar="MISSION_ID",
+        help="Missions to warm up at startup."
+    )
+    parser.add_argument(
+        "--preload_providers", nargs="*", default=["google_gemini"], metavar="PROVIDER",
+        help="LLM providers to warm up the preloaded missions for."
+    )
+
+    args = parser.parse_args()
+
+    work_queue_config = ConfigLoader().load_work_queue_config().get("work_queue", {})
+    worker = QueueWorker(
+        work_queue=create_work_queue(work_queue_config),
+        worker_id=args.worker_id,
+        concurrency=args.concurrency,
+        lease_seconds=work_queue_config.get("lease_seconds", 60),
+        heartbeat_seconds=work_queue_config.get("heartbeat_seconds", 15),
+        kinds=args.kinds
+    )
+    if args.preload:
+        worker.runtime.preload(args.preload, args.preload_providers)
+    worker.start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("[Worker] Shutting down.")
+    finally:
+        worker.stop(timeout=30)
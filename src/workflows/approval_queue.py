@@ -0,0 +1,182 @@
+# src/pantheon/workflows/approval_queue.py
+import os
+import sqlite3
+import threading
+import time
+
+from src.observability import logger
+from src.workflows.checkpoint_store import DEFAULT_CHECKPOINT_DB
+
+PENDING = "pending"
+APPROVED = "approved"
+REJECTED = "rejected"
+
+
+class ApprovalQueue:
+    """
+    A local, SQLite-backed queue of pending human approvals.
+    A suspended mission posts its approval request here; a decision recorded
+    later (from the CLI or the Python API) lets the mission be resumed.
+    """
+    def __init__(self, db_path: str = DEFAULT_CHECKPOINT_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS approvals (
+                    run_id TEXT NOT NULL,
+                    step_index INTEGER NOT NULL,
+                    step_name TEXT,
+                    prompt TEXT,
+                    status TEXT NOT NULL,
+                    default_action TEXT NOT NULL,
+                    expires_at REAL,
+                    created_at REAL NOT NULL,
+                    decided_at REAL,
+                    decided_by TEXT,
+                    resumed INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (run_id, step_index)
+                )
+                """
+            )
+
+    def submit(self, run_id: str, step_index: int, step_name: str, prompt: str,
+               timeout_seconds: float = None, default_action: str = REJECTED):
+        """
+        Posts a pending approval request. Re-submitting an existing request is a no-op.
+        """
+        if default_action not in (APPROVED, REJECTED):
+            raise ValueError(f"Invalid default approval action: {default_action}")
+
+        now = time.time()
+        expires_at = now + timeout_seconds if timeout_seconds else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO approvals (run_id, step_index, "
+                "step_name, prompt, status, default_action, expires_at, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, step_index, step_name, prompt, PENDING, default_action,
+                    expires_at, now
+                ),
+            )
+        logger.info(f"[HITL] Approval '{step_name}' for run '{run_id}' queued.")
+
+    def get(self, run_id: str, step_index: int) -> dict | None:
+        """
+        Returns the approval record of a run's step, applying its default action if
+        it has expired.
+        """
+        self.expire_overdue()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM approvals WHERE run_id = ? AND step_index = ?",
+                (run_id, step_index)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def decide(self, run_id: str, approved: bool, decided_by: str = "api",
+               step_index: int = None) -> dict:
+        """
+        Records a decision for the pending approval of a run (or one of its steps).
+        """
+        query = "SELECT * FROM approvals WHERE run_id = ? AND status = ?"
+        params = [run_id, PENDING]
+        if step_index is not None:
+            query += " AND step_index = ?"
+            params.append(step_index)
+
+        status = APPROVED if approved else REJECTED
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                query + " ORDER BY step_index LIMIT 1", params
+            ).fetchone()
+            if not row:
+                raise ValueError(f"No pending approval found for run '{run_id}'.")
+            self._conn.execute(
+                "UPDATE approvals SET status = ?, decided_at = ?, "
+                "decided_by = ? WHERE run_id = ? AND step_index = ?",
+                (status, time.time(), decided_by, run_id, row["step_index"]),
+            )
+        logger.info(
+            f"[HITL] Approval '{row['step_name']}' for "
+            f"run '{run_id}' {status} by {decided_by}."
+        )
+        return {**dict(row), "status": status, "decided_by": decided_by}
+
+    def list_pending(self) -> list[dict]:
+        """
+        Returns all approvals still waiting for a decision.
+        """
+        self.expire_overdue()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM approvals WHERE status = ? ORDER BY created_at",
+                (PENDING,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def expire_overdue(self) -> int:
+        """
+        Applies the default action to every pending approval whose timeout has elapsed.
+        Returns the number of approvals that expired.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE approvals SET status = default_action, "
+                "decided_at = ?, decided_by = 'timeout' WHERE status = ? "
+                "AND expires_at IS NOT NULL AND expires_at <= ?",
+                (now, PENDING, now),
+            )
+        if cursor.rowcount:
+            logger.warning(
+                f"[HITL] {cursor.rowcount} approval(s) "
+                "timed out; default action applied."
+            )
+        return cursor.rowcount
+
+    def claim_decided(self, run_id: str = None) -> list[dict]:
+        """
+        Atomically claims the decided approvals (optionally of a single run) whose
+        missions have not been resumed yet.
+        """
+        query = "SELECT * FROM approvals WHERE status != ? AND resumed = 0"
+        params = [PENDING]
+        if run_id is not None:
+            query += " AND run_id = ?"
+            params.append(run_id)
+
+        self.expire_overdue()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(query + " ORDER BY decided_at", params).fetchall()
+            for row in rows:
+                self._conn.execute(
+                    "UPDATE approvals SET resumed = 1 "
+                    "WHERE run_id = ? AND step_index = ?",
+                    (row["run_id"], row["step_index"]),
+                )
+        return [dict(row) for row in rows]
+
+    def release_claim(self, run_id: str):
+        """
+        Returns the claimed approvals of a run to the decided ones, e.g. when its
+        mission could not be queued, so that another resumer (such as the approval
+        watcher) takes it.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE approvals SET resumed = 0 "
+                "WHERE run_id = ? AND status != ? AND resumed = 1",
+                (run_id, PENDING)
+            )
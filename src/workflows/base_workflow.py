@@ -1,19 +1,661 @@
 # src/pantheon/workflows/base_workflow.py
+import json
+import threading
 from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import tiktoken
+
+from src.config.config_loader import ConfigLoader
+from src.llm_providers.llm_factory import LLMFactory
+from src.memory.semantic_cache import (
+    VERIFICATION_PROMPT,
+    VERIFICATION_REJECTED,
+    get_cache_query,
+    get_semantic_cache,
+)
+from src.observability import logger
+from src.observability.events import EventBus, MissionEvent, MissionHalted
+from src.tasks.batching import (
+    BatchSizer,
+    get_batch_input,
+    get_batch_key,
+    parse_batch_output,
+    render_batch_description,
+)
+from src.workflows.approval_queue import APPROVED, PENDING, REJECTED
+from src.workflows.checkpoint_store import CheckpointStore
+from src.workflows.human_in_the_loop import HITLManager
 
 
 class BaseWorkflow(ABC):
     """
     Abstract base class for all workflow execution engines.
+    Runs the mission steps in order, checkpointing each completed step so that
+    a run can be resumed from its first incomplete step, and suspending the run
+    when an approval step is waiting for a queued decision.
+
+    With speculative execution enabled, the task following an approval step is
+    started while the approval is pending if its agent only holds side-effect free
+    tools. Its result is committed on approval and discarded on rejection. If the run
+    suspends instead, it does so right away: the result is stored for the resumed run
+    once the speculative step finishes.
+
+    Token usage reported by the providers (including input tokens served from their
+    prompt cache) is charged instead of the workflow's estimates when available.
+
+    Tasks that opt in with a `semantic_cache` block in their definition are first looked
+    up in the SemanticCache. A result cached for a similar task is returned as is, or,
+    if a `verifier_llm_provider` is set, handed as a draft to that cheaper model, which
+    adapts it to the task or rejects it (the task then runs normally).
+
+    Tasks whose description refers to a list-valued mission input are run in batches
+    of its items, each call answering with one structured result per item (see
+    src/tasks/batching.py). The results are split back per item and the cost of every
+    call is attributed to the items it covered. Batched tasks bypass the semantic
+    cache and are not speculated.
     """
-    def __init__(self, mission_config: dict, agents: dict, tasks: list):
+    def __init__(self, mission_config: dict, agents: dict, tasks: list,
+                 economic_governor=None, checkpoint_store: CheckpointStore = None,
+                 run_id: str = None, hitl_manager: HITLManager = None,
+                 event_bus: EventBus = None):
         self.mission_config = mission_config
         self.agents = agents
         self.tasks = tasks
+        self.economic_governor = economic_governor
+        self.checkpoint_store = checkpoint_store
+        self.run_id = run_id
+        self.hitl_manager = hitl_manager or HITLManager()
+        self.event_bus = event_bus or EventBus(run_id)
+        self.speculative_execution = mission_config.get("workflow_definition", {}).get(
+            "speculative_execution", False
+        )
+        self._speculation_executor = None
+        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.semantic_cache_configs = {
+            task.get("id"): task["semantic_cache"]
+            for task in mission_config.get("task_definitions", [])
+            if (task.get("semantic_cache") or {}).get("enabled", False)
+        }
+        self.semantic_cache = (
+            get_semantic_cache() if self.semantic_cache_configs else None
+        )
+        # This mission's lookups: hit, miss, rejected
+        self.semantic_cache_outcomes = Counter()
+        self._verifier_llms = {}
+        mission_inputs = mission_config.get("mission_inputs", {})
+        self.batching_config = mission_config.get("workflow_definition", {}).get(
+            "batching", {}
+        )
+        # task_id -> (description template, name of the list input it is batched over)
+        self.batched_tasks = {}
+        for task_definition in mission_config.get("task_definitions", []):
+            batch_input = get_batch_input(
+                task_definition.get("description", ""), mission_inputs
+            )
+            if batch_input:
+                self.batched_tasks[task_definition.get("id")] = (
+                    task_definition["description"], batch_input
+                )
+        self.item_results = {} # item -> {task_id: result} for the batched tasks
+        self._batch_sizers = {}
+        # When set (a RemoteStepExecutor), task executions run on the worker fleet
+        # instead of locally
+        self.step_executor = None
+        # agent_id -> [input_tokens, cached_input_tokens, output_tokens]
+        self._llm_usage = {}
+        self._llm_usage_lock = threading.Lock()
+        self.event_bus.subscribe(self._accumulate_llm_usage)
 
     @abstractmethod
-    def execute(self) -> str:
+    def _execute_task(self, step_index: int, step: dict, speculative: bool = False,
+                      task=None, batch_key: str = None) -> tuple[str, int, int]:
         """
-        Executes the defined workflow and returns the final result.
+        Executes a single task step and returns its result with the estimated
+        input and output token counts. Speculative executions must not share any
+        resumable state with the committed execution of the step.
+        A batched task passes the task of the batch and a key identifying its items,
+        which must not share resumable state with the other batches either.
         """
         pass
+
+    def _accumulate_llm_usage(self, event: MissionEvent):
+        if event.type != "llm_usage":
+            return
+        with self._llm_usage_lock:
+            usage = self._llm_usage.setdefault(event.agent_id, [0, 0, 0])
+            usage[0] += event.data.get("input_tokens", 0)
+            usage[1] += event.data.get("cached_input_tokens", 0)
+            usage[2] += event.data.get("output_tokens", 0)
+
+    def _run_task(self, step_index: int, step: dict,
+                  speculative: bool = False) -> tuple[str, int, int, int]:
+        """
+        Executes a task step and returns its result with the input, cached input and
+        output token counts. The usage reported by the provider during the step is
+        preferred over the estimates of _execute_task, which are used when the provider
+        reports none.
+        """
+        if step.get("task_id") in self.batched_tasks:
+            return self._run_batched_task(step_index, step)
+
+        cache_config = self.semantic_cache_configs.get(step.get("task_id"))
+        if cache_config:
+            cached_result = self._lookup_semantic_cache(step, cache_config)
+            if cached_result is not None:
+                return cached_result, 0, 0, 0
+
+        result, input_tokens, cached_input_tokens, output_tokens = (
+            self._execute_with_usage(step_index, step, speculative)
+        )
+
+        # Speculative results may be discarded, so only committed executions are cached
+        if cache_config and not speculative:
+            self.semantic_cache.store(
+                self._get_cache_namespace(step), self._get_cache_query(step), result,
+                ttl_seconds=cache_config.get("ttl_seconds", 86400)
+            )
+        return result, input_tokens, cached_input_tokens, output_tokens
+
+    def _execute_with_usage(self, step_index: int, step: dict,
+                            speculative: bool = False, task=None,
+                            batch_key: str = None) -> tuple[str, int, int, int]:
+        if self.step_executor is not None:
+            description = (task or self.tasks[step.get("task_id")]).description
+            return self.step_executor.execute(
+                step_index, step, description, speculative=speculative,
+                batch_key=batch_key
+            )
+        return self.execute_step(
+            step_index, step, speculative, task=task, batch_key=batch_key
+        )
+
+    def execute_step(self, step_index: int, step: dict, speculative: bool = False,
+                     task=None, batch_key: str = None) -> tuple[str, int, int, int]:
+        """
+        Executes one task execution with this process's agents and returns its result
+        with the input, cached input and output token counts. Workers of the fleet run
+        remote steps with it.
+        """
+        agent_id = step.get("agent_id")
+        with self._llm_usage_lock:
+            self._llm_usage.pop(agent_id, None)
+        result, input_tokens, output_tokens = self._execute_task(
+            step_index, step, speculative, task=task, batch_key=batch_key
+        )
+        with self._llm_usage_lock:
+            usage = self._llm_usage.pop(agent_id, None)
+        if usage and usage[0]:
+            return result, usage[0], usage[1], usage[2]
+        return result, input_tokens, 0, output_tokens
+
+    def _get_batch_sizer(self, task_id: str) -> BatchSizer:
+        # Batches are bounded by the limits of the model that serves the requests first
+        if task_id not in self._batch_sizers:
+            llm_config = ConfigLoader().load_llm_config(
+                self.economic_governor.llm_provider
+            )
+            self._batch_sizers[task_id] = BatchSizer(
+                context_window_tokens=llm_config.get("context_window_tokens", 128000),
+                max_output_tokens=llm_config.get("max_output_tokens", 8192),
+                max_batch_size=self.batching_config.get("max_batch_size", 50),
+                initial_batch_size=self.batching_config.get("initial_batch_size", 10),
+                output_tokens_per_item=self.batching_config.get(
+                    "output_tokens_per_item", 300
+                ),
+                context_utilization=self.batching_config.get(
+                    "context_utilization", 0.5
+                ),
+            )
+        return self._batch_sizers[task_id]
+
+    def _run_batched_task(self, step_index: int,
+                          step: dict) -> tuple[str, int, int, int]:
+        """
+        Runs a task over the items of its list input, as few calls as the batch sizer
+        allows. Items missing from a call's structured output are retried in smaller
+        batches. Every call is charged as it completes, and the task stops between calls
+        (raising MissionHalted) once the budget is exceeded. Returns the per-item
+        results and the token counts of all calls.
+        """
+        task_id, agent_id = step.get("task_id"), step.get("agent_id")
+        template, input_name = self.batched_tasks[task_id]
+        mission_inputs = self.mission_config.get("mission_inputs", {})
+        items = list(dict.fromkeys(str(item) for item in mission_inputs[input_name]))
+        sizer = self._get_batch_sizer(task_id)
+        prompt_tokens = len(
+            self.encoding.encode(
+                render_batch_description(template, mission_inputs, input_name, [])
+            )
+        )
+        # Every item appears in the description, in the list of expected keys and as a
+        # key of the output
+        item_tokens = (
+            3 * max(len(self.encoding.encode(json.dumps(item))) for item in items)
+        )
+
+        results = {}
+        totals = [0, 0, 0]
+        remaining = items
+        while remaining:
+            batch = remaining[:sizer.next_size(prompt_tokens, item_tokens)]
+            logger.info(
+                f"[Batching] Running '{task_id}' for {len(batch)} of "
+                f"{len(remaining)} remaining {input_name} value(s)."
+            )
+            task = self.tasks[task_id].model_copy(
+                update={
+                    "description": render_batch_description(
+                        template, mission_inputs, input_name, batch
+                    )
+                }
+            )
+            output, input_tokens, cached_input_tokens, output_tokens = (
+                self._execute_with_usage(
+                    step_index, step, task=task, batch_key=get_batch_key(batch)
+                )
+            )
+            answers = parse_batch_output(output, batch)
+            if not answers and len(batch) == 1:
+                # An unstructured answer about a single item is still its answer
+                answers = {batch[0]: output}
+            sizer.record(len(batch), len(answers))
+
+            self.economic_governor.track_cost(
+                agent_id, input_tokens, output_tokens, cached_input_tokens
+            )
+            self.economic_governor.track_item_costs(
+                batch, input_tokens, output_tokens, cached_input_tokens,
+                item_output_tokens={
+                    item: len(self.encoding.encode(answer))
+                    for item, answer in answers.items()
+                }
+            )
+            usage = (input_tokens, cached_input_tokens, output_tokens)
+            for i, count in enumerate(usage):
+                totals[i] += count
+            results.update(answers)
+            remaining = [item for item in remaining if item not in results]
+
+            if remaining and self.economic_governor.is_budget_exceeded():
+                # The items answered so far are kept with the mission's per-item results
+                for item, answer in results.items():
+                    self.item_results.setdefault(item, {})[task_id] = answer
+                reason = (
+                    f"budget exceeded after {len(results)} "
+                    f"of {len(items)} {input_name} value(s)"
+                )
+                self.event_bus.publish(
+                    "mission_halted", agent_id=agent_id, reason=reason
+                )
+                raise MissionHalted(reason)
+
+        for item in items:
+            self.item_results.setdefault(item, {})[task_id] = results[item]
+        result = "\n\n".join(
+            f"[{input_name}: {item}]\n{results[item]}" for item in items
+        )
+        return result, totals[0], totals[1], totals[2]
+
+    def _get_cache_namespace(self, step: dict) -> str:
+        return f"{step.get('agent_id')}/{step.get('task_id')}"
+
+    def _get_cache_query(self, step: dict) -> str:
+        return get_cache_query(
+            step.get("agent_id"), self.tasks[step.get("task_id")].description
+        )
+
+    def _lookup_semantic_cache(self, step: dict, cache_config: dict) -> str | None:
+        """
+        Returns a result cached for a similar task, verified if configured, or None
+        on a miss.
+        """
+        agent_id, task_id = step.get("agent_id"), step.get("task_id")
+        namespace = self._get_cache_namespace(step)
+        match = self.semantic_cache.lookup(
+            namespace, self._get_cache_query(step),
+            cache_config.get("similarity_threshold", 0.9)
+        )
+        if match is None:
+            self.semantic_cache_outcomes["miss"] += 1
+            self.event_bus.publish(
+                "semantic_cache", agent_id=agent_id, step=task_id, outcome="miss"
+            )
+            return None
+
+        result, similarity = match
+        verifier_provider = cache_config.get("verifier_llm_provider")
+        if verifier_provider:
+            result = self._verify_cached_result(
+                agent_id, verifier_provider, self.tasks[task_id].description, result
+            )
+            if result is None:
+                self.semantic_cache.record_rejection(namespace)
+                self.semantic_cache_outcomes["rejected"] += 1
+                self.event_bus.publish(
+                    "semantic_cache", agent_id=agent_id, step=task_id,
+                    outcome="rejected", similarity=similarity
+                )
+                return None
+
+        logger.info(
+            f"[SemanticCache] Serving '{task_id}' from "
+            f"the cache (similarity {similarity:.3f})."
+        )
+        self.semantic_cache_outcomes["hit"] += 1
+        self.event_bus.publish(
+            "semantic_cache", agent_id=agent_id, step=task_id, outcome="hit",
+            similarity=similarity
+        )
+        return result
+
+    def _verify_cached_result(self, agent_id: str, provider_id: str,
+                              task_description: str, draft: str) -> str | None:
+        """
+        Asks the verification model to adapt a cached draft to the task. Returns None if
+        it rejects the draft or fails.
+        """
+        if provider_id not in self._verifier_llms:
+            llm_factory = LLMFactory()
+            self._verifier_llms[provider_id] = (
+                llm_factory.create_llm(provider_id),
+                llm_factory.get_primary_route(provider_id)[1].get("model")
+            )
+        llm, model = self._verifier_llms[provider_id]
+
+        prompt = VERIFICATION_PROMPT.format(task=task_description, draft=draft)
+        try:
+            response = llm.invoke(prompt)
+        except Exception as e:
+            logger.warning(
+                f"[SemanticCache] Verification with '{provider_id}' "
+                f"failed, running the task instead: {e}"
+            )
+            return None
+
+        answer = str(response.content).strip()
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.economic_governor.track_verification_cost(
+            agent_id, provider_id, model,
+            usage.get("input_tokens") or len(self.encoding.encode(prompt)),
+            usage.get("output_tokens") or len(self.encoding.encode(answer)),
+        )
+        if not answer or answer.upper().startswith(VERIFICATION_REJECTED):
+            logger.info(
+                "[SemanticCache] Cached result rejected by "
+                f"'{provider_id}' for agent '{agent_id}'."
+            )
+            return None
+        return answer
+
+    def _load_checkpoints(self) -> dict[int, dict]:
+        if not self.checkpoint_store or not self.run_id:
+            return {}
+
+        completed_steps = self.checkpoint_store.load_steps(self.run_id)
+        if completed_steps:
+            last_step = completed_steps[max(completed_steps)]
+            if last_step["governor_state"] and self.economic_governor:
+                self.economic_governor.restore_state(last_step["governor_state"])
+            logger.info(
+                f"[Checkpoint] Resuming run '{self.run_id}' "
+                f"with {len(completed_steps)} completed step(s)."
+            )
+        return completed_steps
+
+    def _save_checkpoint(self, step_index: int, step: dict, result: str,
+                         input_tokens: int = 0, output_tokens: int = 0):
+        if not self.checkpoint_store or not self.run_id:
+            return
+
+        governor_state = (
+            self.economic_governor.get_state() if self.economic_governor else None
+        )
+        self.checkpoint_store.save_step(
+            run_id=self.run_id,
+            step_index=step_index,
+            step_name=step.get("task_id") or step.get("name"),
+            step_type=step.get("type", "task"),
+            result=result,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            governor_state=governor_state,
+        )
+
+    def _start_speculation(self, workflow_steps: list, approval_index: int,
+                           completed_steps: dict) -> Future | None:
+        """
+        Starts the task following an approval step in the background, if it is eligible.
+        """
+        next_index = approval_index + 1
+        if next_index >= len(workflow_steps) or next_index in completed_steps:
+            return None
+
+        # A result speculated before a previous suspension is still waiting
+        # to be resolved
+        if self.checkpoint_store and self.run_id:
+            stored = self.checkpoint_store.pop_speculative_step(self.run_id, next_index)
+            if stored:
+                future = Future()
+                future.set_result(
+                    (
+                        stored["result"], stored["input_tokens"],
+                        stored["cached_input_tokens"], stored["output_tokens"]
+                    )
+                )
+                return future
+
+        next_step = workflow_steps[next_index]
+        if not self.speculative_execution or next_step.get("type", "task") != "task":
+            return None
+        if next_step.get("task_id") in self.batched_tasks:
+            return None
+
+        agent = self.agents.get(next_step.get("agent_id"))
+        if not agent or not agent.side_effect_free:
+            logger.debug(
+                f"[Speculation] Step {next_index} is not "
+                "eligible: its agent holds side-effecting tools."
+            )
+            return None
+
+        if self._speculation_executor is None:
+            self._speculation_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="speculation"
+            )
+        logger.info(
+            f"[Speculation] Starting step {next_index} "
+            f"('{next_step.get('task_id')}') while approval is pending."
+        )
+        return self._speculation_executor.submit(
+            self._run_task, next_index, next_step, True
+        )
+
+    def _resolve_speculation(self, speculation: Future | None, workflow_steps: list,
+                             approval_index: int, decision: str, completed_steps: dict):
+        """
+        Commits, stores or discards a speculative execution depending on
+        the approval decision.
+        """
+        if speculation is None:
+            return
+
+        next_index = approval_index + 1
+        next_step = workflow_steps[next_index]
+        agent_id = next_step.get("agent_id")
+        if decision == PENDING:
+            # The run suspends without waiting for the speculative step
+            speculation.add_done_callback(
+                lambda future: self._store_speculation(future, next_index, agent_id)
+            )
+            return
+
+        try:
+            result, input_tokens, cached_input_tokens, output_tokens = (
+                speculation.result()
+            )
+        except Exception as e:
+            logger.warning(
+                f"[Speculation] Step {next_index} failed "
+                f"speculatively and will run normally: {e}"
+            )
+            return
+
+        if decision == APPROVED:
+            logger.info(
+                "[Speculation] Approval granted, committing "
+                f"speculative result of step {next_index}."
+            )
+            self.economic_governor.track_cost(
+                agent_id, input_tokens, output_tokens, cached_input_tokens
+            )
+            self._save_checkpoint(
+                next_index, next_step, result, input_tokens, output_tokens
+            )
+            completed_steps[next_index] = {
+                "step_name": next_step.get("task_id"), "step_type": "task",
+                "result": result
+            }
+        elif decision == REJECTED:
+            logger.info(
+                "[Speculation] Approval rejected, discarding "
+                f"speculative result of step {next_index}."
+            )
+            self.economic_governor.track_discarded_cost(
+                agent_id, input_tokens, output_tokens, cached_input_tokens
+            )
+
+    def _store_speculation(self, speculation: Future, step_index: int, agent_id: str):
+        """
+        Stores the result of a speculative step whose run was suspended, for the resumed
+        run to resolve.
+        """
+        try:
+            result, input_tokens, cached_input_tokens, output_tokens = (
+                speculation.result()
+            )
+        except Exception as e:
+            logger.warning(
+                f"[Speculation] Step {step_index} failed "
+                f"speculatively and will run normally: {e}"
+            )
+            return
+        if self.checkpoint_store and self.run_id:
+            self.checkpoint_store.save_speculative_step(
+                self.run_id, step_index, agent_id, result, input_tokens, output_tokens,
+                cached_input_tokens
+            )
+
+    def execute(self) -> dict:
+        """
+        Executes the defined workflow step-by-step and returns the final result.
+        Steps already recorded in the checkpoint store for this run are skipped.
+        """
+        workflow_steps = self.mission_config.get("workflow_definition", {}).get(
+            "steps", []
+        )
+        completed_steps = self._load_checkpoints()
+        results_log = []
+        status = "completed"
+
+        for step_index, step in enumerate(workflow_steps):
+            step_type = step.get("type", "task") # Default to "task" if not specified
+
+            checkpoint = completed_steps.get(step_index)
+            if checkpoint:
+                logger.info(
+                    f"[Checkpoint] Step {step_index} "
+                    f"('{checkpoint['step_name']}') already completed, skipping."
+                )
+                if checkpoint["step_type"] == "task":
+                    results_log.append(checkpoint["result"])
+                continue
+
+            if step_type == "task":
+                agent_id = step.get("agent_id")
+                # The mission and fleet-wide budgets may have been exhausted, also
+                # by other missions
+                if (self.economic_governor
+                        and self.economic_governor.is_budget_exceeded()):
+                    halted_message = (
+                        "Mission halted before "
+                        f"'{step.get('task_id')}': budget exceeded."
+                    )
+                    logger.warning(halted_message)
+                    self.event_bus.publish(
+                        "mission_halted", agent_id=agent_id, reason="budget exceeded"
+                    )
+                    results_log.append(halted_message)
+                    status = "halted"
+                    break
+                self.event_bus.publish(
+                    "step_started", agent_id=agent_id, step=step.get("task_id")
+                )
+                try:
+                    result, input_tokens, cached_input_tokens, output_tokens = (
+                        self._run_task(step_index, step)
+                    )
+                except MissionHalted as e:
+                    halted_message = (
+                        f"Mission halted during '{step.get('task_id')}': {e.reason}"
+                    )
+                    logger.warning(halted_message)
+                    results_log.append(halted_message)
+                    status = "halted"
+                    break
+                results_log.append(result)
+                self.event_bus.publish(
+                    "step_completed", agent_id=agent_id, step=step.get("task_id"),
+                    result=result
+                )
+
+                # Track cost per agent; batched tasks charged each of
+                # their calls already
+                if step.get("task_id") not in self.batched_tasks:
+                    self.economic_governor.track_cost(
+                        agent_id, input_tokens, output_tokens, cached_input_tokens
+                    )
+                self._save_checkpoint(
+                    step_index, step, result, input_tokens, output_tokens
+                )
+
+            elif step_type == "human_approval":
+                speculation = self._start_speculation(
+                    workflow_steps, step_index, completed_steps
+                )
+                decision = self.hitl_manager.check_approval(
+                    self.run_id, step_index, step
+                )
+                if decision == APPROVED:
+                    self._save_checkpoint(step_index, step, "approved")
+                self._resolve_speculation(
+                    speculation, workflow_steps, step_index, decision, completed_steps
+                )
+                if decision == PENDING:
+                    self.event_bus.publish(
+                        "approval_pending", step=step.get("name"),
+                        prompt=step.get("prompt")
+                    )
+                    suspended_message = (
+                        "Mission suspended awaiting approval "
+                        f"'{step.get('name')}' (run '{self.run_id}')."
+                    )
+                    logger.info(suspended_message)
+                    results_log.append(suspended_message)
+                    status = "suspended"
+                    break # Free the worker; the run is resumed once a decision arrives
+                if decision != APPROVED:
+                    aborted_message = "Mission aborted by human supervisor."
+                    logger.warning(aborted_message)
+                    results_log.append(aborted_message)
+                    status = "aborted"
+                    break # Stop the workflow if rejected
+
+            else:
+                raise ValueError(f"Unknown workflow step type: {step_type}")
+
+        return {
+            "result": "\n\n".join(results_log), "status": status,
+            "items": self.item_results
+        }
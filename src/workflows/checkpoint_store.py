@@ -0,0 +1,210 @@
+# src/pantheon/workflows/checkpoint_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from src.observability import logger
+
+DEFAULT_CHECKPOINT_DB = "checkpoints/pantheon.db"
+
+
+class CheckpointStore:
+    """
+    Persists mission runs and the outcome of every completed workflow step
+    in a local SQLite database, so that an interrupted mission can be resumed
+    from its first incomplete step instead of starting over.
+    """
+    def __init__(self, db_path: str = DEFAULT_CHECKPOINT_DB):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS mission_runs (
+                    run_id TEXT PRIMARY KEY,
+                    mission_id TEXT NOT NULL,
+                    llm_provider TEXT NOT NULL,
+                    orchestrator TEXT,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS mission_steps (
+                    run_id TEXT NOT NULL,
+                    step_index INTEGER NOT NULL,
+                    step_name TEXT,
+                    step_type TEXT NOT NULL,
+                    result TEXT,
+                    input_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    governor_state TEXT,
+                    completed_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, step_index)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS speculative_steps (
+                    run_id TEXT NOT NULL,
+                    step_index INTEGER NOT NULL,
+                    agent_id TEXT,
+                    result TEXT,
+                    input_tokens INTEGER NOT NULL DEFAULT 0,
+                    output_tokens INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    cached_input_tokens INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (run_id, step_index)
+                )
+                """
+            )
+            # Stores created before prompt caching was tracked
+            columns = {
+                row["name"]
+                for row in self._conn.execute("PRAGMA table_info(speculative_steps)")
+            }
+            if "cached_input_tokens" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE speculative_steps ADD COLUMN "
+                    "cached_input_tokens INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def create_run(self, mission_id: str, llm_provider: str,
+                   orchestrator: str = None) -> str:
+        """
+        Registers a new mission run and returns its generated run ID.
+        """
+        run_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO mission_runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, mission_id, llm_provider, orchestrator, "running", now, now),
+            )
+        logger.info(
+            f"[Checkpoint] Registered run '{run_id}' for mission '{mission_id}'."
+        )
+        return run_id
+
+    def get_run(self, run_id: str) -> dict | None:
+        """
+        Returns the stored record of a mission run, or None if it is unknown.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM mission_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_run_status(self, run_id: str, status: str):
+        """
+        Updates the status of a mission run (e.g. 'running',
+        'completed', 'aborted', 'failed').
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE mission_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, time.time(), run_id),
+            )
+        logger.debug(f"[Checkpoint] Run '{run_id}' is now '{status}'.")
+
+    def save_step(self, run_id: str, step_index: int, step_name: str, step_type: str,
+                  result: str, input_tokens: int = 0, output_tokens: int = 0,
+                  governor_state: dict = None):
+        """
+        Records a completed workflow step together with its token usage and the
+        economic governor state right after the step.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mission_steps "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, step_index, step_name, step_type, result, input_tokens,
+                    output_tokens,
+                    json.dumps(governor_state) if governor_state is not None else None,
+                    time.time(),
+                ),
+            )
+            self._conn.execute(
+                "UPDATE mission_runs SET updated_at = ? WHERE run_id = ?",
+                (time.time(), run_id)
+            )
+        logger.info(
+            f"[Checkpoint] Step {step_index} ('{step_name}') of run '{run_id}' saved."
+        )
+
+    def load_steps(self, run_id: str) -> dict[int, dict]:
+        """
+        Returns the completed steps of a run, keyed by their index in the workflow.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM mission_steps WHERE run_id = ? ORDER BY step_index",
+                (run_id,)
+            ).fetchall()
+
+        steps = {}
+        for row in rows:
+            step = dict(row)
+            step["governor_state"] = (
+                json.loads(step["governor_state"]) if step["governor_state"] else None
+            )
+            steps[step["step_index"]] = step
+        return steps
+
+    def save_speculative_step(self, run_id: str, step_index: int, agent_id: str,
+                              result: str, input_tokens: int = 0,
+                              output_tokens: int = 0, cached_input_tokens: int = 0):
+        """
+        Stores the result of a step executed speculatively while an approval is pending,
+        with its token usage. It is only committed as a completed step once the approval
+        is granted.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO speculative_steps (run_id, step_index, "
+                "agent_id, result, input_tokens, output_tokens, created_at, "
+                "cached_input_tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, step_index, agent_id, result, input_tokens, output_tokens,
+                    time.time(), cached_input_tokens
+                ),
+            )
+        logger.info(
+            "[Checkpoint] Speculative result for step "
+            f"{step_index} of run '{run_id}' saved."
+        )
+
+    def pop_speculative_step(self, run_id: str, step_index: int) -> dict | None:
+        """
+        Removes and returns the speculative result stored for a step, if any.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM speculative_steps WHERE run_id = ? AND step_index = ?",
+                (run_id, step_index)
+            ).fetchone()
+            if row:
+                self._conn.execute(
+                    "DELETE FROM speculative_steps WHERE run_id = ? AND step_index = ?",
+                    (run_id, step_index)
+                )
+        return dict(row) if row else None
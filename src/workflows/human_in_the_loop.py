@@ -2,12 +2,64 @@
 import sys
 
 from src.observability import logger
+from src.workflows.approval_queue import APPROVED, PENDING, REJECTED, ApprovalQueue
 
 
 class HITLManager:
     """
     Manages the human-in-the-loop approval process.
+
+    In 'console' mode the supervisor is asked on the terminal. In 'queue' mode the
+    approval is posted to the ApprovalQueue and the mission is suspended until a
+    decision arrives, so no worker is held while the supervisor decides.
     """
+    def __init__(self, approval_queue: ApprovalQueue = None, mode: str = None):
+        self.approval_queue = approval_queue
+        if mode is None:
+            mode = "console" if sys.stdout.isatty() else "queue"
+        if mode not in ("console", "queue"):
+            raise ValueError(f"Unsupported approval mode: {mode}")
+        if mode == "queue" and approval_queue is None:
+            logger.warning(
+                "Queue approval mode requested without an "
+                "approval queue. Falling back to 'console'."
+            )
+            mode = "console"
+        self.mode = mode
+
+    def check_approval(self, run_id: str, step_index: int, step: dict) -> str:
+        """
+        Resolves an approval step of a run to 'approved', 'rejected' or 'pending'.
+        A decision already recorded in the queue always takes precedence.
+        """
+        if self.approval_queue and run_id:
+            record = self.approval_queue.get(run_id, step_index)
+            if record and record["status"] != PENDING:
+                logger.info(
+                    f"[HITL] Using recorded decision for '{step.get('name')}': "
+                    f"{record['status']} (by {record['decided_by']})."
+                )
+                return record["status"]
+
+        if self.mode == "console":
+            return APPROVED if self.request_approval(step.get("prompt")) else REJECTED
+
+        if not run_id:
+            logger.warning(
+                "Cannot queue an approval without a run ID. Defaulting to 'no'."
+            )
+            return REJECTED
+
+        self.approval_queue.submit(
+            run_id=run_id,
+            step_index=step_index,
+            step_name=step.get("name"),
+            prompt=step.get("prompt"),
+            timeout_seconds=step.get("timeout_seconds"),
+            default_action=step.get("default_action", REJECTED),
+        )
+        return PENDING
+
     def request_approval(self, prompt: str) -> bool:
         """
         Pauses the workflow and requests human approval from the console.
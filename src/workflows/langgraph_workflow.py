@@ -1,13 +1,109 @@
 # src/pantheon/workflows/langgraph_workflow.py
 import operator
+import sqlite3
+import threading
+import uuid
+import weakref
 from typing import Annotated, Sequence, TypedDict
 
-import tiktoken
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import END, StateGraph
 
 from src.observability import logger
+from src.observability.events import EventBus
 from src.workflows.base_workflow import BaseWorkflow
+from src.workflows.checkpoint_store import CheckpointStore
+from src.workflows.human_in_the_loop import HITLManager
+
+# The graph does not depend on the mission, so it is compiled once per checkpoint
+# database and shared. Nodes find their workflow through the run config.
+_compiled_graphs = {}
+_compiled_graphs_lock = threading.Lock()
+_active_workflows = weakref.WeakValueDictionary()
+
+
+class AgentState(TypedDict):
+    # The state only holds serializable values so it can be checkpointed;
+    # agents and tasks are looked up from the workflow by ID.
+    messages: Annotated[Sequence[BaseMessage], operator.add]
+    task_id: str
+    agent_id: str
+
+
+def _get_workflow(config: RunnableConfig) -> "LangGraphWorkflow":
+    return _active_workflows[config["configurable"]["workflow_key"]]
+
+
+def _agent_node(state: AgentState, config: RunnableConfig):
+    workflow = _get_workflow(config)
+    agent = workflow.agents[state["agent_id"]]
+    # Only the conversation is rebuilt on each turn; the tool strings are rendered
+    # once per agent so the prompt keeps a byte-identical, cacheable prefix
+    prompt = "\n".join([f"{m.content}" for m in state["messages"]])
+
+    inputs_for_executor = {
+        "input": prompt,
+        "tools": agent.tools_description,
+        "tool_names": agent.tool_names,
+        "task": workflow.tasks[state["task_id"]] # Explicitly pass the task object
+    }
+    result = agent.agent_executor.invoke(inputs_for_executor)
+    return {"messages": [AIMessage(content=result["output"])]}
+
+
+def _tool_node(state: AgentState, config: RunnableConfig):
+    agent = _get_workflow(config).agents[state["agent_id"]]
+    tool_calls = state["messages"][-1].tool_calls
+    tool_messages = []
+    for tool_call in tool_calls:
+        tool = {tool.name: tool for tool in agent.tools}[tool_call["name"]]
+        output = tool.run(tool_call["args"])
+        tool_messages.append(
+            ToolMessage(content=str(output), tool_call_id=tool_call["id"])
+        )
+    return {"messages": tool_messages}
+
+
+def _should_continue(state: AgentState):
+    if isinstance(state["messages"][-1], ToolMessage):
+        return "agent"
+    if not state["messages"][-1].tool_calls:
+        return END
+    return "tools"
+
+
+def get_compiled_graph(checkpoint_db_path: str | None = None):
+    """
+    Returns the agent/tool graph compiled with a SQLite checkpointer on the given
+    database (or without checkpointer), compiling it on first use.
+    """
+    with _compiled_graphs_lock:
+        graph = _compiled_graphs.get(checkpoint_db_path)
+        if graph is None:
+            checkpointer = None
+            if checkpoint_db_path:
+                # The graph checkpoints share the mission checkpoint database so that
+                # a step interrupted mid-graph resumes from its last completed node.
+                checkpointer = SqliteSaver(
+                    sqlite3.connect(checkpoint_db_path, check_same_thread=False)
+                )
+
+            workflow = StateGraph(AgentState)
+            workflow.add_node("agent", _agent_node)
+            workflow.add_node("tools", _tool_node)
+            workflow.set_entry_point("agent")
+            workflow.add_conditional_edges("agent", _should_continue)
+            workflow.add_edge("tools", "agent")
+
+            graph = workflow.compile(checkpointer=checkpointer)
+            _compiled_graphs[checkpoint_db_path] = graph
+            logger.debug(
+                "Compiled LangGraph workflow graph "
+                f"(checkpoints: {checkpoint_db_path})."
+            )
+        return graph
 
 
 class LangGraphWorkflow(BaseWorkflow):
@@ -15,100 +111,109 @@ class LangGraphWorkflow(BaseWorkflow):
     Executes a workflow using LangGraph.
     """
 
-    def __init__(self, mission_config: dict, agents: dict, tasks: dict, economic_governor):
-        super().__init__(mission_config, agents, tasks)
+    def __init__(self, mission_config: dict, agents: dict, tasks: dict,
+                 economic_governor, checkpoint_store: CheckpointStore = None,
+                 run_id: str = None, hitl_manager: HITLManager = None,
+                 event_bus: EventBus = None):
+        super().__init__(
+            mission_config, agents, tasks, economic_governor, checkpoint_store, run_id,
+            hitl_manager, event_bus
+        )
         self.tasks = tasks
-        self.economic_governor = economic_governor
-        self.workflow = self._build_graph()
-
-    def _build_graph(self):
-        class AgentState(TypedDict):
-            messages: Annotated[Sequence[BaseMessage], operator.add]
-            task: dict
-            agent: object
-            tools: Sequence[object]
-
-        def agent_node(state: AgentState):
-            prompt = "\n".join([f"{m.content}" for m in state["messages"]])
-            tool_names = ", ".join([tool.name for tool in state["tools"]]).strip() # Ensure no trailing comma
-            tools_string = "\n".join([f"{tool.name}: {tool.description}" for tool in state["tools"]])
-
-            inputs_for_executor = {
-                "input": prompt,
-                "tools": tools_string,
-                "tool_names": tool_names,
-                "task": state["task"] # Explicitly pass the task object
+        self.checkpointed = bool(checkpoint_store and run_id)
+        self.workflow = get_compiled_graph(
+            checkpoint_store.db_path if self.checkpointed else None
+        )
+        self.workflow_key = uuid.uuid4().hex
+        _active_workflows[self.workflow_key] = self
+
+    def _run_graph(self, graph_input, config: dict, task_id: str, agent_id: str,
+                   seen_messages: int = 1) -> dict:
+        # Stream the graph so every new message is published as soon as
+        # its node finishes
+        final_state = None
+        config = {
+            "configurable": {
+                **config.get("configurable", {}), "workflow_key": self.workflow_key
             }
-            result = state["agent"].agent_executor.invoke(inputs_for_executor)
-            return {"messages": [AIMessage(content=result["output"])]}
-
-        def tool_node(state: AgentState):
-            tool_calls = state["messages"][-1].tool_calls
-            tool_messages = []
-            for tool_call in tool_calls:
-                tool = {tool.name: tool for tool in state["tools"]}[tool_call["name"]]
-                output = tool.run(tool_call["args"])
-                tool_messages.append(ToolMessage(content=str(output), tool_call_id=tool_call["id"]))
-            return {"messages": tool_messages}
-
-        def should_continue(state: AgentState):
-            if isinstance(state["messages"][-1], ToolMessage):
-                return "agent"
-            if not state["messages"][-1].tool_calls:
-                return END
-            return "tools"
-
-        workflow = StateGraph(AgentState)
-        workflow.add_node("agent", agent_node)
-        workflow.add_node("tools", tool_node)
-        workflow.set_entry_point("agent")
-        workflow.add_conditional_edges("agent", should_continue)
-        workflow.add_edge("tools", "agent")
-
-        return workflow.compile()
+        }
+        for state in self.workflow.stream(graph_input, config, stream_mode="values"):
+            for message in state["messages"][seen_messages:]:
+                self.event_bus.publish(
+                    "agent_step", agent_id=agent_id, step=task_id,
+                    output=str(message.content)
+                )
+            seen_messages = len(state["messages"])
+            final_state = state
+        return final_state
+
+    def _invoke_graph(self, step_index: int, task, task_id: str, agent_id: str,
+                      speculative: bool = False, batch_key: str = None) -> dict:
+        if not self.checkpointed:
+            initial_state = {
+                "task_id": task_id,
+                "agent_id": agent_id,
+                "messages": [HumanMessage(content=task.description)]
+            }
+            return self._run_graph(initial_state, {}, task_id, agent_id)
+
+        # Speculative executions run on their own graph thread so they never leak into
+        # the committed one
+        thread_id = (
+            f"{self.run_id}:{step_index}:speculative" if speculative
+            else f"{self.run_id}:{step_index}"
+        )
+        if batch_key:
+            # Each batch of a batched task is its own graph thread, keyed by its items
+            thread_id = f"{thread_id}:{batch_key}"
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = self.workflow.get_state(config)
+        if snapshot.values and snapshot.next:
+            logger.info(
+                f"[Checkpoint] Resuming task '{task_id}' from "
+                f"LangGraph node(s) {list(snapshot.next)}."
+            )
+            return self._run_graph(
+                None, config, task_id, agent_id,
+                seen_messages=len(snapshot.values["messages"])
+            )
+        if snapshot.values:
+            logger.info(
+                f"[Checkpoint] Task '{task_id}' already finished "
+                "in LangGraph, reusing its final state."
+            )
+            return snapshot.values
+
+        initial_state = {
+            "task_id": task_id,
+            "agent_id": agent_id,
+            "messages": [HumanMessage(content=task.description)]
+        }
+        return self._run_graph(initial_state, config, task_id, agent_id)
 
     def execute(self) -> dict:
         """
         Executes the workflow using LangGraph.
         """
         logger.info("--- Workflow Engine: Starting LangGraph Workflow ---")
-
-        results_log = []
-        for step in self.mission_config.get("workflow_definition", {}).get("steps", []):
-            step_type = step.get("type", "task")
-
-            if step_type == "task":
-                task_id = step.get("task_id")
-                agent_id = step.get("agent_id")
-
-                task = self.tasks.get(task_id)
-                agent = self.agents.get(agent_id)
-
-                logger.info(f"Executing task '{task_id}' with agent '{agent_id}' via LangGraph...")
-
-                initial_state = {
-                    "task": task,
-                    "agent": agent,
-                    "tools": agent.tools,
-                    "messages": [HumanMessage(content=task.description)]
-                }
-
-                final_state = self.workflow.invoke(initial_state)
-                result = final_state["messages"][-1].content
-                results_log.append(result)
-
-                # Cost tracking
-                encoding = tiktoken.get_encoding("cl100k_base")
-                output_tokens = len(encoding.encode(result))
-                input_tokens = len(encoding.encode(task.description))
-                self.economic_governor.track_cost(agent_id, input_tokens, output_tokens)
-
-            elif step_type == "human_approval":
-                prompt = step.get("prompt")
-                logger.info("--- [HITL] Approval Required ---")
-                logger.info(f"PROMPT: {prompt}")
-                logger.warning("Non-interactive environment detected. Defaulting to 'no'.")
-                results_log.append("Mission aborted by human supervisor.")
-                break
-
-        return {"result": "\n\n".join(results_log)}
+        return super().execute()
+
+    def _execute_task(self, step_index: int, step: dict, speculative: bool = False,
+                      task=None, batch_key: str = None) -> tuple[str, int, int]:
+        task_id = step.get("task_id")
+        agent_id = step.get("agent_id")
+        task = task or self.tasks.get(task_id)
+
+        logger.info(
+            f"Executing task '{task_id}' with agent '{agent_id}' via LangGraph..."
+        )
+
+        final_state = self._invoke_graph(
+            step_index, task, task_id, agent_id, speculative, batch_key
+        )
+        result = final_state["messages"][-1].content
+
+        # Cost tracking
+        output_tokens = len(self.encoding.encode(result))
+        input_tokens = len(self.encoding.encode(task.description))
+        return result, input_tokens, output_tokens
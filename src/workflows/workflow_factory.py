@@ -1,19 +1,36 @@
 # src/pantheon/workflows/workflow_factory.py
+from src.observability.events import EventBus
+from src.workflows.checkpoint_store import CheckpointStore
 from src.workflows.crewai_workflow import CrewAIWorkflow
+from src.workflows.human_in_the_loop import HITLManager
 from src.workflows.langgraph_workflow import LangGraphWorkflow
 
 
 class WorkflowFactory:
     @staticmethod
-    def create_workflow(mission_config: dict, agents: dict, tasks: list, economic_governor, orchestrator_override: str = None):
+    def create_workflow(mission_config: dict, agents: dict, tasks: list,
+                        economic_governor, orchestrator_override: str = None,
+                        checkpoint_store: CheckpointStore = None, run_id: str = None,
+                        hitl_manager: HITLManager = None, event_bus: EventBus = None):
         """
-        Creates a workflow engine instance based on the orchestrator adapter specified in the mission config.
+        Creates a workflow engine instance based on the orchestrator adapter specified
+        in the mission config.
         """
-        orchestrator = orchestrator_override or mission_config.get("orchestrator_adapter", "crewai") # Default to crewai
+        # Default to crewai
+        orchestrator = (
+            orchestrator_override
+            or mission_config.get("orchestrator_adapter", "crewai")
+        )
 
         if orchestrator == "crewai":
-            return CrewAIWorkflow(mission_config, agents, tasks, economic_governor)
+            return CrewAIWorkflow(
+                mission_config, agents, tasks, economic_governor, checkpoint_store,
+                run_id, hitl_manager, event_bus
+            )
         elif orchestrator == "langgraph":
-            return LangGraphWorkflow(mission_config, agents, tasks, economic_governor)
+            return LangGraphWorkflow(
+                mission_config, agents, tasks, economic_governor, checkpoint_store,
+                run_id, hitl_manager, event_bus
+            )
         else:
             raise ValueError(f"Unsupported orchestrator adapter: {orchestrator}")
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+
+# CrewAI reports usage telemetry by default; the tests never leave the machine
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
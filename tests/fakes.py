@@ -0,0 +1,239 @@
+# tests/fakes.py
+import hashlib
+import time
+from typing import Any, Iterator
+
+from crewai import Agent, Crew, Task
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from src import server
+from src.config.config_loader import ConfigLoader
+from src.governance.cost_ledger import CostLedger
+from src.llm_providers.llm_factory import LLMFactory
+from src.main import MissionControl
+from src.workflows.checkpoint_store import CheckpointStore
+
+FINAL_ANSWER = "Thought: I now know the final answer\nFinal Answer: 42"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    A provider chat model answering with scripted responses, word by word when streamed.
+    """
+    model: str = "scripted"
+    responses: list[str] = Field(default_factory=lambda: [FINAL_ANSWER])
+    delay_seconds: float = 0.0
+    error: Exception | None = None
+    usage: dict | None = None # usage_metadata reported with the last chunk
+    requests: list = Field(default_factory=list)
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _next_response(self, messages: list[BaseMessage], kwargs: dict) -> str:
+        self.requests.append({"messages": messages, **kwargs})
+        time.sleep(self.delay_seconds)
+        if self.error is not None:
+            raise self.error
+        return self.responses[min(len(self.requests), len(self.responses)) - 1]
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                  run_manager: CallbackManagerForLLMRun | None = None,
+                  **kwargs: Any) -> ChatResult:
+        text = self._next_response(messages, kwargs)
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(content=text, usage_metadata=self.usage)
+                )
+            ]
+        )
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                run_manager: CallbackManagerForLLMRun | None = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text = self._next_response(messages, kwargs)
+        for index, word in enumerate(text.split(" ")):
+            token = word if index == 0 else f" {word}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        if self.usage:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content="", usage_metadata=self.usage)
+            )
+
+
+def attach_callbacks(model: BaseChatModel, callbacks: list = None) -> BaseChatModel:
+    # Like the provider clients built by LLMFactory._create_provider_llm, which
+    # take the callbacks
+    if callbacks:
+        model.callbacks = callbacks
+    return model
+
+
+def scripted_llm_factory(configs: dict[str, dict],
+                         models: dict[str, BaseChatModel]) -> LLMFactory:
+    """
+    Returns an LLMFactory reading the given provider configs, whose provider chat models
+    are the given fakes (keyed by the configured model name).
+    """
+    llm_factory = LLMFactory()
+    llm_factory.config_loader.load_llm_config = lambda provider_id: dict(
+        configs[provider_id]
+    )
+    llm_factory._create_provider_llm = (
+        lambda config, callbacks=None, **kwargs: attach_callbacks(
+            models[config["model"]], callbacks
+        )
+    )
+    return llm_factory
+
+
+def run_crewai_task(llm, description: str = "What is six times seven?",
+                    agent: Agent = None) -> str:
+    """
+    Runs a one-task crew on a CrewAI agent using the given LLM, as the CrewAI workflow
+    does. A given agent (e.g. one built by the AgentFactory) runs the task with its own
+    LLM.
+    """
+    if agent is None:
+        agent = Agent(
+            role="Analyst", goal="Answer questions", backstory="A careful analyst.",
+            llm=llm, verbose=False
+        )
+    task = Task(description=description, expected_output="A number", agent=agent)
+    return Crew(agents=[agent], tasks=[task], verbose=False).kickoff().raw
+
+
+class WordEmbeddings(Embeddings):
+    """
+    Stands in for the embedding model: a bag of hashed words, so texts sharing
+    words are similar.
+    """
+    dimensions = 64
+
+    def embed_query(self, text: str) -> list[float]:
+        embedding = [0.0] * self.dimensions
+        for word in text.lower().split():
+            index = int(hashlib.sha1(word.encode()).hexdigest(), 16) % self.dimensions
+            embedding[index] += 1.0
+        return embedding
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+class RecordingLearningQueue:
+    """
+    Stands in for the learning queue, which would run the Archivist on a real provider.
+    """
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, *job):
+        self.jobs.append(job)
+
+    def start(self):
+        pass
+
+    def stop(self, timeout: float = None):
+        pass
+
+    def get_pending_count(self) -> int:
+        return len(self.jobs)
+
+
+def scripted_mission(steps: int = 1, budget_usd: float = 1.0,
+                     **mission_overrides) -> dict:
+    """
+    A mission whose steps each ask the analyst one question.
+    """
+    return {
+        "mission_id": "scripted_mission", "agent_definitions": "scripted_team",
+        "orchestrator_adapter": "crewai",
+        "governance": {"economic_governor": {"budget_usd": budget_usd}},
+        "workflow_definition": {
+            "steps": [
+                {"task_id": f"task_{i}", "agent_id": "analyst_01"} for i in range(steps)
+            ]
+        },
+        "task_definitions": [
+            {"id": f"task_{i}", "description": f"Answer question {i}."}
+            for i in range(steps)
+        ],
+        **mission_overrides,
+    }
+
+
+def patch_scripted_provider(monkeypatch, provider: BaseChatModel):
+    """
+    Makes every LLM provider a gpt-5-nano served by the scripted provider model.
+    """
+    monkeypatch.setattr(
+        ConfigLoader, "load_llm_config",
+        lambda self, provider_id: {"provider": "openai", "model": "gpt-5-nano"}
+    )
+    monkeypatch.setattr(
+        LLMFactory, "_create_provider_llm",
+        lambda self, config, callbacks=None, **kwargs: attach_callbacks(
+            provider, callbacks
+        )
+    )
+
+
+def build_mission_control(monkeypatch, tmp_path, mission_config: dict,
+                          provider: BaseChatModel, budgets: dict = None,
+                          **kwargs) -> MissionControl:
+    """
+    Builds a MissionControl for the given mission config, whose agent runs on the
+    scripted provider model (priced as gpt-5-nano) and whose state lives under tmp_path.
+    Fleet budgets are disabled unless given.
+    """
+    agent_definitions = {"agents": [{
+        "id": "analyst_01", "role": "Analyst", "goal": "Answer questions",
+        "backstory": "A careful analyst.", "llm_provider": "openai",
+        "identity": {"permissions": []},
+    }]}
+    monkeypatch.setattr(
+        ConfigLoader, "load_mission_config", lambda self, mission_id: mission_config
+    )
+    monkeypatch.setattr(
+        ConfigLoader, "load_agent_definitions", lambda self, path: agent_definitions
+    )
+    monkeypatch.setattr(
+        ConfigLoader, "load_budgets", lambda self: {"budgets": budgets or {}}
+    )
+    patch_scripted_provider(monkeypatch, provider)
+    kwargs.setdefault(
+        "checkpoint_store", CheckpointStore(str(tmp_path / "checkpoints.db"))
+    )
+    kwargs.setdefault("cost_ledger", CostLedger(str(tmp_path / "cost_ledger.db")))
+    kwargs.setdefault("learning_queue", RecordingLearningQueue())
+    return MissionControl(
+        mission_id=mission_config["mission_id"], llm_provider="openai", **kwargs
+    )
+
+
+def build_mission_server(monkeypatch, tmp_path, **kwargs) -> server.MissionServer:
+    """
+    Builds a MissionServer whose state lives under tmp_path. Its workers
+    are not started.
+    """
+    monkeypatch.setattr(
+        server, "CostLedger", lambda: CostLedger(str(tmp_path / "cost_ledger.db"))
+    )
+    monkeypatch.setattr(server, "get_learning_queue", RecordingLearningQueue)
+    kwargs.setdefault(
+        "checkpoint_store", CheckpointStore(str(tmp_path / "checkpoints.db"))
+    )
+    return server.MissionServer(**kwargs)
@@ -0,0 +1,90 @@
+# tests/test_agent_factory.py
+from itertools import combinations
+
+from src.agents.agent_factory import AgentFactory
+from src.config.config_loader import ConfigLoader
+from src.llm_providers.llm_factory import LLMFactory
+from src.tools.tool_registry import ToolRegistry
+from tests.fakes import ScriptedChatModel, patch_scripted_provider
+
+READ_ONLY_TOOLS = {"siem_log_reader", "siem_log_aggregator", "threat_db_querier"}
+
+
+def test_workflow_agent_ids_follow_the_steps():
+    mission_config = {"workflow_definition": {"steps": [
+        {"task_id": "triage", "agent_id": "log_analyst_01"},
+        {"name": "Approve the plan", "type": "human_in_the_loop"},
+        {"task_id": "plan", "agent_id": "incident_responder_01"},
+        {"task_id": "review", "agent_id": "log_analyst_01"},
+    ]}}
+    assert AgentFactory.get_workflow_agent_ids(mission_config) == [
+        "log_analyst_01", "incident_responder_01"
+    ]
+
+
+def test_only_the_workflow_agents_and_their_tools_are_built(monkeypatch):
+    patch_scripted_provider(monkeypatch, ScriptedChatModel())
+    built_llms = []
+    create_agent_llm = LLMFactory.create_agent_llm
+
+    def record_agent_llm(self, provider_id, **kwargs):
+        built_llms.append(provider_id)
+        return create_agent_llm(self, provider_id, **kwargs)
+
+    monkeypatch.setattr(LLMFactory, "create_agent_llm", record_agent_llm)
+    agent_definitions = ConfigLoader().load_agent_definitions(
+        "cyber_security_team.yaml"
+    )
+    agent_factory = AgentFactory(llm_provider="openai")
+
+    agents = agent_factory.create_agents(
+        agent_definitions, agent_ids=["log_analyst_01"]
+    )
+
+    assert list(agents) == ["log_analyst_01"]
+    assert len(built_llms) == 1
+    # The tools of the unused agents (firewall, isolation, tickets)
+    # were never instantiated
+    assert set(agent_factory.tool_registry.tool_map) == READ_ONLY_TOOLS
+    assert {tool.name for tool in agents["log_analyst_01"].tools} == {
+        agent_factory.tool_registry.get_tool(tool_id).name
+        for tool_id in READ_ONLY_TOOLS
+    }
+
+
+def test_tools_are_built_on_first_use_only(monkeypatch):
+    instances = []
+
+    class CountingTool:
+        def __init__(self):
+            instances.append(self)
+
+    monkeypatch.setattr(
+        ToolRegistry, "TOOL_CLASSES",
+        {"siem_log_reader": CountingTool, "isolate_host": CountingTool}
+    )
+    tool_registry = ToolRegistry()
+    assert tool_registry.has_tool("isolate_host")
+    assert instances == []
+
+    tool = tool_registry.get_tool("siem_log_reader")
+    assert tool_registry.get_tool("siem_log_reader") is tool
+    assert instances == [tool]
+    assert tool_registry.get_tool("unknown_tool") is None
+
+
+def test_permission_index_matches_a_scan_of_the_tool_config():
+    tool_registry = ToolRegistry()
+    tool_definitions = tool_registry.config["tools"]
+    permissions = sorted(
+        {tool_def["permission_required"] for tool_def in tool_definitions}
+        | {"read_network_topology"}
+    )
+
+    for size in range(len(permissions) + 1):
+        for granted in combinations(permissions, size):
+            scanned = [
+                tool_def["id"] for tool_def in tool_definitions
+                if tool_def["permission_required"] in granted
+            ]
+            assert tool_registry.get_tool_ids_for_permissions(set(granted)) == scanned
@@ -0,0 +1,123 @@
+# tests/test_approval_queue.py
+import queue
+import threading
+
+import pytest
+
+from src import approvals
+from src.workflows.approval_queue import APPROVED, ApprovalQueue
+from src.workflows.checkpoint_store import CheckpointStore
+from tests.fakes import build_mission_server
+
+
+@pytest.fixture
+def checkpoint_store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+@pytest.fixture
+def mission_server(monkeypatch, tmp_path, checkpoint_store):
+    return build_mission_server(
+        monkeypatch, tmp_path, workers=1, max_queue=1, checkpoint_store=checkpoint_store
+    )
+
+
+def suspend_run(checkpoint_store: CheckpointStore,
+                approval_queue: ApprovalQueue) -> str:
+    run_id = checkpoint_store.create_run("hunt_suspicious_ip_001", "openai", "crewai")
+    approval_queue.submit(run_id, 1, "Approve the firewall rule", "Deploy the rule?")
+    return run_id
+
+
+def test_decided_approval_is_claimed_once(checkpoint_store):
+    queues = [ApprovalQueue(checkpoint_store.db_path) for _ in range(4)]
+    run_id = suspend_run(checkpoint_store, queues[0])
+    assert queues[0].claim_decided(run_id) == []  # Still pending
+
+    queues[0].decide(run_id, approved=True, decided_by="test")
+    barrier = threading.Barrier(len(queues))
+    claims = []
+
+    def claim(approval_queue: ApprovalQueue):
+        barrier.wait()
+        claims.extend(approval_queue.claim_decided())
+
+    threads = [
+        threading.Thread(target=claim, args=(approval_queue,))
+        for approval_queue in queues
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [(claim["run_id"], claim["status"]) for claim in claims] == [
+        (run_id, APPROVED)
+    ]
+
+
+def test_server_resume_excludes_the_approval_watcher(monkeypatch, mission_server,
+                                                     checkpoint_store):
+    resumed_by_watcher = []
+    monkeypatch.setattr(
+        approvals.MissionControl, "resume",
+        lambda run_id, **kwargs: resumed_by_watcher.append(run_id)
+    )
+    run_id = suspend_run(checkpoint_store, mission_server.approval_queue)
+    mission_server.approval_queue.decide(run_id, approved=True)
+
+    assert mission_server.resume_decided(run_id)
+    assert mission_server._admit_next(timeout=0)["run_id"] == run_id
+    assert approvals.resume_decided_missions(
+        mission_server.approval_queue, checkpoint_store
+    ) == 0
+    assert not mission_server.resume_decided(run_id)
+    assert mission_server.get_health()["queued"] == 0
+    assert resumed_by_watcher == []
+
+
+class ResumedMission:
+    def __init__(self, run_id: str, error: Exception = None):
+        self.run_id = run_id
+        self.error = error
+
+    def run(self):
+        if self.error is not None:
+            raise self.error
+        return "Mission complete."
+
+
+def test_saturated_server_leaves_the_resume_to_the_watcher(monkeypatch, mission_server,
+                                                           checkpoint_store):
+    monkeypatch.setattr(
+        approvals.MissionControl, "resume",
+        lambda run_id, **kwargs: ResumedMission(run_id)
+    )
+    mission_server.submit("hunt_suspicious_ip_001", "openai") # Fills the queue
+    run_id = suspend_run(checkpoint_store, mission_server.approval_queue)
+    mission_server.approval_queue.decide(run_id, approved=False)
+
+    with pytest.raises(queue.Full):
+        mission_server.resume_decided(run_id)
+    assert approvals.resume_decided_missions(
+        mission_server.approval_queue, checkpoint_store
+    ) == 1
+
+
+def test_failed_resume_is_retried_by_the_watcher(monkeypatch, checkpoint_store):
+    approval_queue = ApprovalQueue(checkpoint_store.db_path)
+    run_id = suspend_run(checkpoint_store, approval_queue)
+    approval_queue.decide(run_id, approved=True)
+
+    monkeypatch.setattr(
+        approvals.MissionControl, "resume",
+        lambda run_id, **kwargs: ResumedMission(run_id, RuntimeError("provider down"))
+    )
+    assert approvals.resume_decided_missions(approval_queue, checkpoint_store) == 0
+
+    monkeypatch.setattr(
+        approvals.MissionControl, "resume",
+        lambda run_id, **kwargs: ResumedMission(run_id)
+    )
+    assert approvals.resume_decided_missions(approval_queue, checkpoint_store) == 1
+    assert approvals.resume_decided_missions(approval_queue, checkpoint_store) == 0
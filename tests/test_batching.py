@@ -0,0 +1,133 @@
+# tests/test_batching.py
+import json
+
+import pytest
+
+from src.tasks.batching import (
+    BatchSizer,
+    get_batch_input,
+    parse_batch_output,
+    render_batch_description,
+)
+from tests.fakes import ScriptedChatModel, build_mission_control, scripted_mission
+
+IPS = ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"]
+USAGE = {"input_tokens": 10000, "output_tokens": 20, "total_tokens": 10020}
+
+
+def final_answer(answer: str) -> str:
+    return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+
+def batched_mission(**overrides) -> dict:
+    return scripted_mission(
+        task_definitions=[{
+            "id": "task_0", "description": "Assess the reputation of {ips}."
+        }],
+        mission_inputs={"ips": IPS},
+        workflow_definition={
+            "steps": [{"task_id": "task_0", "agent_id": "analyst_01"}],
+            "batching": {"initial_batch_size": 2, "max_batch_size": 2},
+        },
+        **overrides,
+    )
+
+
+def test_batch_output_is_split_per_item():
+    text = (
+        'Here you go:\n{"10.0.0.1": "benign", "10.0.0.2": '
+        '{"verdict": "malicious"}, "10.0.0.9": "extra"}\nDone.'
+    )
+    assert parse_batch_output(text, IPS[:3]) == {
+        "10.0.0.1": "benign", "10.0.0.2": '{"verdict": "malicious"}'
+    }
+    assert parse_batch_output("No JSON here", IPS) == {}
+    assert parse_batch_output('{"10.0.0.1": "benign", ', IPS) == {} # Truncated
+    assert parse_batch_output('["benign"]', IPS) == {}
+
+
+def test_batch_descriptions_name_their_items():
+    assert (
+        get_batch_input("Assess {ips} for {analyst}.", {"ips": IPS, "analyst": "Ada"})
+        == "ips"
+    )
+    assert get_batch_input("Assess {analyst}.", {"ips": IPS, "analyst": "Ada"}) is None
+    with pytest.raises(ValueError):
+        get_batch_input("Assess {ips} and {hosts}.", {"ips": IPS, "hosts": ["web"]})
+
+    description = render_batch_description(
+        "Assess {ips} for {analyst}.", {"ips": IPS, "analyst": "Ada"}, "ips", IPS[:2]
+    )
+    assert description.startswith("Assess 10.0.0.1, 10.0.0.2 for Ada.")
+    assert json.dumps(IPS[:2]) in description
+
+
+def test_batch_size_adapts_within_the_model_limits():
+    sizer = BatchSizer(
+        context_window_tokens=10000, max_output_tokens=3000, max_batch_size=50,
+        initial_batch_size=4
+    )
+    # Output limit: 3000 / 300
+    assert sizer.get_limit(prompt_tokens=1000, item_tokens=50) == 10
+    assert sizer.next_size(1000, 50) == 4
+    sizer.record(4, 4)
+    assert sizer.next_size(1000, 50) == 6
+    sizer.record(6, 2) # Items missing from the output
+    assert sizer.next_size(1000, 50) == 3
+    small_sizer = BatchSizer(context_window_tokens=1000, max_output_tokens=3000)
+    assert small_sizer.get_limit(900, 50) == 1
+
+
+def test_batched_task_answers_every_item_and_charges_every_call(monkeypatch, tmp_path):
+    provider = ScriptedChatModel(usage=USAGE, responses=[
+        final_answer(json.dumps({"10.0.0.1": "benign", "10.0.0.2": "malicious"})),
+        # 10.0.0.4 is retried on its own
+        final_answer(json.dumps({"10.0.0.3": "benign"})),
+        final_answer("Unknown, no reports found."),
+    ])
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, batched_mission(), provider
+    )
+    mission_control.run()
+
+    assert len(provider.requests) == 3
+    assert mission_control.item_results == {
+        "10.0.0.1": {"task_0": "benign"}, "10.0.0.2": {"task_0": "malicious"},
+        "10.0.0.3": {"task_0": "benign"},
+        "10.0.0.4": {"task_0": "Unknown, no reports found."},
+    }
+    governor = mission_control.economic_governor
+    assert governor.get_total_cost() == pytest.approx(
+        3 * governor._calculate_cost(10000, 20)
+    )
+    assert sum(governor.item_costs.values()) == pytest.approx(governor.get_total_cost())
+
+
+def test_batched_task_stops_between_batches_once_over_budget(monkeypatch, tmp_path):
+    provider = ScriptedChatModel(usage=USAGE, responses=[
+        final_answer(json.dumps({"10.0.0.1": "benign", "10.0.0.2": "malicious"})),
+        final_answer(json.dumps({"10.0.0.3": "benign", "10.0.0.4": "benign"})),
+    ])
+    # One call costs $0.000508 on gpt-5-nano
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, batched_mission(budget_usd=0.0003), provider
+    )
+    events = []
+    mission_control.run(callbacks=[events.append])
+
+    assert len(provider.requests) == 1
+    assert (
+        mission_control.checkpoint_store.get_run(mission_control.run_id)["status"]
+        == "halted"
+    )
+    assert mission_control.item_results == {
+        "10.0.0.1": {"task_0": "benign"}, "10.0.0.2": {"task_0": "malicious"}
+    }
+    assert (
+        [event.data["reason"] for event in events if event.type == "mission_halted"]
+        == ["budget exceeded after 2 of 4 ips value(s)"]
+    )
+    governor = mission_control.economic_governor
+    assert governor.get_total_cost() == pytest.approx(
+        governor._calculate_cost(10000, 20)
+    )
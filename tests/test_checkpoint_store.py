@@ -0,0 +1,113 @@
+# tests/test_checkpoint_store.py
+import sqlite3
+
+import pytest
+
+from src.workflows.approval_queue import ApprovalQueue
+from src.workflows.checkpoint_store import CheckpointStore
+from tests.fakes import ScriptedChatModel, build_mission_control, scripted_mission
+
+CACHED_USAGE = {
+    "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+    "input_token_details": {"cache_read": 800},
+}
+
+
+def test_speculative_steps_keep_their_cached_input_tokens(tmp_path):
+    db_path = str(tmp_path / "checkpoints.db")
+    # A store created before prompt caching was tracked
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE speculative_steps (run_id TEXT NOT NULL, step_index "
+        "INTEGER NOT NULL, agent_id TEXT, result TEXT, input_tokens INTEGER "
+        "NOT NULL DEFAULT 0, output_tokens INTEGER NOT NULL DEFAULT 0, "
+        "created_at REAL NOT NULL, PRIMARY KEY (run_id, step_index))"
+    )
+    conn.execute(
+        "INSERT INTO speculative_steps VALUES ('old_run', "
+        "2, 'analyst_01', 'old result', 100, 5, 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    checkpoint_store = CheckpointStore(db_path)
+    assert (
+        checkpoint_store.pop_speculative_step("old_run", 2)["cached_input_tokens"] == 0
+    )
+
+    checkpoint_store.save_speculative_step(
+        "run_1", 2, "analyst_01", "42", 1000, 10, 800
+    )
+    stored = checkpoint_store.pop_speculative_step("run_1", 2)
+    assert (
+        stored["result"], stored["input_tokens"], stored["output_tokens"],
+        stored["cached_input_tokens"]
+    ) == ("42", 1000, 10, 800)
+    assert checkpoint_store.pop_speculative_step("run_1", 2) is None
+
+
+def test_resumed_run_commits_the_stored_speculation_at_its_cached_price(monkeypatch,
+                                                                        tmp_path):
+    mission_config = scripted_mission(steps=2)
+    steps = mission_config["workflow_definition"]["steps"]
+    steps.insert(
+        1, {"type": "human_approval", "name": "approve_answer", "prompt": "Go on?"}
+    )
+    mission_config["workflow_definition"]["speculative_execution"] = True
+    provider = ScriptedChatModel(usage=CACHED_USAGE)
+
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, mission_config, provider, approval_mode="queue"
+    )
+    mission_control.run()
+    # The speculative step outlives the run
+    mission_control.workflow._speculation_executor.shutdown(wait=True)
+    checkpoint_store = mission_control.checkpoint_store
+    assert checkpoint_store.get_run(mission_control.run_id)["status"] == "suspended"
+    assert set(checkpoint_store.load_steps(mission_control.run_id)) == {0}
+    assert len(provider.requests) == 2 # The step after the approval ran speculatively
+
+    ApprovalQueue(checkpoint_store.db_path).decide(
+        mission_control.run_id, approved=True
+    )
+    resumed = build_mission_control(
+        monkeypatch, tmp_path, mission_config, provider, approval_mode="queue",
+        run_id=mission_control.run_id, checkpoint_store=checkpoint_store,
+    )
+    resumed.run()
+
+    assert checkpoint_store.get_run(resumed.run_id)["status"] == "completed"
+    assert set(checkpoint_store.load_steps(resumed.run_id)) == {0, 1, 2}
+    assert len(provider.requests) == 2
+    # The first step's usage is restored from its checkpoint, the speculated one is
+    # charged on commit
+    governor = resumed.economic_governor
+    assert governor.cached_input_tokens == 1600
+    assert governor.get_total_cost() == pytest.approx(
+        2 * governor._calculate_cost(1000, 10, 800)
+    )
+
+
+def test_run_suspends_without_waiting_for_the_speculative_step(monkeypatch, tmp_path):
+    mission_config = scripted_mission(steps=2)
+    steps = mission_config["workflow_definition"]["steps"]
+    steps.insert(
+        1, {"type": "human_approval", "name": "approve_answer", "prompt": "Go on?"}
+    )
+    mission_config["workflow_definition"]["speculative_execution"] = True
+    provider = ScriptedChatModel(delay_seconds=0.5)
+
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, mission_config, provider, approval_mode="queue"
+    )
+    mission_control.run()
+    checkpoint_store = mission_control.checkpoint_store
+    assert checkpoint_store.get_run(mission_control.run_id)["status"] == "suspended"
+    # Still running
+    assert checkpoint_store.pop_speculative_step(mission_control.run_id, 2) is None
+
+    mission_control.workflow._speculation_executor.shutdown(wait=True)
+    assert (
+        checkpoint_store.pop_speculative_step(mission_control.run_id, 2)["result"]
+        == "42"
+    )
@@ -0,0 +1,94 @@
+# tests/test_cost_ledger.py
+import threading
+
+from src.governance.cost_ledger import CostLedger, utc_day
+from src.governance.economic_governor import EconomicGovernor
+from tests.fakes import ScriptedChatModel, build_mission_control, scripted_mission
+
+SCRIPTED_USAGE = {"input_tokens": 100000, "output_tokens": 1000, "total_tokens": 101000}
+
+
+def record(ledger: CostLedger, cost_usd: float, run_id: str = "run-1",
+           budgets: dict = None) -> dict:
+    return ledger.record(
+        run_id, "hunt", "hunt", "cyber_team", "analyst_01", "agent", "openai",
+        "gpt-5-nano", 100, 10, cost_usd, budgets=budgets,
+    )
+
+
+def test_record_reports_a_budget_once_its_total_reaches_the_limit(tmp_path):
+    ledger = CostLedger(str(tmp_path / "ledger.db"))
+    assert record(ledger, 0.5, budgets={"team": 1.0}) == {}
+    # Reaching the limit exactly exhausts it, as for the governors
+    assert record(ledger, 0.5, budgets={"team": 1.0}) == {"team": 1.0}
+
+
+def test_concurrent_records_keep_exact_totals(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    ledgers = [CostLedger(db_path) for _ in range(4)] # One connection per "process"
+    results = []
+
+    def spend(ledger: CostLedger):
+        for _ in range(25):
+            results.append(record(ledger, 0.01, budgets={"day": 0.5}))
+
+    threads = [threading.Thread(target=spend, args=(ledger,)) for ledger in ledgers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    scope_keys = CostLedger.scope_keys("run-1", "hunt", "cyber_team", utc_day())
+    totals = ledgers[0].get_totals({"day": scope_keys["day"], "run": scope_keys["run"]})
+    assert round(totals["day"], 6) == 1.0 and round(totals["run"], 6) == 1.0
+    # Every record from the one that reached the limit on reports it
+    assert sum(1 for exceeded in results if exceeded) == 51
+
+
+def test_aggregate_groups_costs(tmp_path):
+    ledger = CostLedger(str(tmp_path / "ledger.db"))
+    record(ledger, 0.25, run_id="run-1")
+    record(ledger, 0.75, run_id="run-2")
+    rows = ledger.aggregate(["run_id"])
+    assert [(row["run_id"], row["cost_usd"]) for row in rows] == [
+        ("run-2", 0.75), ("run-1", 0.25)
+    ]
+
+
+def test_governor_halts_on_the_ledger_verdict(tmp_path, monkeypatch):
+    ledger = CostLedger(str(tmp_path / "ledger.db"))
+    governor = EconomicGovernor(
+        {"mission_id": "hunt", "agent_definitions": "cyber_team"}, "openai",
+        "gpt-5-nano", cost_ledger=ledger, run_id="run-1",
+    )
+    governor.fleet_budgets = {"mission_type": None, "team": 0.001, "day": None}
+    guard = governor.as_budget_guard()
+    assert not governor.is_budget_exceeded() and guard("analyst_01", "", 1) is None
+
+    governor.track_cost("analyst_01", 10000, 1000) # $0.0009
+    governor.track_cost("analyst_01", 10000, 1000) # Takes the team over its budget
+    assert governor.exceeded_fleet_budgets == {"team": governor.fleet_totals["team"]}
+    # Without re-reading the shared totals
+    monkeypatch.setattr(
+        ledger, "get_totals", lambda scope_keys: {scope: 0.0 for scope in scope_keys}
+    )
+    assert governor.is_budget_exceeded()
+    assert "team budget" in guard("analyst_01", "", 1)
+
+
+def test_mission_stops_once_its_cost_exhausts_a_fleet_budget(monkeypatch, tmp_path):
+    provider = ScriptedChatModel(usage=SCRIPTED_USAGE)
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, scripted_mission(steps=3), provider,
+        budgets={"day": 0.001}
+    )
+
+    events = list(mission_control.stream())
+
+    # The first step costs $0.0054, so the second one is never started
+    assert len(provider.requests) == 1
+    assert (
+        [event.data["reason"] for event in events if event.type == "mission_halted"]
+        == ["budget exceeded"]
+    )
+    assert events[-1].data["status"] == "halted"
@@ -0,0 +1,135 @@
+# tests/test_learning_queue.py
+import threading
+
+import pytest
+
+from src.governance.cost_ledger import CostLedger
+from src.memory import learning_queue as learning_queue_module
+from src.memory.learning_queue import LearningQueue
+
+
+def get_jobs(learning_queue: LearningQueue) -> list[dict]:
+    rows = learning_queue._conn.execute(
+        "SELECT * FROM learning_jobs ORDER BY job_id"
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def build_learning_queue(tmp_path, **kwargs) -> LearningQueue:
+    kwargs.setdefault("cost_ledger", CostLedger(str(tmp_path / "cost_ledger.db")))
+    return LearningQueue(str(tmp_path / "learning_queue.db"), **kwargs)
+
+
+def test_jobs_are_durable_and_leased_once(tmp_path):
+    learning_queue = build_learning_queue(tmp_path, lease_seconds=60)
+    learning_queue.start = lambda: None # No worker: the jobs stay queued
+    learning_queue.enqueue(
+        "run_1", "hunt_suspicious_ip_001", "openai", "crewai", "Blocked 10.0.0.5."
+    )
+
+    # Another process on the same database finds the job, and only one of them claims it
+    other_queue = build_learning_queue(tmp_path, lease_seconds=60)
+    assert other_queue.get_pending_count() == 1
+    claimed = other_queue._claim_batch()
+    assert [(job["run_id"], job["attempts"]) for job in claimed] == [("run_1", 1)]
+    assert learning_queue._claim_batch() == []
+
+    # A job whose worker died is claimed again once its lease expires
+    with learning_queue._conn:
+        learning_queue._conn.execute("UPDATE learning_jobs SET leased_until = 0")
+    assert [job["attempts"] for job in learning_queue._claim_batch()] == [2]
+
+
+def test_failed_extractions_are_retried_until_out_of_attempts(tmp_path):
+    learning_queue = build_learning_queue(tmp_path, max_attempts=2)
+    learning_queue.start = lambda: None
+    committed = []
+    learning_queue._commit_lessons = committed.extend
+
+    def extract_lesson(job: dict) -> str:
+        if job["run_id"] == "run_2":
+            raise RuntimeError("provider down")
+        return f"Lesson of {job['run_id']}."
+
+    learning_queue._extract_lesson = extract_lesson
+    for run_id in ("run_1", "run_2"):
+        learning_queue.enqueue(
+            run_id, "hunt_suspicious_ip_001", "openai", "crewai", "Blocked 10.0.0.5."
+        )
+
+    learning_queue._process_batch(learning_queue._claim_batch())
+    assert [(job["run_id"], lesson) for job, lesson in committed] == [
+        ("run_1", "Lesson of run_1.")
+    ]
+    assert [(job["status"], job["error"]) for job in get_jobs(learning_queue)] == [
+        ("done", None), ("pending", "provider down")
+    ]
+
+    learning_queue._process_batch(learning_queue._claim_batch())
+    assert [job["status"] for job in get_jobs(learning_queue)] == ["done", "failed"]
+    assert learning_queue.get_pending_count() == 0
+
+
+def test_worker_commits_concurrent_missions_in_one_batch(tmp_path):
+    learning_queue = build_learning_queue(tmp_path, batch_window_seconds=0.2)
+    batches = []
+    learning_queue._extract_lesson = lambda job: f"Lesson of {job['run_id']}."
+    learning_queue._commit_lessons = lambda learned: batches.append([
+        lesson for _, lesson in learned
+    ])
+
+    threads = [
+        threading.Thread(
+            target=learning_queue.enqueue,
+            args=(f"run_{i}", "hunt_suspicious_ip_001", "openai", "crewai", "Done.")
+        )
+        for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert learning_queue.drain(timeout=10)
+    finally:
+        learning_queue.stop(timeout=5)
+    assert [sorted(batch) for batch in batches] == [[
+        "Lesson of run_0.", "Lesson of run_1.", "Lesson of run_2."
+    ]]
+
+
+def test_lessons_are_charged_through_one_ledger_and_governor(tmp_path, monkeypatch):
+    class Archivist:
+        def invoke(self, inputs: dict) -> dict:
+            return {"output": "Block the IP at the edge."}
+
+    learning_queue = build_learning_queue(tmp_path)
+    learning_queue._get_archivist = lambda llm_provider: (
+        {"id": "archivist_01"}, Archivist()
+    )
+    monkeypatch.setattr(
+        learning_queue_module, "CostLedger",
+        lambda: pytest.fail("A job opened its own ledger.")
+    )
+    governors = []
+    economic_governor_class = learning_queue_module.EconomicGovernor
+
+    def build_governor(**kwargs):
+        governors.append(economic_governor_class(**kwargs))
+        return governors[-1]
+
+    monkeypatch.setattr(learning_queue_module, "EconomicGovernor", build_governor)
+
+    for run_id in ("run_1", "run_2"):
+        job = {
+            "run_id": run_id, "mission_id": "hunt_suspicious_ip_001",
+            "llm_provider": "openai", "orchestrator": "langgraph",
+            "final_result": "Blocked 10.0.0.5."
+        }
+        assert learning_queue._extract_lesson(job) == "Block the IP at the edge."
+
+    assert len(governors) == 1
+    rows = learning_queue.cost_ledger.aggregate(["run_id", "agent_id"])
+    assert sorted((row["run_id"], row["agent_id"]) for row in rows) == [
+        ("run_1", "archivist_01"), ("run_2", "archivist_01")
+    ]
@@ -0,0 +1,123 @@
+# tests/test_policy_engine.py
+import threading
+
+import pytest
+
+from src.agents.agent_factory import AgentFactory
+from src.config.config_loader import ConfigLoader
+from src.identity.policy_engine import PolicyEngine
+from tests.fakes import ScriptedChatModel, patch_scripted_provider
+
+AGENT_DEFINITIONS = {
+    "roles": [
+        {"id": "reader", "permissions": ["read_*"]},
+        {"id": "responder", "inherits": ["reader"], "permissions": [
+            "create_ticket",
+            {
+                "permission": "isolate_host",
+                "conditions": {"host_ip": {"cidr": ["10.0.0.0/8"]}}
+            },
+        ]},
+    ],
+    "agents": [
+        {
+            "id": "analyst",
+            "identity": {"permissions": ["query_threat_database"], "roles": ["reader"]}
+        },
+        {"id": "responder", "identity": {"roles": ["responder"]}},
+    ],
+}
+KNOWN_PERMISSIONS = [
+    "read_siem_logs", "query_threat_database", "create_ticket", "isolate_host"
+]
+
+
+@pytest.fixture
+def policy_engine():
+    return PolicyEngine(AGENT_DEFINITIONS, known_permissions=KNOWN_PERMISSIONS)
+
+
+def test_grants_are_compiled_into_bitsets(policy_engine):
+    analyst = policy_engine.agent_ids["analyst"]
+    responder = policy_engine.agent_ids["responder"]
+    read_siem_logs = 1 << policy_engine.permission_ids["read_siem_logs"]
+    query_threat_database = 1 << policy_engine.permission_ids["query_threat_database"]
+    create_ticket = 1 << policy_engine.permission_ids["create_ticket"]
+
+    assert policy_engine._grant_bits[analyst] == read_siem_logs | query_threat_database
+    # Conditional grants are kept out of the bitset
+    assert policy_engine._grant_bits[responder] == read_siem_logs | create_ticket
+    assert policy_engine.get_permissions("responder") == {
+        "read_siem_logs", "create_ticket", "isolate_host"
+    }
+    assert policy_engine.get_permissions("nobody") == set()
+
+
+def test_calls_are_authorized_by_grant_wildcard_and_condition(policy_engine):
+    assert policy_engine.authorize("analyst", "query_threat_database")
+    assert not policy_engine.authorize("analyst", "create_ticket")
+    assert not policy_engine.authorize("nobody", "read_siem_logs")
+    # Wildcard grants cover permissions first seen after compilation
+    assert policy_engine.authorize("responder", "read_network_topology")
+    assert not policy_engine.authorize("responder", "write_network_topology")
+
+    assert policy_engine.authorize("responder", "isolate_host", {"host_ip": "10.1.2.3"})
+    assert not policy_engine.authorize(
+        "responder", "isolate_host", {"host_ip": "203.0.113.9"}
+    )
+    assert not policy_engine.authorize("responder", "isolate_host", {})
+    assert policy_engine.is_granted("responder", "isolate_host")
+
+    stats = policy_engine.get_stats()
+    assert (stats["allowed"], stats["denied"]) == (3, 5)
+    assert stats["denied_by_agent_permission"]["responder:isolate_host"] == 2
+
+
+def test_invalid_roles_are_rejected():
+    with pytest.raises(ValueError, match="Unknown role 'auditor'"):
+        PolicyEngine({
+            "agents": [{"id": "analyst", "identity": {"roles": ["auditor"]}}]
+        })
+    with pytest.raises(ValueError, match="cycle"):
+        PolicyEngine({
+            "roles": [{"id": "a", "inherits": ["b"]}, {"id": "b", "inherits": ["a"]}],
+            "agents": [{"id": "analyst", "identity": {"roles": ["a"]}}],
+        })
+
+
+def test_decisions_are_counted_exactly_across_threads(policy_engine):
+    allowed_ids = policy_engine.intern("analyst", "read_siem_logs")
+    denied_ids = policy_engine.intern("analyst", "create_ticket")
+    barrier = threading.Barrier(8)
+
+    def authorize():
+        barrier.wait()
+        for _ in range(2000):
+            policy_engine.authorize_ids(*allowed_ids)
+            policy_engine.authorize_ids(*denied_ids)
+
+    threads = [threading.Thread(target=authorize) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = policy_engine.get_stats()
+    assert (stats["allowed"], stats["denied"]) == (16000, 16000)
+
+
+def test_single_agent_is_built_with_the_roles_of_its_file(monkeypatch):
+    patch_scripted_provider(monkeypatch, ScriptedChatModel())
+    agent_definitions = ConfigLoader().load_agent_definitions(
+        "cyber_security_team.yaml"
+    )
+    agent_config = next(
+        agent for agent in agent_definitions["agents"]
+        if agent["id"] == "incident_responder_01"
+    )
+
+    agent = AgentFactory(llm_provider="openai").create_agent(
+        agent_config, roles=agent_definitions["roles"]
+    )
+    tool_names = {tool.name for tool in agent._crewai_agent.tools}
+    assert {"Firewall Rule Proposer", "Isolate Host", "Create Ticket"} <= tool_names
+    assert not agent.side_effect_free
@@ -0,0 +1,107 @@
+# tests/test_prompt_cache.py
+import pytest
+from langchain_core.messages import SystemMessage
+
+from src.agents.agent_factory import AgentFactory
+from src.llm_providers.llm_factory import LLMFactory
+from src.llm_providers.prompt_cache import build_prompt_prefix, get_prompt_cache_key
+from src.tools.tool_registry import ToolRegistry
+from tests.fakes import (
+    FINAL_ANSWER,
+    ScriptedChatModel,
+    build_mission_control,
+    patch_scripted_provider,
+    run_crewai_task,
+    scripted_mission,
+)
+
+CACHED_USAGE = {
+    "input_tokens": 1000, "output_tokens": 10, "total_tokens": 1010,
+    "input_token_details": {"cache_read": 800},
+}
+
+
+def test_prompt_prefix_is_deterministic_and_keyed_by_content():
+    tool_registry = ToolRegistry()
+    tools = [
+        tool_registry.get_tool("siem_log_aggregator"),
+        tool_registry.get_tool("threat_db_querier")
+    ]
+    prefix = build_prompt_prefix(
+        "Analyst", "Answer questions", "A careful analyst.", tools
+    )
+    assert prefix == build_prompt_prefix(
+        "Analyst", "Answer questions", "A careful analyst.", list(reversed(tools))
+    )
+    assert get_prompt_cache_key("analyst_01", prefix) == get_prompt_cache_key(
+        "analyst_01", prefix
+    )
+    assert get_prompt_cache_key("analyst_01", prefix) != get_prompt_cache_key(
+        "analyst_01", prefix + " "
+    )
+
+
+def test_openai_client_is_keyed_and_reports_streamed_usage(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    llm = LLMFactory()._create_provider_llm(
+        {"provider": "openai", "model": "gpt-5-nano"}, prompt_cache_key="key-1"
+    )
+    assert llm.extra_body == {"prompt_cache_key": "key-1"}
+    assert llm.stream_usage
+
+
+@pytest.mark.parametrize(
+    "permissions", [[], ["read_siem_logs", "query_threat_database"]]
+)
+def test_every_agent_prompt_starts_with_the_prompt_prefix(monkeypatch, permissions):
+    provider = ScriptedChatModel(responses=[FINAL_ANSWER])
+    patch_scripted_provider(monkeypatch, provider)
+    agent = AgentFactory(llm_provider="openai").create_agent({
+        "id": "analyst_01", "role": "Analyst", "goal": "Answer questions",
+        "backstory": "A careful analyst.", "llm_provider": "openai",
+        "identity": {"permissions": permissions},
+    })
+
+    for question in ("First question?", "Second question?"):
+        run_crewai_task(agent._crewai_agent.llm, question, agent=agent._crewai_agent)
+
+    system_prompts = [request["messages"][0] for request in provider.requests]
+    assert all(isinstance(message, SystemMessage) for message in system_prompts)
+    assert all(
+        message.content.startswith(agent.prompt_prefix) for message in system_prompts
+    )
+    # The prefix takes the place of CrewAI's persona and tool listing rather
+    # than repeating them
+    for message in system_prompts:
+        assert message.content.count("Analyst") == 1
+        assert message.content.count("A careful analyst.") == 1
+        assert message.content.count("Answer questions") == 1
+        for tool in agent._crewai_agent.tools:
+            assert message.content.count(tool.description) == 1
+        # The tools are listed under the names the agent's actions refer to
+        if permissions:
+            assert '"name":"siem_log_reader"' in message.content
+            assert "only one name of [siem_log_reader" in message.content
+
+
+def test_cached_input_tokens_are_reported_and_priced(monkeypatch, tmp_path):
+    provider = ScriptedChatModel(usage=CACHED_USAGE)
+    mission_control = build_mission_control(
+        monkeypatch, tmp_path, scripted_mission(), provider
+    )
+
+    events = list(mission_control.stream())
+
+    usage_events = [event for event in events if event.type == "llm_usage"]
+    assert [event.data for event in usage_events] == [
+        {"input_tokens": 1000, "cached_input_tokens": 800, "output_tokens": 10}
+    ]
+    governor = mission_control.economic_governor
+    assert governor.cached_input_tokens == 800
+    # gpt-5-nano: $0.05 per million input tokens, $0.005 cached, $0.40 output
+    assert governor.agent_costs["analyst_01"] == pytest.approx(
+        (200 * 0.05 + 800 * 0.005 + 10 * 0.40) / 1_000_000
+    )
+    crewai_llm = mission_control.agents["analyst_01"]._crewai_agent.llm
+    llm_usage = crewai_llm.get_token_usage_summary()
+    assert llm_usage.cached_prompt_tokens == 800
@@ -0,0 +1,99 @@
+# tests/test_rate_limiter.py
+import pytest
+
+from src.llm_providers import llm_factory as llm_factory_module
+from src.llm_providers.crewai_llm import CrewAILLMAdapter
+from src.llm_providers.rate_limiter import (
+    TokenBucketLimiter,
+    compute_backoff,
+    get_retry_after,
+)
+from tests.fakes import ScriptedChatModel, run_crewai_task, scripted_llm_factory
+
+
+def get_allowances(limiter: TokenBucketLimiter) -> tuple[float, float]:
+    return limiter._conn.execute(
+        "SELECT request_allowance, token_allowance "
+        "FROM rate_limit_buckets WHERE key = ?",
+        (limiter.key,)
+    ).fetchone()
+
+
+def test_bucket_admits_requests_until_empty(tmp_path):
+    limiter = TokenBucketLimiter(
+        "openai/gpt", requests_per_minute=2, db_path=str(tmp_path / "rl.db")
+    )
+    assert limiter._try_acquire(0) == 0
+    assert limiter._try_acquire(0) == 0
+    # The third request waits for the refill of one request at 2 per minute
+    assert limiter._try_acquire(0) == pytest.approx(30, abs=1)
+
+
+def test_bucket_meters_tokens(tmp_path):
+    limiter = TokenBucketLimiter(
+        "openai/gpt", tokens_per_minute=1000, db_path=str(tmp_path / "rl.db")
+    )
+    assert limiter._try_acquire(800) == 0
+    assert limiter._try_acquire(800) > 0
+    # Requests reporting less usage than estimated give the difference back
+    limiter.reconcile(800, 100)
+    assert limiter._try_acquire(800) == 0
+
+
+def test_bucket_is_shared_through_the_database(tmp_path):
+    db_path = str(tmp_path / "rl.db")
+    first = TokenBucketLimiter("openai/gpt", requests_per_minute=1, db_path=db_path)
+    second = TokenBucketLimiter("openai/gpt", requests_per_minute=1, db_path=db_path)
+    assert first._try_acquire(0) == 0
+    assert second._try_acquire(0) > 0
+
+
+def test_penalize_blocks_until_retry_after(tmp_path):
+    limiter = TokenBucketLimiter(
+        "openai/gpt", requests_per_minute=100, db_path=str(tmp_path / "rl.db")
+    )
+    limiter.penalize(retry_after=20)
+    assert limiter._try_acquire(0) == pytest.approx(20, abs=1)
+
+
+def test_backoff_honours_retry_after():
+    class RateLimitError(Exception):
+        retry_after = 7.0
+
+    assert get_retry_after(RateLimitError()) == 7.0
+    assert compute_backoff(0, 1.0, 60.0, retry_after=7.0) >= 7.0
+    assert compute_backoff(10, 1.0, 60.0) <= 60.0
+
+
+def test_agent_call_consumes_the_bucket(tmp_path, monkeypatch):
+    limiters = []
+
+    def get_rate_limiter(provider_id, model, rate_limits):
+        limiters.append(TokenBucketLimiter(
+            f"{provider_id}/{model}",
+            requests_per_minute=rate_limits["requests_per_minute"],
+            tokens_per_minute=rate_limits["tokens_per_minute"],
+            db_path=str(tmp_path / "rl.db"),
+        ))
+        return limiters[-1]
+
+    monkeypatch.setattr(llm_factory_module, "get_rate_limiter", get_rate_limiter)
+    provider = ScriptedChatModel(model="gpt-test")
+    llm_factory = scripted_llm_factory(
+        {
+            "openai": {
+                "provider": "openai", "model": "gpt-test",
+                "rate_limits": {"requests_per_minute": 10, "tokens_per_minute": 100000}
+            }
+        },
+        {"gpt-test": provider},
+    )
+    llm = llm_factory.create_agent_llm("openai")
+    assert isinstance(llm, CrewAILLMAdapter)
+    assert llm.model == "gpt-test"
+
+    assert run_crewai_task(llm) == "42"
+    assert len(provider.requests) == 1
+    request_allowance, token_allowance = get_allowances(limiters[0])
+    assert request_allowance < 9.5
+    assert token_allowance < 100000
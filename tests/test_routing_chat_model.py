@@ -0,0 +1,84 @@
+# tests/test_routing_chat_model.py
+from types import SimpleNamespace
+
+from src.governance.economic_governor import EconomicGovernor
+from src.main import MissionControl
+from src.observability.events import EventBus
+from src.observability.streaming import StreamingCallbackHandler
+from tests.fakes import ScriptedChatModel, run_crewai_task, scripted_llm_factory
+
+
+def router_config(primary_model: str, secondary_model: str, **overrides) -> dict:
+    # The routes are priced as Gemini and
+    # OpenAI (see config/llm_providers/llm_costs.yaml)
+    return {
+        "google_gemini": {"provider": "google_vertex_ai", "model": primary_model},
+        "openai": {"provider": "openai", "model": secondary_model},
+        "router": {
+            "provider": "router", "routes": ["google_gemini", "openai"],
+            "hedging": {
+                "enabled": True, "min_samples": 1000, "initial_delay_seconds": 0.2
+            },
+            **overrides,
+        },
+    }
+
+
+def collect_events(event_bus: EventBus) -> list:
+    events = []
+    event_bus.subscribe(events.append)
+    return events
+
+
+def test_slow_primary_is_hedged_and_the_duplicate_is_charged():
+    slow = ScriptedChatModel(model="gemini-2.5-flash-lite", delay_seconds=2.0)
+    fast = ScriptedChatModel(model="gpt-5-nano")
+    llm_factory = scripted_llm_factory(
+        router_config("gemini-2.5-flash-lite", "gpt-5-nano"),
+        {"gemini-2.5-flash-lite": slow, "gpt-5-nano": fast}
+    )
+
+    event_bus = EventBus("run-1")
+    events = collect_events(event_bus)
+    governor = EconomicGovernor(
+        {"mission_id": "m"}, "google_gemini", "gemini-2.5-flash-lite"
+    )
+    mission_control = SimpleNamespace(economic_governor=governor)
+    event_bus.subscribe(
+        lambda event: MissionControl._track_hedge_cost(mission_control, event)
+    )
+
+    llm = llm_factory.create_agent_llm(
+        "router", callbacks=[StreamingCallbackHandler(event_bus, "analyst")]
+    )
+    assert llm.model == "gemini-2.5-flash-lite"
+    assert run_crewai_task(llm) == "42"
+
+    assert len(slow.requests) == 1 and len(fast.requests) == 1
+    hedges = [event for event in events if event.type == "llm_hedge"]
+    assert [(event.data["provider_id"], event.data["model"]) for event in hedges] == [
+        ("google_gemini", "gemini-2.5-flash-lite")
+    ]
+    assert governor.hedge_costs["analyst"] > 0
+
+
+def test_failed_route_fails_over_and_opens_its_circuit():
+    failing = ScriptedChatModel(
+        model="flaky-model", error=RuntimeError("provider down")
+    )
+    backup = ScriptedChatModel(model="backup-model")
+    llm_factory = scripted_llm_factory(
+        router_config(
+            "flaky-model", "backup-model",
+            circuit_breaker={"failure_threshold": 1, "recovery_seconds": 600}
+        ),
+        {"flaky-model": failing, "backup-model": backup},
+    )
+    llm = llm_factory.create_agent_llm("router")
+
+    assert run_crewai_task(llm) == "42"
+    assert len(failing.requests) == 1 and len(backup.requests) == 1
+
+    # The open circuit sends the next call straight to the backup
+    assert run_crewai_task(llm) == "42"
+    assert len(failing.requests) == 1 and len(backup.requests) == 2
@@ -0,0 +1,56 @@
+# tests/test_semantic_cache.py
+import pytest
+
+from src.memory import semantic_cache as semantic_cache_module
+from src.memory.semantic_cache import SemanticCache, get_cache_query
+from tests.fakes import WordEmbeddings
+
+NAMESPACE = "analyst_01/triage_ip"
+
+
+@pytest.fixture
+def db_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(semantic_cache_module, "get_embedding_model", WordEmbeddings)
+    return str(tmp_path / "semantic_cache.db")
+
+
+def test_similar_queries_are_served_from_their_namespace(db_path):
+    cache = SemanticCache(db_path)
+    query = get_cache_query(
+        "analyst_01", "Triage the alerts of IP 10.0.0.5 and report its reputation."
+    )
+    cache.store(NAMESPACE, query, "10.0.0.5 is benign.", ttl_seconds=60)
+
+    result, similarity = cache.lookup(NAMESPACE, query, similarity_threshold=0.9)
+    assert result == "10.0.0.5 is benign."
+    assert similarity == pytest.approx(1.0, abs=1e-5)
+    assert (
+        cache.lookup("responder_01/triage_ip", query, similarity_threshold=0.9) is None
+    )
+    unrelated = get_cache_query("analyst_01", "Draft a firewall rule.")
+    assert cache.lookup(NAMESPACE, unrelated, similarity_threshold=0.9) is None
+
+    cache.record_rejection(NAMESPACE)
+    stats = cache.get_stats(NAMESPACE)
+    assert (
+        stats["lookups"], stats["hits"], stats["misses"], stats["rejections"],
+        stats["stores"]
+    ) == (2, 1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.0 # The only hit was rejected by the verifier
+
+
+def test_expired_entries_are_not_served(db_path):
+    cache = SemanticCache(db_path)
+    cache.store(NAMESPACE, "triage 10.0.0.5", "benign", ttl_seconds=-1)
+    assert cache.lookup(NAMESPACE, "triage 10.0.0.5", similarity_threshold=0.5) is None
+
+
+def test_entries_stored_by_another_process_are_picked_up(db_path):
+    reader, writer = SemanticCache(db_path), SemanticCache(db_path)
+    assert reader.lookup(NAMESPACE, "triage 10.0.0.5", similarity_threshold=0.9) is None
+
+    writer.store(NAMESPACE, "triage 10.0.0.5", "benign", ttl_seconds=60)
+    assert (
+        reader.lookup(NAMESPACE, "triage 10.0.0.5", similarity_threshold=0.9)[0]
+        == "benign"
+    )
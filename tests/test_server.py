@@ -0,0 +1,110 @@
+# tests/test_server.py
+import queue
+import threading
+import time
+
+import pytest
+
+from tests.fakes import build_mission_server
+
+
+def test_busy_provider_does_not_hold_up_the_others(monkeypatch, tmp_path):
+    mission_server = build_mission_server(
+        monkeypatch, tmp_path, workers=2, provider_limits={"slow_provider": 1},
+        default_provider_limit=2
+    )
+    release_slow = threading.Event()
+    fast_done = threading.Event()
+    started = []
+
+    def run_job(job):
+        started.append(job["run_id"])
+        if job["llm_provider"] == "slow_provider":
+            release_slow.wait(10)
+        else:
+            fast_done.set()
+
+    monkeypatch.setattr(mission_server, "_run_job", run_job)
+    for run_id, llm_provider in (
+        ("slow_1", "slow_provider"), ("slow_2", "slow_provider"),
+        ("fast_1", "fast_provider")
+    ):
+        mission_server._enqueue(
+            run_id, "hunt_suspicious_ip_001", llm_provider, "crewai"
+        )
+
+    mission_server.start()
+    try:
+        # The second worker skips the queued slow mission, which would wait for the
+        # provider's only slot
+        assert fast_done.wait(5)
+        assert started == ["slow_1", "fast_1"]
+        assert mission_server.get_health()["queued_by_provider"] == {"slow_provider": 1}
+        release_slow.set()
+        for _ in range(50):
+            if len(started) == 3:
+                break
+            time.sleep(0.1)
+        assert started == ["slow_1", "fast_1", "slow_2"]
+    finally:
+        release_slow.set()
+        mission_server.stop()
+
+
+def test_submissions_beyond_the_queue_bound_are_rejected(monkeypatch, tmp_path):
+    mission_server = build_mission_server(monkeypatch, tmp_path, max_queue=2)
+    mission_server.submit("hunt_suspicious_ip_001", "openai")
+    mission_server.submit("hunt_suspicious_ip_001", "google_gemini")
+    with pytest.raises(queue.Full):
+        mission_server.submit("hunt_suspicious_ip_001", "openai")
+    assert mission_server.get_health()["queued"] == 2
+
+
+def test_finished_job_states_are_evicted(monkeypatch, tmp_path):
+    mission_server = build_mission_server(monkeypatch, tmp_path, max_finished_jobs=2)
+    for run_id in ("run_1", "run_2", "run_3"):
+        mission_server._set_state(run_id, state="running")
+        mission_server._set_state(run_id, state="finished", result=run_id)
+    mission_server._set_state("run_4", state="running")
+
+    assert mission_server.get_result("run_1") is None
+    assert (
+        [mission_server.get_result(run_id)["result"] for run_id in ("run_2", "run_3")]
+        == ["run_2", "run_3"]
+    )
+    assert mission_server.get_result("run_4")["state"] == "running"
+
+    # A resumed run is no longer finished, so it is not evicted while it runs again
+    mission_server._set_state("run_2", state="queued")
+    mission_server._set_state("run_5", state="failed")
+    mission_server._set_state("run_6", state="failed")
+    assert mission_server.get_result("run_2")["state"] == "queued"
+    assert mission_server.get_result("run_3") is None
+
+
+def test_agent_build_failure_fails_the_run_and_keeps_the_slot(monkeypatch, tmp_path):
+    mission_server = build_mission_server(monkeypatch, tmp_path, workers=1)
+    built = []
+
+    def checkout_agents(mission_id, llm_provider):
+        built.append(llm_provider)
+        raise ValueError("OPENAI_API_KEY is not set")
+
+    monkeypatch.setattr(mission_server.runtime, "checkout_agents", checkout_agents)
+    first_run = mission_server.submit("hunt_suspicious_ip_001", "openai")
+    second_run = mission_server.submit("hunt_suspicious_ip_001", "openai")
+
+    mission_server.start()
+    try:
+        for _ in range(50):
+            if mission_server.get_result(second_run)["state"] == "failed":
+                break
+            time.sleep(0.1)
+        # The single worker survived the first failure and ran the second mission too
+        for run_id in (first_run, second_run):
+            assert mission_server.get_result(run_id)["state"] == "failed"
+            assert "OPENAI_API_KEY" in mission_server.get_result(run_id)["error"]
+        assert built == ["openai", "openai"]
+        assert mission_server.get_health()["running_by_provider"] == {}
+    finally:
+        mission_server.stop()
@@ -0,0 +1,179 @@
+# tests/test_work_queue.py
+import threading
+
+import pytest
+
+from src import worker as worker_module
+from src.config.config_loader import ConfigLoader
+from src.main import MissionControl
+from src.orchestrators.work_queue import (
+    COMPLETED,
+    FAILED,
+    MISSION_JOB,
+    PENDING,
+    RUNNING,
+    STEP_JOB,
+    RemoteStepExecutor,
+    SQLiteWorkQueue,
+)
+from tests.fakes import (
+    RecordingLearningQueue,
+    ScriptedChatModel,
+    build_mission_control,
+    scripted_mission,
+)
+
+
+@pytest.fixture
+def work_queue(tmp_path):
+    return SQLiteWorkQueue(str(tmp_path / "work_queue.db"), retry_backoff_seconds=0)
+
+
+def expire_lease(work_queue: SQLiteWorkQueue, job_id: str):
+    with work_queue._conn:
+        work_queue._conn.execute(
+            "UPDATE work_jobs SET leased_until = 0 WHERE job_id = ?", (job_id,)
+        )
+
+
+def test_job_is_leased_to_one_worker(work_queue):
+    job_id = work_queue.enqueue(STEP_JOB, {"step_index": 0})
+    assert work_queue.claim("worker_a", kinds=[MISSION_JOB]) is None
+
+    job = work_queue.claim("worker_a", lease_seconds=60)
+    assert (job["job_id"], job["status"], job["attempts"], job["payload"]) == (
+        job_id, RUNNING, 1, {"step_index": 0}
+    )
+    assert work_queue.claim("worker_b") is None
+    assert work_queue.heartbeat(job_id, "worker_a")
+    assert not work_queue.heartbeat(job_id, "worker_b")
+
+    assert work_queue.complete(job_id, "worker_a", {"result": "done"})
+    job = work_queue.wait(job_id, timeout=0)
+    assert (job["status"], job["result"]) == (COMPLETED, {"result": "done"})
+
+
+def test_expired_lease_hands_the_job_to_another_worker(work_queue):
+    job_id = work_queue.enqueue(MISSION_JOB, {}, max_attempts=2)
+    work_queue.claim("worker_a")
+    expire_lease(work_queue, job_id)
+
+    job = work_queue.claim("worker_b")
+    assert (job["job_id"], job["attempts"]) == (job_id, 2)
+    # The first worker's late result is dropped, and its heartbeat tells it so
+    assert not work_queue.heartbeat(job_id, "worker_a")
+    assert not work_queue.complete(job_id, "worker_a", {"result": "late"})
+    assert work_queue.complete(job_id, "worker_b", {"result": "on time"})
+    assert work_queue.get_job(job_id)["result"] == {"result": "on time"}
+
+
+def test_lease_expiring_on_the_last_attempt_fails_the_job(work_queue):
+    job_id = work_queue.enqueue(MISSION_JOB, {}, max_attempts=1)
+    work_queue.claim("worker_a")
+    expire_lease(work_queue, job_id)
+
+    assert work_queue.claim("worker_b") is None
+    job = work_queue.get_job(job_id)
+    assert (job["status"], job["error"]) == (
+        FAILED, "Lease expired on the last attempt."
+    )
+
+
+def test_failed_attempts_are_retried_after_a_backoff(tmp_path):
+    work_queue = SQLiteWorkQueue(
+        str(tmp_path / "work_queue.db"), retry_backoff_seconds=60
+    )
+    job_id = work_queue.enqueue(STEP_JOB, {}, max_attempts=2)
+    work_queue.claim("worker_a")
+    assert work_queue.fail(job_id, "worker_a", "provider error")
+
+    job = work_queue.get_job(job_id)
+    assert (job["status"], job["worker_id"]) == (PENDING, None)
+    assert job["available_at"] - job["created_at"] >= 60
+    assert work_queue.claim("worker_b") is None  # Still backing off
+
+    with work_queue._conn:
+        work_queue._conn.execute(
+            "UPDATE work_jobs SET available_at = 0 WHERE job_id = ?", (job_id,)
+        )
+    assert work_queue.claim("worker_b")["attempts"] == 2
+    assert not work_queue.fail(job_id, "worker_a", "stale attempt")
+    assert work_queue.fail(job_id, "worker_b", "provider error again")
+    job = work_queue.get_job(job_id)
+    assert (job["status"], job["error"]) == (FAILED, "provider error again")
+
+
+def test_remote_step_gives_up_after_its_timeout(work_queue):
+    executor = RemoteStepExecutor(
+        work_queue, "scripted_mission", "openai", "crewai", "run_1", timeout_seconds=0.2
+    )
+    with pytest.raises(TimeoutError):
+        executor.execute(0, {"task_id": "task_0"}, "What is six times seven?")
+
+
+def test_submitter_uses_the_configured_timeouts(monkeypatch, tmp_path, work_queue):
+    monkeypatch.setattr(ConfigLoader, "load_work_queue_config", lambda self: {
+        "work_queue": {
+            "max_attempts": 2, "step_timeout_seconds": 30,
+            "mission_timeout_seconds": 600
+        }
+    })
+    control_plane = build_mission_control(
+        monkeypatch, tmp_path, scripted_mission(), ScriptedChatModel(),
+        distribute_steps=True, work_queue=work_queue
+    )
+    step_executor = control_plane.workflow.step_executor
+    assert (step_executor.max_attempts, step_executor.timeout_seconds) == (2, 30)
+
+
+def test_resumed_run_keeps_running_its_steps_on_the_fleet(monkeypatch, tmp_path,
+                                                          work_queue):
+    control_plane = build_mission_control(
+        monkeypatch, tmp_path, scripted_mission(), ScriptedChatModel()
+    )
+    run_id = control_plane.run_id
+
+    resumed = MissionControl.resume(
+        run_id, checkpoint_store=control_plane.checkpoint_store,
+        cost_ledger=control_plane.economic_governor.cost_ledger,
+        learning_queue=RecordingLearningQueue(), distribute_steps=True,
+        work_queue=work_queue
+    )
+    step_executor = resumed.workflow.step_executor
+    assert isinstance(step_executor, RemoteStepExecutor)
+    assert (step_executor.work_queue, step_executor.run_id) == (work_queue, run_id)
+
+
+def test_worker_slot_survives_a_failure_to_store_a_result(monkeypatch, tmp_path,
+                                                          work_queue):
+    monkeypatch.setattr(worker_module, "CostLedger", lambda: None)
+    monkeypatch.setattr(worker_module, "get_learning_queue", RecordingLearningQueue)
+    queue_worker = worker_module.QueueWorker(
+        work_queue, worker_id="worker_a", concurrency=1, kinds=[MISSION_JOB]
+    )
+    monkeypatch.setattr(
+        queue_worker, "_run_mission", lambda payload: {"result": payload["answer"]}
+    )
+
+    complete = work_queue.complete
+    second_done = threading.Event()
+
+    def flaky_complete(job_id, worker_id, result):
+        if result["result"] == "first":
+            raise ConnectionError("work queue unreachable")
+        complete(job_id, worker_id, result)
+        second_done.set()
+
+    monkeypatch.setattr(work_queue, "complete", flaky_complete)
+    first_id = work_queue.enqueue(MISSION_JOB, {"answer": "first"})
+    second_id = work_queue.enqueue(MISSION_JOB, {"answer": "second"})
+
+    queue_worker.start()
+    try:
+        assert second_done.wait(10)
+    finally:
+        queue_worker.stop(timeout=5)
+    assert work_queue.get_job(second_id)["result"] == {
+        "result": "second", "worker_id": "worker_a"
+    }
+    assert work_queue.get_job(first_id)["status"] == RUNNING  # Until its lease expires